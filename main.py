@@ -1,20 +1,39 @@
 """
 Aplicación principal
+
+Opciones:
+    --profile-startup   Imprimir los tiempos de cada fase del arranque
 """
 
+import time
+_PROCESS_START = time.perf_counter()
+
 import sys
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QTimer, QEventLoop, QTranslator, QLocale, QLibraryInfo
 from src.ui import MainWindow
 from src.database.connection import DatabaseConnection
 from src.database.migrations import MigrationManager
+from src.database.slow_query_log import SlowQueryLog
+from src.utils.config import config
+from src.utils.stall_watchdog import StallWatchdog
+from src.utils.instrumentation import instrumentation
+from src.utils.startup_profiler import startup_profiler
+
+PROFILE_STARTUP_FLAG = "--profile-startup"
 
 class Application:
     """Clase principal de la aplicación"""
     def __init__(self):
+        if PROFILE_STARTUP_FLAG in sys.argv:
+            sys.argv.remove(PROFILE_STARTUP_FLAG)
+            startup_profiler.start(_PROCESS_START)
+            startup_profiler.mark("imports")
         self.app = QApplication(sys.argv)
+        startup_profiler.mark("QApplication")
         self.window = None
         self.db_connection = None
+        self.watchdog = None
         
     def run(self):
         """Iniciar la aplicación"""
@@ -70,13 +89,27 @@ class Application:
             else:
                 self.app.installTranslator(app_translator)
                 print(f"[Main] Traductor de la aplicación cargado: {target_qm_file}")
+            startup_profiler.mark("traducciones")
+
+            if config.stall_watchdog:
+                self.watchdog = StallWatchdog(threshold_ms=config.stall_threshold_ms)
+                self.watchdog.attach_qt(self.app)
+                self.watchdog.start()
+                print(f"[Main] Detector de bloqueos activo (>= {config.stall_threshold_ms} ms)")
 
             # Inicializar conexión a la base de datos y ejecutar migraciones
             print("[Main] Configurando base de datos...")
-            self.db_connection = DatabaseConnection() # Usa la ruta del .env por defecto
+            slow_query_log = None
+            if config.slow_query_log:
+                slow_query_log = SlowQueryLog(config.slow_query_log_file,
+                                              threshold_ms=config.slow_query_threshold_ms)
+                print(f"[Main] Registro de consultas lentas (>= {config.slow_query_threshold_ms} ms): "
+                      f"{config.slow_query_log_file}")
+            self.db_connection = DatabaseConnection(slow_query_log=slow_query_log) # Usa la ruta del .env por defecto
             migration_manager = MigrationManager(self.db_connection)
             migration_manager.run_migrations()
             print("[Main] Base de datos configurada y migraciones aplicadas.")
+            startup_profiler.mark("base de datos y migraciones")
             
             # Crear y mostrar ventana principal, pasando la conexión
             self.window = MainWindow(db_connection=self.db_connection)
@@ -91,7 +124,12 @@ class Application:
             
             print("[Main] Iniciando bucle de eventos...")
             # Ejecutar aplicación
-            return self.app.exec()
+            exit_code = self.app.exec()
+            if self.watchdog:
+                self.watchdog.stop()
+            if instrumentation.enabled:
+                print("[Main] Resumen de instrumentación:\n" + instrumentation.report())
+            return exit_code
             
         except Exception as e:
             print(f"[Main] Error iniciando aplicación: {e}")
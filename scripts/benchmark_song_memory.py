@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria por fila para las representaciones de canciones
+
+Compara el modelo anterior (dataclass con pathlib.Path), el Song con
+__slots__ y el contenedor columnar SongBatch, construyendo N filas con
+textos nuevos por fila (como llegan desde SQLite) y midiendo con tracemalloc.
+
+Uso:
+    python scripts/benchmark_song_memory.py --rows 1000000
+"""
+
+import sys
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Agregar directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.models.song import Song, SongBatch
+
+
+@dataclass
+class LegacySong:
+    """Representación anterior de Song, conservada solo como referencia"""
+    id: Optional[int]
+    title: str
+    artist: str
+    album: str
+    genre: str
+    bpm: Optional[int]
+    file_path: Path
+
+
+def generate_rows(count: int):
+    """
+    Generar filas sintéticas con la cardinalidad típica de una biblioteca
+
+    Cada fila crea sus propias cadenas (como sqlite3 al leer), de modo que
+    la memoria medida incluye los textos que retiene cada representación.
+    """
+    for i in range(count):
+        artist_id = i % 5000
+        yield {
+            "id": i + 1,
+            "title": f"Track {i:07d}",
+            "artist": f"Artist {artist_id:04d}",
+            "album": f"Album {artist_id:04d}-{i % 7}",
+            "genre": f"Genre {i % 40:02d}",
+            "bpm": 80 + i % 100 if i % 3 else None,
+            "file_path": f"/music/Artist {artist_id:04d}/Album {i % 7}/{i:07d} Track.mp3",
+            "created_at": "2024-01-01 12:00:00",
+        }
+
+
+def build_legacy(count: int):
+    return [
+        LegacySong(row["id"], row["title"], row["artist"], row["album"],
+                   row["genre"], row["bpm"], Path(row["file_path"]))
+        for row in generate_rows(count)
+    ]
+
+
+def build_slotted(count: int):
+    return [Song.from_db_row(row) for row in generate_rows(count)]
+
+
+def build_batch(count: int):
+    return SongBatch.from_rows(generate_rows(count))
+
+
+def measure(builder, count: int) -> tuple[float, float]:
+    """
+    Medir memoria retenida y tiempo de construcción
+
+    Returns:
+        tuple[float, float]: (bytes por fila, segundos)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = builder(count)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return current / count, elapsed
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Memoria por fila de las representaciones de Song")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Número de filas (por defecto 1M)")
+    args = parser.parse_args()
+
+    print(f"=== Memoria por fila con {args.rows:,} canciones ===")
+    results = {}
+    for name, builder in (
+        ("dataclass + Path (anterior)", build_legacy),
+        ("Song con __slots__", build_slotted),
+        ("SongBatch columnar", build_batch),
+    ):
+        bytes_per_row, elapsed = measure(builder, args.rows)
+        results[name] = bytes_per_row
+        print(f"{name:<30} {bytes_per_row:8.1f} B/fila  "
+              f"{bytes_per_row * args.rows / 2**20:9.1f} MiB  {elapsed:6.2f} s")
+
+    baseline = results["dataclass + Path (anterior)"]
+    for name, value in results.items():
+        print(f"{name:<30} {value / baseline:6.1%} del anterior")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la interfaz en modo offscreen
+
+Construye la ventana principal real (QT_QPA_PLATFORM=offscreen) sobre una
+base de datos vacía y mide, para cada número de canciones, el tiempo de
+pared y el pico de memoria (RSS) de:
+
+- SongTable.load_songs: poblar la tabla con N canciones
+- LibraryView.update_filters: repoblar los desplegables de artista y género
+- NavigationRail.update_library_stats: reconstruir el árbol de navegación
+- Cambio de tema: regenerar y aplicar la hoja de estilos (oscuro y claro)
+- Redimensionado: cuatro tamaños de ventana con la tabla poblada
+
+Cada medición incluye el procesamiento de eventos pendientes y un repintado
+síncrono de la ventana, es decir, el coste completo hasta ver el resultado.
+Las canciones se generan con SyntheticLibrary (semilla fija). El pico de RSS
+es el del proceso hasta ese momento (ru_maxrss), así que los tamaños se
+ejecutan de menor a mayor.
+
+Uso:
+    python scripts/benchmark_ui.py --rows 50,5000,500000 --json ui_bench.json
+"""
+
+import os
+import sys
+import argparse
+import json
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Agregar directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from PyQt6.QtWidgets import QApplication
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.ui import MainWindow
+from src.ui.config import UIConfig
+from src.utils.synthetic_library import SyntheticLibrary
+
+RESIZE_STEPS = ((1920, 1080), (1024, 600), (1600, 900), (1280, 720))
+
+
+def peak_rss_mib() -> float:
+    """Pico de memoria residente del proceso en MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KiB y macOS en bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def settle(app: QApplication, window):
+    """Procesar eventos pendientes y repintar la ventana de forma síncrona"""
+    app.processEvents()
+    window.repaint()
+    app.processEvents()
+
+
+def wait_for_initial_load(app: QApplication, window, timeout: float = 30.0):
+    """Esperar a que termine la carga inicial de la biblioteca (en segundo plano)"""
+    deadline = time.perf_counter() + timeout
+    while window._is_initial_loading and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def measure(app: QApplication, window, action, repeat: int = 1) -> dict:
+    """
+    Medir una acción sobre la interfaz
+
+    Args:
+        app: Aplicación Qt
+        window: Ventana a repintar tras la acción
+        action: Callable sin argumentos (recibe el índice de repetición si repeat > 1)
+        repeat: Veces que se ejecuta la acción
+
+    Returns:
+        dict: Tiempo medio en ms y pico de RSS en MiB
+    """
+    settle(app, window)
+    start = time.perf_counter()
+    for index in range(repeat):
+        action(index) if repeat > 1 else action()
+        settle(app, window)
+    elapsed = (time.perf_counter() - start) * 1000 / repeat
+    return {"ms": elapsed, "peak_rss_mib": peak_rss_mib()}
+
+
+def build_stats(songs: list) -> dict:
+    """Estadísticas de biblioteca con el formato de LibraryDataManager"""
+    return {
+        "total_songs": len(songs),
+        "artists": sorted({song.artist for song in songs}),
+        "genres": sorted({song.genre for song in songs}),
+        "years": [],
+    }
+
+
+def apply_theme(window, dark: bool):
+    """Cambiar de tema como lo hace el menú Ver > Tema"""
+    UIConfig.set_dark_theme(dark)
+    window.setup_theme()
+
+
+def resize_window(window, size: tuple):
+    """Redimensionar y aplicar la escala sin esperar al temporizador de coalescencia"""
+    window.resize(*size)
+    window.apply_pending_resize()
+
+
+def run_size(app: QApplication, window, rows: int) -> dict:
+    """Ejecutar todas las mediciones para un número de canciones"""
+    songs = list(SyntheticLibrary(seed=0).songs(rows))
+    stats = build_stats(songs)
+    results = {}
+
+    results["SongTable.load_songs"] = measure(
+        app, window, lambda: window.library_view.table.load_songs(songs)
+    )
+    results["LibraryView.update_filters"] = measure(
+        app, window, lambda: window.library_view.update_filters(stats)
+    )
+    results["NavigationRail.update_library_stats"] = measure(
+        app, window, lambda: window.nav_rail.update_library_stats(stats)
+    )
+    results["theme_switch"] = measure(
+        app, window, lambda index: apply_theme(window, dark=index % 2 == 0), repeat=2
+    )
+    results["resize"] = measure(
+        app, window, lambda index: resize_window(window, RESIZE_STEPS[index]), repeat=len(RESIZE_STEPS)
+    )
+
+    window.library_view.table.clear()
+    return results
+
+
+def print_results(all_results: dict):
+    """Mostrar resultados en forma de tabla"""
+    print(f"{'Operación':<38} {'Filas':>9} {'Tiempo (ms)':>12} {'RSS pico (MiB)':>15}")
+    for rows, results in all_results.items():
+        for operation, values in results.items():
+            print(f"{operation:<38} {rows:>9,} {values['ms']:>12.1f} {values['peak_rss_mib']:>15.1f}")
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Benchmark offscreen de la interfaz")
+    parser.add_argument("--rows", default="50,5000,500000",
+                        help="Números de canciones separados por comas (por defecto 50,5000,500000)")
+    parser.add_argument("--json", help="Guardar los resultados en un archivo JSON")
+    args = parser.parse_args()
+    sizes = sorted(int(value) for value in args.rows.split(",") if value)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setStyle("Fusion")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseConnection(str(Path(tmp_dir) / "ui_bench.db"))
+        MigrationManager(db).run_migrations()
+
+        window = MainWindow(db)
+        wait_for_initial_load(app, window)
+        window.resize(*RESIZE_STEPS[-1])
+        settle(app, window)
+        baseline_rss = peak_rss_mib()
+
+        all_results = {}
+        for rows in sizes:
+            print(f"Midiendo con {rows:,} canciones...")
+            all_results[rows] = run_size(app, window, rows)
+
+        window._force_exit = True
+        window.close()
+        db.close()
+
+    print(f"RSS pico tras crear la ventana: {baseline_rss:.1f} MiB")
+    print_results(all_results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(
+            {"baseline_rss_mib": baseline_rss, "results": all_results}, indent=2
+        ))
+        print(f"Resultados guardados en {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Comprobar los planes de consulta de los repositorios
+
+Crea una base de datos temporal, la puebla con una biblioteca sintética,
+ejecuta ANALYZE y obtiene EXPLAIN QUERY PLAN de cada forma de consulta.
+Termina con código 1 si alguna consulta recorre la tabla completa sin
+índice o necesita ordenar en un B-tree temporal.
+
+Uso:
+    python scripts/check_query_plans.py --rows 100000 --verbose
+"""
+
+import sys
+import argparse
+import tempfile
+from pathlib import Path
+
+# Agregar directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.database.query_plan import QueryPlanChecker, seed_database
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Comprobar planes de consulta de los repositorios")
+    parser.add_argument("--rows", type=int, default=100_000, help="Canciones sintéticas (por defecto 100k)")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar el plan de todas las consultas")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseConnection(str(Path(tmp_dir) / "query_plans.db"))
+        MigrationManager(db).run_migrations()
+        print(f"Poblando base de datos con {args.rows:,} canciones...")
+        seed_database(db, args.rows)
+
+        results = QueryPlanChecker(db).check()
+        db.close()
+
+    failures = [result for result in results if not result.ok]
+    for result in results:
+        if args.verbose or not result.ok:
+            status = "OK " if result.ok else "ERR"
+            print(f"[{status}] {result.shape.name}")
+            for detail in result.plan:
+                print(f"        {detail}")
+
+    print(f"{len(results)} consultas comprobadas, {len(failures)} con regresiones")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,10 +7,10 @@ import sys
 import logging
 from pathlib import Path
 
-# Agregar src al path para imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Agregar directorio raíz al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database.connection import DatabaseConnection
+from src.database.connection import DatabaseConnection
 
 def setup_logging():
     """Configurar logging para el script"""
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Generar bibliotecas sintéticas para pruebas de rendimiento
+
+Dos modos, ambos reproducibles con --seed y sin depender de ffmpeg:
+
+    # Base de datos con 1M canciones insertadas con SongRepository
+    python scripts/generate_synthetic_library.py db --rows 1000000 --db data/synthetic.db
+
+    # Árbol de 5000 archivos de audio etiquetados, 3 niveles de 4 carpetas
+    python scripts/generate_synthetic_library.py files --files 5000 --root /tmp/music --depth 3 --fan-out 4
+"""
+
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Agregar directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import SongRepository
+from src.utils.synthetic_library import AUDIO_FORMATS, SyntheticLibrary
+
+
+def generate_database(args) -> int:
+    """Poblar una base de datos con canciones sintéticas"""
+    db_path = Path(args.db)
+    if db_path.exists() and not args.append:
+        print(f"La base de datos {db_path} ya existe (use --append para añadir canciones)")
+        return 1
+
+    db = DatabaseConnection(str(db_path))
+    MigrationManager(db).run_migrations()
+    library = SyntheticLibrary(seed=args.seed)
+
+    start = time.perf_counter()
+    inserted = library.seed_repository(SongRepository(db), args.rows, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    print(f"{inserted:,} canciones insertadas en {db_path} en {elapsed:.1f} s "
+          f"({inserted / elapsed:,.0f} filas/s)")
+    return 0
+
+
+def generate_files(args) -> int:
+    """Crear un árbol de archivos de audio etiquetados"""
+    formats = tuple(f".{fmt.lstrip('.').lower()}" for fmt in args.formats)
+    unsupported = set(formats) - set(AUDIO_FORMATS)
+    if unsupported:
+        print(f"Formatos no soportados: {', '.join(sorted(unsupported))}")
+        return 1
+
+    library = SyntheticLibrary(seed=args.seed)
+    start = time.perf_counter()
+    paths = library.write_tree(Path(args.root), args.files, depth=args.depth,
+                               fan_out=args.fan_out, formats=formats)
+    elapsed = time.perf_counter() - start
+
+    total_bytes = sum(path.stat().st_size for path in paths)
+    print(f"{len(paths):,} archivos ({total_bytes / 2**20:.1f} MiB) creados en {args.root} "
+          f"en {elapsed:.1f} s")
+    return 0
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Generar bibliotecas sintéticas")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del generador (por defecto 0)")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    db_parser = subparsers.add_parser("db", help="Poblar una base de datos")
+    db_parser.add_argument("--rows", type=int, default=10_000, help="Canciones (por defecto 10k)")
+    db_parser.add_argument("--db", default="data/synthetic.db", help="Ruta de la base de datos")
+    db_parser.add_argument("--batch-size", type=int, default=10_000, help="Canciones por transacción")
+    db_parser.add_argument("--append", action="store_true", help="Añadir a una base de datos existente")
+    db_parser.set_defaults(handler=generate_database)
+
+    files_parser = subparsers.add_parser("files", help="Crear archivos de audio etiquetados")
+    files_parser.add_argument("--root", required=True, help="Directorio destino")
+    files_parser.add_argument("--files", type=int, default=1000, help="Archivos (por defecto 1000)")
+    files_parser.add_argument("--depth", type=int, default=2, help="Niveles de carpetas (por defecto 2)")
+    files_parser.add_argument("--fan-out", type=int, default=4, help="Carpetas por nivel (por defecto 4)")
+    files_parser.add_argument("--formats", nargs="+", default=[fmt.lstrip(".") for fmt in AUDIO_FORMATS],
+                              help="Formatos: mp3 flac m4a wav")
+    files_parser.set_defaults(handler=generate_files)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
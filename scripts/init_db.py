@@ -7,11 +7,11 @@ import sys
 import logging
 from pathlib import Path
 
-# Agregar src al path para imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Agregar directorio raíz al path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database.connection import DatabaseConnection
-from database.migrations import MigrationManager
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
 
 def setup_logging():
     """Configurar logging para el script"""
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Ejecutar la suite de rendimiento y compararla con una línea base
+
+Las mediciones se guardan con pytest-benchmark en .benchmarks/ (una
+carpeta por máquina e intérprete), así que la línea base debe generarse
+en la misma máquina con la que se compara.
+
+Uso:
+    # Guardar una línea base (p. ej. antes de un cambio o en la versión publicada)
+    python scripts/run_benchmarks.py save --name v1.2
+
+    # Medir de nuevo y comparar con la última línea base guardada;
+    # falla si alguna media empeora más de un 15 %
+    python scripts/run_benchmarks.py compare --threshold 15
+
+    # Comparar con una ejecución concreta (número o nombre guardado)
+    python scripts/run_benchmarks.py compare --baseline 0001
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+STORAGE_DIR = root_dir / ".benchmarks"
+
+
+def build_pytest_args(args) -> list:
+    """Argumentos comunes de pytest para la suite de rendimiento"""
+    pytest_args = [
+        str(root_dir / "tests" / "benchmarks"),
+        "--run-benchmarks",
+        f"--library-sizes={args.sizes}",
+        f"--benchmark-storage=file://{STORAGE_DIR}",
+        "--benchmark-sort=mean",
+        "--benchmark-columns=min,mean,median,stddev,rounds",
+        "-p", "no:randomly",
+        "-q",
+    ]
+    if args.filter:
+        pytest_args += ["-k", args.filter]
+    return pytest_args
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Suite de rendimiento con líneas base")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    save_parser = subparsers.add_parser("save", help="Medir y guardar una línea base")
+    save_parser.add_argument("--name", default="baseline", help="Nombre de la línea base")
+
+    compare_parser = subparsers.add_parser("compare", help="Medir y comparar con una línea base")
+    compare_parser.add_argument("--baseline", default="",
+                                help="Ejecución con la que comparar (por defecto la última guardada)")
+    compare_parser.add_argument("--threshold", type=int, default=15,
+                                help="Empeoramiento máximo de la media en %% (por defecto 15)")
+
+    for subparser in (save_parser, compare_parser):
+        subparser.add_argument("--sizes", default="1000,10000,100000",
+                               help="Tamaños de biblioteca separados por comas")
+        subparser.add_argument("-k", dest="filter", default="", help="Filtrar benchmarks (pytest -k)")
+
+    args = parser.parse_args()
+    pytest_args = build_pytest_args(args)
+
+    if args.mode == "save":
+        pytest_args.append(f"--benchmark-save={args.name}")
+    else:
+        if not STORAGE_DIR.exists():
+            print("No hay líneas base guardadas: ejecute primero 'save'")
+            return 1
+        compare = "--benchmark-compare" + (f"={args.baseline}" if args.baseline else "")
+        pytest_args += [compare, f"--benchmark-compare-fail=mean:{args.threshold}%"]
+
+    return pytest.main(pytest_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
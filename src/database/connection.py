@@ -4,10 +4,15 @@ Módulo de conexión a base de datos SQLite
 
 import sqlite3
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
-from contextlib import contextmanager
+from typing import Optional, Iterable, Iterator, List
+from contextlib import closing, contextmanager
 import threading
+import time
+
+from .slow_query_log import SlowQueryLog
+from ..utils.instrumentation import instrumentation
 
 logger = logging.getLogger(__name__)
 
@@ -21,26 +26,84 @@ class DatabaseTimeoutError(DatabaseConnectionError):
     """Timeout al conectar a la base de datos"""
     pass
 
+class StatementCacheStats:
+    """
+    Contadores de aciertos de la caché de sentencias preparadas
+    
+    sqlite3 no expone las estadísticas de su caché, así que se replica su
+    política (LRU por texto SQL y por conexión, de tamaño cached_statements)
+    para las sentencias ejecutadas a través de DatabaseConnection.
+    """
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def record(self, hit: bool):
+        """Registrar una ejecución como acierto o fallo de caché"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    @property
+    def hit_rate(self) -> float:
+        """Proporción de ejecuciones que reutilizaron una sentencia preparada"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def reset(self):
+        """Reiniciar contadores"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+    
+    def to_dict(self) -> dict:
+        """Contadores como diccionario"""
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate}
+
+
 class DatabaseConnection:
     """Gestor de conexión a base de datos SQLite"""
     
-    def __init__(self, db_path: str = "data/almacena.db"):
+    # Filas leídas por cada fetchmany en las consultas incrementales
+    DEFAULT_FETCH_SIZE = 500
+    
+    # Tamaño de la caché de sentencias preparadas por conexión (sqlite3 usa 128)
+    DEFAULT_CACHED_STATEMENTS = 512
+    
+    def __init__(self, db_path: str = "data/almacena.db",
+                 cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+                 slow_query_log: Optional[SlowQueryLog] = None):
         """
         Inicializar conexión a base de datos
         
         Args:
             db_path: Ruta al archivo de base de datos
+            cached_statements: Sentencias preparadas que conserva cada conexión
+            slow_query_log: Registro de las sentencias que superan su umbral
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cached_statements = cached_statements
+        self.statement_cache_stats = StatementCacheStats()
+        self.slow_query_log = slow_query_log
         self._local = threading.local()
         self._local.connection = None
+        # Conexiones abiertas de todos los hilos, para poder cerrarlas
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._generation = 0
         
     @contextmanager
     def get_connection(self):
         """
         Context manager para obtener conexión a la base de datos.
-        Siempre abre una nueva conexión y la cierra al finalizar.
+        Cada hilo reutiliza una conexión de larga duración, de modo que la
+        caché de sentencias preparadas de SQLite sobrevive entre llamadas.
+        Al salir del bloque más externo se confirma la transacción.
         
         Yields:
             sqlite3.Connection: Conexión activa
@@ -51,9 +114,8 @@ class DatabaseConnection:
         """
         conn = None
         try:
-            # Conectar con timeout explícito
-            conn = sqlite3.connect(self.db_path, timeout=5.0)
-            conn.row_factory = sqlite3.Row  # Acceso por nombre de columna
+            conn = self._acquire_connection()
+            self._local.depth = getattr(self._local, 'depth', 0) + 1
             self._local.connection = conn
             yield conn
         except sqlite3.OperationalError as e:
@@ -77,12 +139,123 @@ class DatabaseConnection:
             raise DatabaseConnectionError(f"Error inesperado al conectar a la base de datos: {e}") from e
         finally:
             if conn:
-                try:
-                    conn.commit()  # Commit any pending transactions
-                    conn.close()
-                except Exception as e:
-                    logger.warning(f"Error closing database connection: {e}")
-                self._local.connection = None
+                self._local.depth -= 1
+                if self._local.depth == 0:
+                    try:
+                        conn.commit()  # Commit any pending transactions
+                    except Exception as e:
+                        logger.warning(f"Error committing database transaction: {e}")
+                    self._local.connection = None
+    
+    def _acquire_connection(self) -> sqlite3.Connection:
+        """
+        Obtener la conexión de larga duración del hilo actual
+        
+        Se reabre si se cerró con close(). No se comprueba la identidad del
+        archivo en cada llamada (sería un stat por consulta): quien elimine o
+        reemplace el archivo de base de datos debe llamar antes a close().
+        
+        Returns:
+            sqlite3.Connection: Conexión del hilo
+        """
+        conn = getattr(self._local, 'cached_connection', None)
+        if conn is not None and getattr(self._local, 'depth', 0) == 0:
+            if self._local.generation != self._generation:
+                self._discard_connection(conn)
+                conn = None
+        
+        if conn is None:
+            # Conectar con timeout explícito
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=5.0,
+                cached_statements=self.cached_statements,
+                check_same_thread=False  # Solo para poder cerrarla desde close()
+            )
+            conn.row_factory = sqlite3.Row  # Acceso por nombre de columna
+            with self._connections_lock:
+                self._connections.append(conn)
+            self._local.cached_connection = conn
+            self._local.generation = self._generation
+            self._local.statements = OrderedDict()
+        return conn
+    
+    def _discard_connection(self, conn: sqlite3.Connection):
+        """Cerrar una conexión y olvidarla"""
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing database connection: {e}")
+        if getattr(self._local, 'cached_connection', None) is conn:
+            self._local.cached_connection = None
+    
+    def close(self):
+        """Cerrar las conexiones abiertas de todos los hilos"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database connection: {e}")
+        self._local.cached_connection = None
+    
+    def _execute(self, cursor: sqlite3.Cursor, query: str, params: tuple = ()):
+        """
+        Ejecutar una sentencia registrando si reutiliza una sentencia preparada
+        
+        Args:
+            cursor: Cursor de la conexión del hilo actual
+            query: Consulta SQL
+            params: Parámetros de la consulta
+        """
+        self._record_statement(query)
+        cursor.execute(query, params)
+    
+    def _record_statement(self, query: str):
+        """Registrar el uso de una sentencia en la réplica de la caché LRU"""
+        statements = self._local.statements
+        hit = query in statements
+        if hit:
+            statements.move_to_end(query)
+        else:
+            statements[query] = None
+            if len(statements) > self.cached_statements:
+                statements.popitem(last=False)
+        self.statement_cache_stats.record(hit)
+    
+    def _check_slow(self, conn: sqlite3.Connection, query: str, params,
+                    start: float, rows: Optional[int]):
+        """
+        Enviar la sentencia al registro de consultas lentas si supera el umbral
+        
+        Args:
+            conn: Conexión en la que se ejecutó
+            query: Consulta SQL
+            params: Parámetros de la consulta
+            start: Instante de inicio (time.perf_counter)
+            rows: Filas devueltas o afectadas
+        """
+        if self.slow_query_log is None:
+            return
+        duration_ms = (time.perf_counter() - start) * 1000
+        if self.slow_query_log.is_slow(duration_ms):
+            self.slow_query_log.record(conn, query, params, duration_ms, rows)
+    
+    def get_statement_cache_stats(self) -> dict:
+        """
+        Obtener estadísticas de la caché de sentencias preparadas
+        
+        Returns:
+            dict: hits, misses, hit_rate y tamaño de la caché
+        """
+        stats = self.statement_cache_stats.to_dict()
+        stats['cached_statements'] = self.cached_statements
+        return stats
     
     def execute_query(self, query: str, params: tuple = ()) -> list:
         """
@@ -95,10 +268,68 @@ class DatabaseConnection:
         Returns:
             list: Resultados de la consulta
         """
+        with instrumentation.span("db.query"), self.get_connection() as conn:
+            cursor = conn.cursor()
+            start = time.perf_counter()
+            self._execute(cursor, query, params)
+            rows = cursor.fetchall()
+            self._check_slow(conn, query, params, start, len(rows))
+            return rows
+    
+    def iter_query_chunks(self, query: str, params: tuple = (),
+                          chunk_size: int = DEFAULT_FETCH_SIZE) -> Iterator[List[sqlite3.Row]]:
+        """
+        Ejecutar consulta SELECT y devolver los resultados por bloques
+        
+        La conexión se mantiene abierta durante toda la iteración y las filas
+        se leen con fetchmany, de modo que nunca se materializa el resultado
+        completo. Al agotar o cerrar el generador se libera la conexión.
+        
+        Mientras el generador siga abierto, las demás llamadas de este hilo a
+        get_connection() se anidan en su transacción y no confirman al salir.
+        Quien deje de iterar antes del final debe cerrarlo (close() o
+        contextlib.closing) en vez de abandonarlo hasta que lo recoja el GC.
+        
+        Args:
+            query: Consulta SQL
+            params: Parámetros de la consulta
+            chunk_size: Filas por bloque
+            
+        Yields:
+            List[sqlite3.Row]: Bloque de hasta chunk_size filas
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall()
+            start = time.perf_counter()
+            with instrumentation.span("db.iter_query"):
+                self._execute(cursor, query, params)
+            # Solo se mide la ejecución: el ritmo de lectura depende del consumidor
+            self._check_slow(conn, query, params, start, None)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+    
+    def iter_query(self, query: str, params: tuple = (),
+                   chunk_size: int = DEFAULT_FETCH_SIZE) -> Iterator[sqlite3.Row]:
+        """
+        Ejecutar consulta SELECT y devolver las filas de una en una
+        
+        Variante de iter_query_chunks para recorridos fila a fila; hay que
+        agotarla o cerrarla igual que aquella.
+        
+        Args:
+            query: Consulta SQL
+            params: Parámetros de la consulta
+            chunk_size: Filas leídas por cada fetchmany
+            
+        Yields:
+            sqlite3.Row: Filas del resultado
+        """
+        with closing(self.iter_query_chunks(query, params, chunk_size)) as chunks:
+            for rows in chunks:
+                yield from rows
     
     def execute_insert_update_delete(self, query: str, params: tuple = ()) -> int:
         """
@@ -111,7 +342,32 @@ class DatabaseConnection:
         Returns:
             int: Número de filas afectadas
         """
-        with self.get_connection() as conn:
+        with instrumentation.span("db.write"), self.get_connection() as conn:
+            cursor = conn.cursor()
+            start = time.perf_counter()
+            self._execute(cursor, query, params)
+            self._check_slow(conn, query, params, start, cursor.rowcount)
+            return cursor.rowcount
+    
+    def execute_many(self, query: str, params_seq: Iterable[tuple]) -> int:
+        """
+        Ejecutar una sentencia INSERT, UPDATE o DELETE para varios registros
+        
+        Todos los registros se escriben en una única transacción con
+        executemany, que reutiliza la sentencia preparada.
+        
+        Args:
+            query: Consulta SQL
+            params_seq: Parámetros de cada ejecución
+            
+        Returns:
+            int: Número de filas afectadas
+        """
+        with instrumentation.span("db.execute_many"), self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, params)
+            self._record_statement(query)
+            start = time.perf_counter()
+            cursor.executemany(query, params_seq)
+            # Sin parámetros: el registro solo guarda la forma del lote
+            self._check_slow(conn, query, (), start, cursor.rowcount)
             return cursor.rowcount
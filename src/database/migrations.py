@@ -1,16 +1,29 @@
 """
 Sistema de migraciones para versionado de base de datos
+
+La versión del esquema se guarda en PRAGMA user_version (la última migración
+aplicada, como entero). En el arranque habitual basta con leerla y
+compararla con la última migración disponible; la tabla migrations solo se
+consulta cuando hay migraciones pendientes. Cada migración se aplica en una
+única transacción junto con su registro y el nuevo user_version.
 """
 
 import logging
-from typing import List, Dict
+from typing import Dict, List, Optional
 from .connection import DatabaseConnection
+from .query_shape import QueryShape
 
 logger = logging.getLogger(__name__)
 
 class MigrationManager:
     """Gestor de migraciones de base de datos"""
     
+    APPLIED_MIGRATIONS_QUERY = "SELECT version FROM migrations ORDER BY version"
+    
+    SCHEMA_VERSION_QUERY = "PRAGMA user_version"
+    
+    INSERT_MIGRATION_QUERY = "INSERT INTO migrations (version, description) VALUES (?, ?)"
+    
     def __init__(self, db_connection: DatabaseConnection):
         """
         Inicializar gestor de migraciones
@@ -19,7 +32,25 @@ class MigrationManager:
             db_connection: Instancia de conexión a base de datos
         """
         self.db = db_connection
-        self._ensure_migrations_table()
+    
+    def get_schema_version(self) -> int:
+        """
+        Obtener la versión del esquema (PRAGMA user_version)
+        
+        Returns:
+            int: Última migración aplicada, 0 en una base de datos nueva
+        """
+        result = self.db.execute_query(self.SCHEMA_VERSION_QUERY)
+        return result[0][0] if result else 0
+    
+    def get_latest_version(self) -> int:
+        """
+        Obtener la versión de la última migración disponible
+        
+        Returns:
+            int: Versión más alta de _get_all_migrations
+        """
+        return max(int(migration['version']) for migration in self._get_all_migrations())
     
     def _ensure_migrations_table(self):
         """Crear tabla de migraciones si no existe"""
@@ -40,39 +71,55 @@ class MigrationManager:
         Returns:
             List[str]: Versiones de migraciones aplicadas
         """
-        query = "SELECT version FROM migrations ORDER BY version"
-        results = self.db.execute_query(query)
+        results = self.db.execute_query(self.APPLIED_MIGRATIONS_QUERY)
         return [row['version'] for row in results]
     
-    def apply_migration(self, version: str, description: str, sql_commands: List[str]):
+    @classmethod
+    def query_shapes(cls) -> List[QueryShape]:
+        """
+        Formas de consulta que ejecuta el gestor de migraciones
+        
+        Returns:
+            List[QueryShape]: Consultas con parámetros de ejemplo
+        """
+        return [QueryShape("migrations.applied", cls.APPLIED_MIGRATIONS_QUERY)]
+    
+    def apply_migration(self, version: str, description: str, sql_commands: List[str],
+                        applied_migrations: Optional[List[str]] = None):
         """
-        Aplicar una migración
+        Aplicar una migración de forma atómica
+        
+        Los comandos, el registro en la tabla migrations y el nuevo
+        user_version se escriben en una única transacción: si algo falla no
+        queda ningún cambio parcial.
         
         Args:
             version: Versión de la migración (ej: "001")
             description: Descripción de la migración
             sql_commands: Lista de comandos SQL a ejecutar
+            applied_migrations: Migraciones ya aplicadas (se consultan si no se indican)
         """
-        applied_migrations = self.get_applied_migrations()
+        if applied_migrations is None:
+            self._ensure_migrations_table()
+            applied_migrations = self.get_applied_migrations()
         
         if version in applied_migrations:
             logger.info(f"Migración {version} ya aplicada")
             return
         
         try:
-            # Ejecutar comandos de migración
-            for sql_command in sql_commands:
-                self.db.execute_insert_update_delete(sql_command)
-            
-            # Registrar migración aplicada
-            insert_migration_sql = """
-            INSERT INTO migrations (version, description) 
-            VALUES (?, ?)
-            """
-            self.db.execute_insert_update_delete(
-                insert_migration_sql, 
-                (version, description)
-            )
+            with self.db.get_connection() as conn:
+                # sqlite3 no abre transacción implícita para DDL
+                conn.execute("BEGIN")
+                for sql_command in sql_commands:
+                    self.db.execute_insert_update_delete(sql_command)
+                
+                # Registrar migración aplicada
+                self.db.execute_insert_update_delete(
+                    self.INSERT_MIGRATION_QUERY,
+                    (version, description)
+                )
+                self._set_schema_version(conn, int(version))
             
             logger.info(f"Migración {version} aplicada exitosamente: {description}")
             
@@ -80,6 +127,11 @@ class MigrationManager:
             logger.error(f"Error aplicando migración {version}: {e}")
             raise
     
+    @staticmethod
+    def _set_schema_version(conn, version: int):
+        """Escribir PRAGMA user_version (no admite parámetros enlazados)"""
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+    
     def get_migrations_to_apply(self) -> List[Dict]:
         """
         Obtener lista de migraciones pendientes
@@ -87,6 +139,7 @@ class MigrationManager:
         Returns:
             List[Dict]: Migraciones pendientes con metadata
         """
+        self._ensure_migrations_table()
         applied = set(self.get_applied_migrations())
         all_migrations = self._get_all_migrations()
         
@@ -164,22 +217,128 @@ class MigrationManager:
                     CREATE INDEX IF NOT EXISTS idx_songs_file_path ON songs(file_path)
                     """
                 ]
+            },
+            {
+                'version': '003',
+                'description': 'Índices de ordenación para la tabla de canciones',
+                'sql_commands': [
+                    # idx_songs_title usa la colación BINARY y no sirve para
+                    # ORDER BY title COLLATE NOCASE
+                    """
+                    DROP INDEX IF EXISTS idx_songs_title
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_title_nocase ON songs(title COLLATE NOCASE)
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_artist_nocase ON songs(artist COLLATE NOCASE)
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_album_nocase ON songs(album COLLATE NOCASE)
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_genre_nocase ON songs(genre COLLATE NOCASE)
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_bpm ON songs(bpm)
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_created_at ON songs(created_at)
+                    """
+                ]
+            },
+            {
+                'version': '004',
+                'description': 'Índice de álbumes para la vista de cuadrícula',
+                'sql_commands': [
+                    # Cubre SongRepository.ALBUMS_QUERY: agrupa y ordena sin
+                    # B-tree temporal y sin leer la tabla
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_album_artist_nocase
+                    ON songs(album COLLATE NOCASE, artist COLLATE NOCASE, file_path)
+                    """
+                ]
+            },
+            {
+                'version': '005',
+                'description': 'Propiedades de audio de las canciones',
+                'sql_commands': [
+                    # Duración en segundos, bitrate en bps, tamaño en bytes
+                    "ALTER TABLE songs ADD COLUMN duration REAL",
+                    "ALTER TABLE songs ADD COLUMN bitrate INTEGER",
+                    "ALTER TABLE songs ADD COLUMN sample_rate INTEGER",
+                    "ALTER TABLE songs ADD COLUMN channels INTEGER",
+                    "ALTER TABLE songs ADD COLUMN codec TEXT",
+                    "ALTER TABLE songs ADD COLUMN file_size INTEGER",
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_duration ON songs(duration)
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_bitrate ON songs(bitrate)
+                    """
+                ]
+            },
+            {
+                'version': '006',
+                'description': 'Formas de onda precalculadas',
+                'sql_commands': [
+                    # Picos (mín, máx) int8 intercalados; tabla aparte para no
+                    # leer los BLOB al recorrer songs
+                    """
+                    CREATE TABLE IF NOT EXISTS waveforms (
+                        song_id INTEGER PRIMARY KEY REFERENCES songs(id) ON DELETE CASCADE,
+                        peaks BLOB NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                    """
+                ]
+            },
+            {
+                'version': '007',
+                'description': 'Sonoridad para la normalización de volumen',
+                'sql_commands': [
+                    # Sonoridad integrada en LUFS y pico de muestra lineal
+                    "ALTER TABLE songs ADD COLUMN loudness REAL",
+                    "ALTER TABLE songs ADD COLUMN peak REAL",
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_songs_loudness ON songs(loudness)
+                    """
+                ]
             }
         ]
     
     def run_migrations(self):
-        """Ejecutar todas las migraciones pendientes"""
-        pending_migrations = self.get_migrations_to_apply()
+        """
+        Ejecutar todas las migraciones pendientes
         
-        if not pending_migrations:
+        Camino rápido: una lectura de PRAGMA user_version. Solo si el esquema
+        está por detrás se consulta la tabla migrations (las bases de datos
+        anteriores a user_version tienen 0 y sus migraciones ya registradas
+        se omiten).
+        """
+        latest_version = self.get_latest_version()
+        if self.get_schema_version() >= latest_version:
             logger.info("No hay migraciones pendientes")
             return
         
+        self._ensure_migrations_table()
+        applied = self.get_applied_migrations()
+        pending_migrations = [
+            migration for migration in self._get_all_migrations()
+            if migration['version'] not in applied
+        ]
+        
         for migration in pending_migrations:
             self.apply_migration(
                 migration['version'],
                 migration['description'],
-                migration['sql_commands']
+                migration['sql_commands'],
+                applied_migrations=applied
             )
         
+        if not pending_migrations:
+            # Base de datos migrada antes de usar user_version
+            with self.db.get_connection() as conn:
+                self._set_schema_version(conn, latest_version)
+        
         logger.info(f"Se aplicaron {len(pending_migrations)} migraciones")
@@ -0,0 +1,185 @@
+"""
+Comprobación de planes de consulta (EXPLAIN QUERY PLAN)
+
+Cada repositorio describe las formas de consulta que ejecuta mediante
+``query_shapes()``. QueryPlanChecker obtiene el plan de cada una sobre una
+base de datos poblada y señala las regresiones: recorridos completos de
+tabla sin índice (``SCAN songs``) y ordenaciones en un B-tree temporal.
+"""
+
+import logging
+import random
+import re
+from typing import List, NamedTuple, Optional, Sequence
+
+from .connection import DatabaseConnection
+from .query_shape import QueryShape
+
+logger = logging.getLogger(__name__)
+
+# "SCAN songs" (o "SCAN TABLE songs" en SQLite < 3.36) sin "USING ..."
+FULL_SCAN_PATTERN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+# Ordenaciones que SQLite resuelve fuera de un índice. "FOR DISTINCT" no es
+# una ordenación y su tamaño depende solo de los valores distintos.
+TEMP_SORT_PATTERN = re.compile(
+    r"USE TEMP B-TREE FOR (?:(?:RIGHT PART OF |LAST TERM OF )?ORDER BY|GROUP BY)"
+)
+
+
+class PlanCheck(NamedTuple):
+    """Resultado de comprobar una forma de consulta"""
+    shape: QueryShape
+    plan: List[str]
+    regressions: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.regressions
+
+
+def explain_query_plan(db: DatabaseConnection, sql: str, params: tuple = ()) -> List[str]:
+    """
+    Obtener el plan de una consulta
+
+    Args:
+        db: Conexión a base de datos
+        sql: Consulta SQL
+        params: Parámetros de la consulta
+
+    Returns:
+        List[str]: Columna ``detail`` de cada paso del plan
+    """
+    rows = db.execute_query(f"EXPLAIN QUERY PLAN {sql}", params)
+    return [row['detail'] for row in rows]
+
+
+def find_plan_regressions(plan: Sequence[str], full_scan_ok: bool = False) -> List[str]:
+    """
+    Buscar pasos del plan que indican una regresión
+
+    Args:
+        plan: Pasos del plan (ver explain_query_plan)
+        full_scan_ok: True si la consulta admite un recorrido completo
+
+    Returns:
+        List[str]: Pasos problemáticos, vacía si el plan es correcto
+    """
+    regressions = []
+    for detail in plan:
+        if TEMP_SORT_PATTERN.search(detail):
+            regressions.append(detail)
+        elif FULL_SCAN_PATTERN.match(detail) and not full_scan_ok:
+            regressions.append(detail)
+    return regressions
+
+
+def collect_query_shapes() -> List[QueryShape]:
+    """
+    Reunir las formas de consulta de todos los repositorios
+
+    Returns:
+        List[QueryShape]: Consultas de SongRepository, BaseService (sobre la
+        tabla songs) y MigrationManager
+    """
+    # Importación diferida: este módulo no debe cargarse al importar los modelos
+    from ..models.song import SongRepository
+    from ..services.base_service import BaseService
+    from .migrations import MigrationManager
+
+    return (
+        SongRepository.query_shapes()
+        + BaseService.query_shapes("songs")
+        + MigrationManager.query_shapes()
+    )
+
+
+def seed_database(db: DatabaseConnection, rows: int, seed: int = 0,
+                  batch_size: int = 10000):
+    """
+    Poblar la tabla songs con datos sintéticos y actualizar estadísticas
+
+    Los planes dependen del tamaño de la tabla y de las estadísticas de
+    ANALYZE, así que se comprueban sobre una biblioteca de tamaño realista.
+
+    Args:
+        db: Conexión a base de datos con las migraciones aplicadas
+        rows: Canciones a insertar
+        seed: Semilla del generador aleatorio
+        batch_size: Filas por executemany
+    """
+    rng = random.Random(seed)
+    artists = max(1, rows // 20)
+    query = """
+    INSERT INTO songs (title, artist, album, genre, bpm, file_path, created_at,
+                       duration, bitrate, loudness, peak)
+    VALUES (?, ?, ?, ?, ?, ?, datetime('2020-01-01', ? || ' minutes'), ?, ?, ?, ?)
+    """
+    with db.get_connection() as conn:
+        for start in range(0, rows, batch_size):
+            batch = []
+            for i in range(start, min(start + batch_size, rows)):
+                artist = rng.randrange(artists)
+                # Una parte de la biblioteca sin sonoridad medida
+                analyzed = rng.random() < 0.8
+                batch.append((
+                    f"Track {i:07d}",
+                    f"Artist {artist:05d}",
+                    f"Album {artist:05d}-{rng.randrange(5)}",
+                    f"Genre {rng.randrange(40):02d}",
+                    rng.randrange(60, 200) if rng.random() < 0.7 else None,
+                    f"/music/{artist:05d}/{i:07d}.mp3",
+                    i,
+                    round(rng.uniform(90, 420), 3),
+                    rng.choice((128000, 192000, 256000, 320000)),
+                    round(rng.uniform(-16, -6), 2) if analyzed else None,
+                    round(rng.uniform(0.5, 1.0), 4) if analyzed else None,
+                ))
+            conn.executemany(query, batch)
+        conn.execute("ANALYZE")
+
+
+class QueryPlanChecker:
+    """Comprobador de planes para un conjunto de formas de consulta"""
+
+    def __init__(self, db: DatabaseConnection):
+        """
+        Inicializar comprobador
+
+        Args:
+            db: Conexión a una base de datos con las migraciones aplicadas
+        """
+        self.db = db
+
+    def check(self, shapes: Optional[Sequence[QueryShape]] = None) -> List[PlanCheck]:
+        """
+        Comprobar el plan de cada forma de consulta
+
+        Args:
+            shapes: Formas a comprobar (por defecto, todas las de collect_query_shapes)
+
+        Returns:
+            List[PlanCheck]: Resultado por forma, en el mismo orden
+        """
+        if shapes is None:
+            shapes = collect_query_shapes()
+        results = []
+        for shape in shapes:
+            plan = explain_query_plan(self.db, shape.sql, shape.params)
+            regressions = find_plan_regressions(plan, shape.full_scan_ok)
+            if regressions:
+                logger.warning(f"Query plan regression in {shape.name}: {regressions}")
+            results.append(PlanCheck(shape, plan, regressions))
+        return results
+
+    def regressions(self, shapes: Optional[Sequence[QueryShape]] = None) -> List[PlanCheck]:
+        """
+        Comprobar y devolver solo las formas con regresiones
+
+        Args:
+            shapes: Formas a comprobar (por defecto, todas)
+
+        Returns:
+            List[PlanCheck]: Resultados con al menos un paso problemático
+        """
+        return [result for result in self.check(shapes) if not result.ok]
@@ -0,0 +1,22 @@
+"""
+Forma de consulta declarada por los repositorios
+
+Módulo sin dependencias para que los modelos, servicios y migraciones
+describan su SQL sin importar las herramientas de diagnóstico de
+query_plan.
+"""
+
+from typing import NamedTuple
+
+
+class QueryShape(NamedTuple):
+    """
+    Forma de una consulta: texto SQL canónico y parámetros de ejemplo
+
+    full_scan_ok marca las consultas que por naturaleza recorren la tabla
+    completa (p. ej. LIKE '%texto%' sobre varias columnas).
+    """
+    name: str
+    sql: str
+    params: tuple = ()
+    full_scan_ok: bool = False
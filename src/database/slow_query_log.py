@@ -0,0 +1,150 @@
+"""
+Registro de consultas lentas
+
+Cada sentencia que supera el umbral se escribe como una línea JSON en un
+archivo con rotación (logging.handlers.RotatingFileHandler):
+
+    {"time": "...", "duration_ms": 412.3, "rows": 50,
+     "sql": "SELECT * FROM songs WHERE LOWER(title) LIKE LOWER(?) ...",
+     "params": ["%<str:4>%", 50, 0],
+     "plan": ["SCAN songs USING INDEX idx_songs_title_nocase"]}
+
+Los parámetros de texto se sustituyen por su longitud (conservando los
+comodines % de los patrones LIKE), de modo que el registro puede
+compartirse sin revelar títulos, rutas ni búsquedas del usuario.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(query: str) -> str:
+    """Texto SQL en una sola línea, con los espacios colapsados"""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def redact_value(value: Any) -> Any:
+    """
+    Ocultar el contenido de un parámetro conservando su forma
+
+    Los números y NULL se mantienen (LIMIT/OFFSET explican muchas consultas
+    lentas); los textos se reducen a su longitud y los BLOB a su tamaño.
+
+    Args:
+        value: Parámetro de la consulta
+
+    Returns:
+        Valor seguro para el registro
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<blob:{len(value)}>"
+    text = str(value)
+    prefix = "%" if text.startswith("%") else ""
+    suffix = "%" if text.endswith("%") and len(text) > len(prefix) else ""
+    core = text[len(prefix):len(text) - len(suffix)]
+    return f"{prefix}<str:{len(core)}>{suffix}"
+
+
+def redact_params(params: Sequence) -> list:
+    """Aplicar redact_value a todos los parámetros"""
+    if isinstance(params, dict):
+        return {key: redact_value(value) for key, value in params.items()}
+    return [redact_value(value) for value in params]
+
+
+class SlowQueryLog:
+    """Registro de sentencias que superan un umbral de duración"""
+
+    def __init__(self, log_path: str, threshold_ms: float = 100.0,
+                 max_bytes: int = 1_048_576, backup_count: int = 3,
+                 explain: bool = True, keep_recent: int = 100):
+        """
+        Inicializar registro
+
+        Args:
+            log_path: Archivo de registro (se crea el directorio si no existe)
+            threshold_ms: Duración mínima para registrar una sentencia
+            max_bytes: Tamaño a partir del cual se rota el archivo
+            backup_count: Archivos rotados que se conservan
+            explain: Incluir EXPLAIN QUERY PLAN de cada sentencia lenta
+            keep_recent: Entradas recientes conservadas en memoria
+        """
+        self.log_path = Path(log_path)
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.count = 0
+        self.recent = deque(maxlen=keep_recent)
+        self._lock = threading.Lock()
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._handler = RotatingFileHandler(
+            self.log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        # Logger propio por archivo para no mezclar con el log de la aplicación
+        self._logger = logging.getLogger(f"{__name__}.{self.log_path.resolve()}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.handlers = [self._handler]
+
+    def is_slow(self, duration_ms: float) -> bool:
+        """Indicar si una duración supera el umbral"""
+        return duration_ms >= self.threshold_ms
+
+    def record(self, conn: sqlite3.Connection, query: str, params: Sequence,
+               duration_ms: float, rows: Optional[int]) -> dict:
+        """
+        Registrar una sentencia lenta
+
+        Args:
+            conn: Conexión en la que se ejecutó (para EXPLAIN QUERY PLAN)
+            query: Texto SQL
+            params: Parámetros de la sentencia
+            duration_ms: Duración en milisegundos
+            rows: Filas devueltas o afectadas (None si se desconoce)
+
+        Returns:
+            dict: Entrada registrada
+        """
+        entry = {
+            'time': datetime.now().isoformat(timespec="milliseconds"),
+            'duration_ms': round(duration_ms, 3),
+            'rows': rows,
+            'sql': normalize_sql(query),
+            'params': redact_params(params),
+            'plan': self._explain(conn, query, params) if self.explain else [],
+        }
+        with self._lock:
+            self.count += 1
+            self.recent.append(entry)
+        self._logger.info(json.dumps(entry, ensure_ascii=False))
+        logger.debug(f"Slow query ({duration_ms:.1f} ms): {entry['sql'][:120]}")
+        return entry
+
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, query: str, params: Sequence) -> List[str]:
+        """Plan de la sentencia, o lista vacía si no admite EXPLAIN"""
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        except sqlite3.Error:
+            return []
+        return [row[3] for row in rows]
+
+    def close(self):
+        """Cerrar el archivo de registro"""
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
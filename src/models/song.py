@@ -2,37 +2,354 @@
 Modelo para la gestión de canciones
 """
 
-from dataclasses import dataclass
+import math
+import os
+import sys
+from array import array
+from contextlib import closing
+from dataclasses import FrozenInstanceError
+from functools import lru_cache
+from itertools import product
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Iterable, Iterator
+
+from ..database.query_shape import QueryShape
+from ..utils.instrumentation import timed
 
-@dataclass
 class Song:
-    """Modelo de datos para una canción"""
-    id: Optional[int]
-    title: str
-    artist: str
-    album: str
-    genre: str
-    bpm: Optional[int]
-    file_path: Path
+    """
+    Modelo de datos inmutable para una canción
+    
+    Usa ``__slots__`` para no reservar un ``__dict__`` por instancia y guarda
+    la ruta como ``str``: el ``Path`` solo se construye al acceder a
+    ``file_path``. Los textos muy repetidos (artista, álbum, género) se
+    internan al leer de la base de datos.
+    
+    Las propiedades de audio (duración en segundos, bitrate en bps,
+    frecuencia de muestreo en Hz, canales, códec y tamaño en bytes) se
+    leen al importar y son None si no se conocen. La sonoridad integrada
+    (LUFS) y el pico de muestra (lineal) salen de las etiquetas ReplayGain
+    o del análisis de LoudnessJob.
+    """
+    
+    FIELDS = ('id', 'title', 'artist', 'album', 'genre', 'bpm', 'file_path', 'created_at',
+              'duration', 'bitrate', 'sample_rate', 'channels', 'codec', 'file_size',
+              'loudness', 'peak')
+    __slots__ = ('id', 'title', 'artist', 'album', 'genre', 'bpm', '_file_path', 'created_at',
+                 'duration', 'bitrate', 'sample_rate', 'channels', 'codec', 'file_size',
+                 'loudness', 'peak')
+    
+    # Campos opcionales leídos de audio.info al importar
+    AUDIO_FIELDS = ('duration', 'bitrate', 'sample_rate', 'channels', 'codec', 'file_size')
+    
+    def __init__(self, id: Optional[int], title: str, artist: str, album: str, genre: str,
+                 bpm: Optional[int], file_path, created_at: Optional[str] = None,
+                 duration: Optional[float] = None, bitrate: Optional[int] = None,
+                 sample_rate: Optional[int] = None, channels: Optional[int] = None,
+                 codec: Optional[str] = None, file_size: Optional[int] = None,
+                 loudness: Optional[float] = None, peak: Optional[float] = None):
+        set_field = object.__setattr__
+        set_field(self, 'id', id)
+        set_field(self, 'title', title)
+        set_field(self, 'artist', artist)
+        set_field(self, 'album', album)
+        set_field(self, 'genre', genre)
+        set_field(self, 'bpm', bpm)
+        set_field(self, '_file_path', os.fspath(file_path))
+        set_field(self, 'created_at', created_at)
+        set_field(self, 'duration', duration)
+        set_field(self, 'bitrate', bitrate)
+        set_field(self, 'sample_rate', sample_rate)
+        set_field(self, 'channels', channels)
+        set_field(self, 'codec', codec)
+        set_field(self, 'file_size', file_size)
+        set_field(self, 'loudness', loudness)
+        set_field(self, 'peak', peak)
+    
+    @property
+    def file_path(self) -> Path:
+        """Ruta del archivo (construida bajo demanda)"""
+        return Path(self._file_path)
+    
+    @property
+    def file_path_str(self) -> str:
+        """Ruta del archivo como texto, sin construir un Path"""
+        return self._file_path
+    
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+    
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+    
+    def _astuple(self) -> tuple:
+        """Valores de los campos en el orden de FIELDS (ruta como str)"""
+        return (self.id, self.title, self.artist, self.album, self.genre,
+                self.bpm, self._file_path, self.created_at,
+                self.duration, self.bitrate, self.sample_rate, self.channels,
+                self.codec, self.file_size, self.loudness, self.peak)
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()
+    
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+    
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(self.FIELDS, self._astuple()))
+        return f"{self.__class__.__name__}({values})"
+    
+    def __reduce__(self):
+        # Necesario para pickle (p. ej. pools de procesos): el __setattr__
+        # congelado impide restaurar el estado campo a campo
+        return (self.__class__, self._astuple())
+    
+    def replace(self, **changes) -> 'Song':
+        """
+        Crear una copia con algunos campos modificados
+        
+        Args:
+            **changes: Campos a reemplazar
+            
+        Returns:
+            Song: Nueva instancia
+        """
+        values = dict(zip(self.FIELDS, self._astuple()))
+        values.update(changes)
+        return self.__class__(**values)
+    
+    def to_dict(self) -> dict:
+        """
+        Convertir a diccionario (formato usado por la UI y AudioService)
+        
+        Returns:
+            dict: Campos de la canción con la ruta como str
+        """
+        return dict(zip(self.FIELDS, self._astuple()))
 
     @classmethod
     def from_db_row(cls, row):
         """Crear instancia desde una fila de base de datos"""
+        keys = row.keys()
+        codec = row["codec"] if "codec" in keys else None
         return cls(
             id=row["id"],
             title=row["title"],
-            artist=row["artist"],
-            album=row["album"],
-            genre=row["genre"],
+            artist=sys.intern(row["artist"]),
+            album=sys.intern(row["album"]),
+            genre=sys.intern(row["genre"]),
             bpm=row["bpm"],
-            file_path=Path(row["file_path"])
+            file_path=row["file_path"],
+            created_at=row["created_at"] if "created_at" in keys else None,
+            duration=row["duration"] if "duration" in keys else None,
+            bitrate=row["bitrate"] if "bitrate" in keys else None,
+            sample_rate=row["sample_rate"] if "sample_rate" in keys else None,
+            channels=row["channels"] if "channels" in keys else None,
+            codec=sys.intern(codec) if codec else None,
+            file_size=row["file_size"] if "file_size" in keys else None,
+            loudness=row["loudness"] if "loudness" in keys else None,
+            peak=row["peak"] if "peak" in keys else None
         )
 
+
+class SongBatch:
+    """
+    Contenedor columnar para resultados masivos de canciones
+    
+    Guarda cada campo en un arreglo paralelo en lugar de un objeto por fila:
+    ids y BPM en ``array`` de enteros y los textos repetidos internados, de
+    modo que artistas, álbumes y géneros se almacenan una sola vez. Pensado
+    para operaciones sobre toda la biblioteca (playlists, exportación,
+    análisis); los objetos ``Song`` se materializan solo al indexar.
+    """
+    
+    # Valor centinela para BPM desconocido dentro del array de enteros
+    NO_BPM = -1
+    
+    # Centinela para propiedades de audio desconocidas en los arrays de
+    # enteros (duración, sonoridad y pico desconocidos se guardan como NaN)
+    UNKNOWN = -1
+    
+    __slots__ = ('ids', 'titles', 'artists', 'albums', 'genres', 'bpms', 'file_paths', 'created_at',
+                 'durations', 'bitrates', 'sample_rates', 'channels', 'codecs', 'file_sizes',
+                 'loudnesses', 'peaks')
+    
+    def __init__(self):
+        self.ids = array('q')
+        self.titles: List[str] = []
+        self.artists: List[str] = []
+        self.albums: List[str] = []
+        self.genres: List[str] = []
+        self.bpms = array('i')
+        self.file_paths: List[str] = []
+        self.created_at: List[Optional[str]] = []
+        self.durations = array('d')
+        self.bitrates = array('i')
+        self.sample_rates = array('i')
+        self.channels = array('b')
+        self.codecs: List[Optional[str]] = []
+        self.file_sizes = array('q')
+        self.loudnesses = array('d')
+        self.peaks = array('d')
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> 'SongBatch':
+        """
+        Crear un lote desde filas de base de datos
+        
+        Args:
+            rows: Filas con las columnas de la tabla songs
+            
+        Returns:
+            SongBatch: Lote con todas las filas
+        """
+        batch = cls()
+        batch.extend_rows(rows)
+        return batch
+    
+    def extend_rows(self, rows: Iterable):
+        """Agregar filas de base de datos al lote"""
+        intern = sys.intern
+        unknown = self.UNKNOWN
+        for row in rows:
+            keys = row.keys()
+            self.ids.append(row["id"] or 0)
+            self.titles.append(row["title"])
+            self.artists.append(intern(row["artist"]))
+            self.albums.append(intern(row["album"]))
+            self.genres.append(intern(row["genre"]))
+            bpm = row["bpm"]
+            self.bpms.append(self.NO_BPM if bpm is None else bpm)
+            self.file_paths.append(row["file_path"])
+            created_at = row["created_at"] if "created_at" in keys else None
+            self.created_at.append(intern(created_at) if created_at else None)
+            for column, field in ((self.durations, "duration"), (self.loudnesses, "loudness"),
+                                  (self.peaks, "peak")):
+                value = row[field] if field in keys else None
+                column.append(math.nan if value is None else value)
+            for column, field in ((self.bitrates, "bitrate"), (self.sample_rates, "sample_rate"),
+                                  (self.channels, "channels"), (self.file_sizes, "file_size")):
+                value = row[field] if field in keys else None
+                column.append(unknown if value is None else value)
+            codec = row["codec"] if "codec" in keys else None
+            self.codecs.append(intern(codec) if codec else None)
+    
+    def append(self, song: Song):
+        """Agregar una canción al lote"""
+        self.extend_rows([song.to_dict()])
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getitem__(self, index: int) -> Song:
+        bpm = self.bpms[index]
+        return Song(
+            id=self.ids[index] or None,
+            title=self.titles[index],
+            artist=self.artists[index],
+            album=self.albums[index],
+            genre=self.genres[index],
+            bpm=None if bpm == self.NO_BPM else bpm,
+            file_path=self.file_paths[index],
+            created_at=self.created_at[index],
+            duration=self._known_float(self.durations[index]),
+            bitrate=self._known(self.bitrates[index]),
+            sample_rate=self._known(self.sample_rates[index]),
+            channels=self._known(self.channels[index]),
+            codec=self.codecs[index],
+            file_size=self._known(self.file_sizes[index]),
+            loudness=self._known_float(self.loudnesses[index]),
+            peak=self._known_float(self.peaks[index])
+        )
+    
+    @classmethod
+    def _known(cls, value: int) -> Optional[int]:
+        """Valor de un array de enteros, None si es el centinela"""
+        return None if value == cls.UNKNOWN else value
+    
+    @staticmethod
+    def _known_float(value: float) -> Optional[float]:
+        """Valor de un array de reales, None si es NaN"""
+        return None if math.isnan(value) else value
+    
+    def __iter__(self) -> Iterator[Song]:
+        for index in range(len(self)):
+            yield self[index]
+
 class SongRepository:
     """Repositorio para operaciones CRUD de canciones"""
     
+    # Claves de ordenación -> expresión SQL. Cada expresión coincide con un
+    # índice (ver migración 003), así SQLite recorre el índice en orden y no
+    # necesita un paso de ordenación (temp B-tree) para cada página.
+    SORT_COLUMNS = {
+        'title': 'title COLLATE NOCASE',
+        'artist': 'artist COLLATE NOCASE',
+        'album': 'album COLLATE NOCASE',
+        'genre': 'genre COLLATE NOCASE',
+        'bpm': 'bpm',
+        'date_added': 'created_at',
+        'duration': 'duration',
+        'bitrate': 'bitrate',
+    }
+    DEFAULT_SORT = 'title'
+    
+    # Condiciones de búsqueda en orden fijo: (título, artista, género)
+    SEARCH_CONDITIONS = (
+        "LOWER(title) LIKE LOWER(?)",
+        "LOWER(artist) LIKE LOWER(?)",
+        "LOWER(genre) LIKE LOWER(?)",
+    )
+    
+    INSERT_QUERY = (
+        "INSERT INTO songs (title, artist, album, genre, bpm, file_path, "
+        "duration, bitrate, sample_rate, channels, codec, file_size, loudness, peak) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    UPDATE_BPM_QUERY = "UPDATE songs SET bpm = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+    UPDATE_LOUDNESS_QUERY = (
+        "UPDATE songs SET loudness = ?, peak = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+    )
+    COUNT_QUERY = "SELECT COUNT(*) as total FROM songs"
+    EXISTS_QUERY = "SELECT COUNT(*) as count FROM songs WHERE file_path = ?"
+    DISTINCT_ARTISTS_QUERY = (
+        "SELECT DISTINCT artist FROM songs WHERE artist IS NOT NULL AND artist != '' "
+        "ORDER BY artist COLLATE NOCASE"
+    )
+    DISTINCT_GENRES_QUERY = (
+        "SELECT DISTINCT genre FROM songs WHERE genre IS NOT NULL AND genre != '' "
+        "ORDER BY genre COLLATE NOCASE"
+    )
+    # Canciones pendientes de detección de tempo (usa idx_songs_bpm)
+    MISSING_BPM_QUERY = "SELECT id, file_path FROM songs WHERE bpm IS NULL"
+    # Canciones pendientes de medir la sonoridad (usa idx_songs_loudness)
+    MISSING_LOUDNESS_QUERY = "SELECT id, file_path FROM songs WHERE loudness IS NULL"
+    # Formas de onda (migración 006); la búsqueda por song_id usa la clave primaria
+    WAVEFORM_QUERY = "SELECT peaks FROM waveforms WHERE song_id = ?"
+    SAVE_WAVEFORM_QUERY = "INSERT OR REPLACE INTO waveforms (song_id, peaks) VALUES (?, ?)"
+    MISSING_WAVEFORM_QUERY = (
+        "SELECT id, file_path FROM songs "
+        "WHERE NOT EXISTS (SELECT 1 FROM waveforms WHERE waveforms.song_id = songs.id)"
+    )
+    # Estadísticas de la biblioteca en una sola agregación (migración 005)
+    LIBRARY_STATS_QUERY = (
+        "SELECT COUNT(*) AS total_songs, COALESCE(SUM(duration), 0) AS total_duration, "
+        "COALESCE(SUM(file_size), 0) AS total_size FROM songs"
+    )
+    GENRE_STATS_QUERY = (
+        "SELECT genre, COUNT(*) AS songs, COALESCE(SUM(duration), 0) AS duration, "
+        "COALESCE(SUM(file_size), 0) AS size FROM songs "
+        "GROUP BY genre COLLATE NOCASE ORDER BY genre COLLATE NOCASE"
+    )
+    # Un registro por álbum con una pista representativa (para la carátula)
+    ALBUMS_QUERY = (
+        "SELECT album, artist, MIN(file_path) AS file_path, COUNT(*) AS tracks FROM songs "
+        "GROUP BY album COLLATE NOCASE, artist COLLATE NOCASE "
+        "ORDER BY album COLLATE NOCASE, artist COLLATE NOCASE"
+    )
+    
     def __init__(self, db_connection):
         """
         Inicializar repositorio
@@ -42,26 +359,123 @@ class SongRepository:
         """
         self.db = db_connection
         
-    def get_all(self, page: int = 1, per_page: int = 50) -> list[Song]:
+    @classmethod
+    def order_by_clause(cls, sort_by: str = DEFAULT_SORT, descending: bool = False) -> str:
+        """
+        Construir la cláusula ORDER BY para una clave de ordenación
+        
+        El desempate por ``id`` (rowid) mantiene estable la paginación y
+        sigue resolviéndose con el índice, ya que cada entrada del índice
+        termina en el rowid. Ambos términos usan la misma dirección para que
+        el índice pueda recorrerse también en sentido inverso.
+        
+        Args:
+            sort_by: Clave de ordenación (ver SORT_COLUMNS)
+            descending: True para orden descendente
+            
+        Returns:
+            str: Expresión para ORDER BY
+            
+        Raises:
+            ValueError: Si la clave de ordenación no está soportada
+        """
+        if sort_by not in cls.SORT_COLUMNS:
+            raise ValueError(f"Clave de ordenación no soportada: {sort_by}")
+        direction = "DESC" if descending else "ASC"
+        return f"{cls.SORT_COLUMNS[sort_by]} {direction}, id {direction}"
+    
+    @classmethod
+    def ordered_query(cls, sort_by: str = DEFAULT_SORT, descending: bool = False) -> str:
+        """
+        Consulta de toda la tabla en el orden pedido
+        
+        Args:
+            sort_by: Clave de ordenación (ver SORT_COLUMNS)
+            descending: True para orden descendente
+            
+        Returns:
+            str: SELECT sin LIMIT
+        """
+        return f"SELECT * FROM songs ORDER BY {cls.order_by_clause(sort_by, descending)}"
+        
+    @timed("repository.get_all")
+    def get_all(self, page: int = 1, per_page: int = 50,
+                sort_by: str = DEFAULT_SORT, descending: bool = False) -> list[Song]:
         """
         Obtener canciones paginadas
         
         Args:
             page: Número de página (comienza en 1)
             per_page: Canciones por página
+            sort_by: Clave de ordenación (ver SORT_COLUMNS)
+            descending: True para orden descendente
             
         Returns:
             list[Song]: Lista de canciones en la página
         """
         offset = (page - 1) * per_page
-        query = """
-        SELECT * FROM songs
-        ORDER BY title COLLATE NOCASE
-        LIMIT ? OFFSET ?
-        """
+        query = f"{self.ordered_query(sort_by, descending)} LIMIT ? OFFSET ?"
         rows = self.db.execute_query(query, (per_page, offset))
         return [Song.from_db_row(row) for row in rows]
     
+    @timed("repository.get_all_batch")
+    def get_all_batch(self, sort_by: str = DEFAULT_SORT, descending: bool = False) -> SongBatch:
+        """
+        Obtener toda la biblioteca en formato columnar
+        
+        Args:
+            sort_by: Clave de ordenación (ver SORT_COLUMNS)
+            descending: True para orden descendente
+            
+        Returns:
+            SongBatch: Todas las canciones en arreglos paralelos
+        """
+        query = self.ordered_query(sort_by, descending)
+        with closing(self.db.iter_query(query)) as rows:
+            return SongBatch.from_rows(rows)
+    
+    def iter_songs(self, sort_by: str = DEFAULT_SORT, descending: bool = False,
+                   chunk_size: int = 500) -> Iterator[Song]:
+        """
+        Recorrer toda la biblioteca sin cargarla en memoria
+        
+        Pensado para trabajos sobre la tabla completa (exportación, análisis).
+        La conexión queda abierta mientras dure la iteración: si se deja a
+        medias hay que cerrar el generador (ver DatabaseConnection.iter_query_chunks).
+        
+        Args:
+            sort_by: Clave de ordenación (ver SORT_COLUMNS)
+            descending: True para orden descendente
+            chunk_size: Filas leídas por cada fetchmany
+            
+        Yields:
+            Song: Canciones en el orden pedido
+        """
+        query = self.ordered_query(sort_by, descending)
+        with closing(self.db.iter_query(query, chunk_size=chunk_size)) as rows:
+            for row in rows:
+                yield Song.from_db_row(row)
+    
+    def iter_batches(self, sort_by: str = DEFAULT_SORT, descending: bool = False,
+                     chunk_size: int = 10000) -> Iterator[SongBatch]:
+        """
+        Recorrer toda la biblioteca en lotes columnares
+        
+        Como iter_songs, hay que agotar o cerrar el generador.
+        
+        Args:
+            sort_by: Clave de ordenación (ver SORT_COLUMNS)
+            descending: True para orden descendente
+            chunk_size: Canciones por lote
+            
+        Yields:
+            SongBatch: Lotes de hasta chunk_size canciones
+        """
+        query = self.ordered_query(sort_by, descending)
+        with closing(self.db.iter_query_chunks(query, chunk_size=chunk_size)) as chunks:
+            for rows in chunks:
+                yield SongBatch.from_rows(rows)
+    
     def get_total_pages(self, per_page: int = 50) -> int:
         """
         Obtener número total de páginas
@@ -72,13 +486,14 @@ class SongRepository:
         Returns:
             int: Número total de páginas
         """
-        query = "SELECT COUNT(*) as total FROM songs"
-        result = self.db.execute_query(query)[0]
+        result = self.db.execute_query(self.COUNT_QUERY)[0]
         total = result["total"]
         return (total + per_page - 1) // per_page
     
+    @timed("repository.search")
     def search(self, title: str = "", artist: str = "", genre: str = "", 
-              page: int = 1, per_page: int = 50) -> Tuple[List[Song], int]:
+              page: int = 1, per_page: int = 50,
+              sort_by: str = DEFAULT_SORT, descending: bool = False) -> Tuple[List[Song], int]:
         """
         Buscar canciones con filtros
         
@@ -88,46 +503,62 @@ class SongRepository:
             genre: Filtro por género
             page: Número de página
             per_page: Canciones por página
+            sort_by: Clave de ordenación (ver SORT_COLUMNS)
+            descending: True para orden descendente
             
         Returns:
             Tuple[List[Song], int]: Lista de canciones que coinciden y el número total de canciones que coinciden con el filtro.
         """
-        conditions = []
-        where_params = []
-        
-        if title:
-            conditions.append("LOWER(title) LIKE LOWER(?)")
-            where_params.append(f"%{title}%")
-        if artist:
-            conditions.append("LOWER(artist) LIKE LOWER(?)")
-            where_params.append(f"%{artist}%")
-        if genre:
-            conditions.append("LOWER(genre) LIKE LOWER(?)")
-            where_params.append(f"%{genre}%")
-            
-        where_clause_str = "1=1"
-        if conditions:
-            where_clause_str = " AND ".join(conditions)
-        
-        count_query = f"SELECT COUNT(*) as total FROM songs WHERE {where_clause_str}"
-        count_result = self.db.execute_query(count_query, tuple(where_params))
+        filters = (title, artist, genre)
+        where_params = tuple(f"%{value}%" for value in filters if value)
+        count_query, select_query = self.search_queries(
+            tuple(bool(value) for value in filters), sort_by, descending
+        )
+        
+        count_result = self.db.execute_query(count_query, where_params)
         total_items_matching_filter = count_result[0]['total'] if count_result and count_result[0] else 0
         
         offset = (page - 1) * per_page
-        select_params = list(where_params)
-        select_params.extend([per_page, offset])
-        
-        select_query = f"""
-        SELECT * FROM songs
-        WHERE {where_clause_str}
-        ORDER BY title COLLATE NOCASE
-        LIMIT ? OFFSET ?
-        """
+        select_params = where_params + (per_page, offset)
         
-        rows = self.db.execute_query(select_query, tuple(select_params))
+        rows = self.db.execute_query(select_query, select_params)
         songs = [Song.from_db_row(row) for row in rows]
         return songs, total_items_matching_filter
     
+    @classmethod
+    @lru_cache(maxsize=128)
+    def search_queries(cls, active_filters: Tuple[bool, bool, bool],
+                       sort_by: str = DEFAULT_SORT, descending: bool = False) -> Tuple[str, str]:
+        """
+        Obtener el texto SQL canónico de una búsqueda
+        
+        Cada combinación de filtros activos produce siempre el mismo texto
+        (condiciones en orden fijo, un marcador por filtro activo), así que
+        SQLite reutiliza la sentencia preparada en lugar de volver a
+        analizarla en cada pulsación de tecla.
+        
+        Args:
+            active_filters: (título, artista, género) activos
+            sort_by: Clave de ordenación (ver SORT_COLUMNS)
+            descending: True para orden descendente
+            
+        Returns:
+            Tuple[str, str]: (consulta de conteo, consulta de página)
+        """
+        conditions = [
+            condition
+            for condition, active in zip(cls.SEARCH_CONDITIONS, active_filters)
+            if active
+        ]
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        count_query = f"SELECT COUNT(*) as total FROM songs WHERE {where_clause}"
+        select_query = (
+            f"SELECT * FROM songs WHERE {where_clause} "
+            f"ORDER BY {cls.order_by_clause(sort_by, descending)} LIMIT ? OFFSET ?"
+        )
+        return count_query, select_query
+    
+    @timed("repository.add")
     def add(self, song: Song) -> int:
         """
         Agregar una nueva canción
@@ -138,24 +569,122 @@ class SongRepository:
         Returns:
             int: ID de la canción agregada
         """
-        query = """
-        INSERT INTO songs (title, artist, album, genre, bpm, file_path)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """
-        params = (
-            song.title,
-            song.artist,
-            song.album,
-            song.genre,
-            song.bpm,
-            str(song.file_path)
-        )
-        self.db.execute_insert_update_delete(query, params)
+        self.db.execute_insert_update_delete(self.INSERT_QUERY, self._insert_params(song))
         
         # Obtener el ID de la última inserción
         result = self.db.execute_query("SELECT last_insert_rowid() as id")[0]
         return result["id"]
     
+    @timed("repository.add_many")
+    def add_many(self, songs: Iterable[Song]) -> int:
+        """
+        Agregar varias canciones en una sola transacción
+        
+        Args:
+            songs: Canciones a agregar
+            
+        Returns:
+            int: Número de canciones insertadas
+        """
+        params = (self._insert_params(song) for song in songs)
+        return self.db.execute_many(self.INSERT_QUERY, params)
+    
+    @staticmethod
+    def _insert_params(song: Song) -> tuple:
+        """Parámetros de INSERT_QUERY para una canción"""
+        return (song.title, song.artist, song.album, song.genre, song.bpm, song.file_path_str,
+                song.duration, song.bitrate, song.sample_rate, song.channels, song.codec,
+                song.file_size, song.loudness, song.peak)
+    
+    @timed("repository.update_bpm")
+    def update_bpm(self, bpms: Iterable[Tuple[int, int]]) -> int:
+        """
+        Guardar el BPM de varias canciones en una sola transacción
+        
+        Args:
+            bpms: Pares (id de canción, BPM)
+            
+        Returns:
+            int: Número de canciones actualizadas
+        """
+        params = ((bpm, song_id) for song_id, bpm in bpms)
+        return self.db.execute_many(self.UPDATE_BPM_QUERY, params)
+    
+    @timed("repository.get_songs_without_bpm")
+    def get_songs_without_bpm(self) -> List[Tuple[int, str]]:
+        """
+        Obtener las canciones sin BPM
+        
+        Returns:
+            List[Tuple[int, str]]: Pares (id, ruta del archivo)
+        """
+        rows = self.db.execute_query(self.MISSING_BPM_QUERY)
+        return [(row['id'], row['file_path']) for row in rows]
+    
+    @timed("repository.update_loudness")
+    def update_loudness(self, values: Iterable[Tuple[int, float, float]]) -> int:
+        """
+        Guardar la sonoridad de varias canciones en una sola transacción
+        
+        Args:
+            values: Tuplas (id de canción, sonoridad en LUFS, pico lineal)
+            
+        Returns:
+            int: Número de canciones actualizadas
+        """
+        params = ((loudness, peak, song_id) for song_id, loudness, peak in values)
+        return self.db.execute_many(self.UPDATE_LOUDNESS_QUERY, params)
+    
+    @timed("repository.get_songs_without_loudness")
+    def get_songs_without_loudness(self) -> List[Tuple[int, str]]:
+        """
+        Obtener las canciones sin sonoridad medida
+        
+        Returns:
+            List[Tuple[int, str]]: Pares (id, ruta del archivo)
+        """
+        rows = self.db.execute_query(self.MISSING_LOUDNESS_QUERY)
+        return [(row['id'], row['file_path']) for row in rows]
+    
+    @timed("repository.get_waveform")
+    def get_waveform(self, song_id: int) -> Optional[bytes]:
+        """
+        Obtener la forma de onda precalculada de una canción
+        
+        Args:
+            song_id: ID de la canción
+            
+        Returns:
+            Optional[bytes]: Picos (mín, máx) int8 intercalados, o None si no se ha calculado
+        """
+        rows = self.db.execute_query(self.WAVEFORM_QUERY, (song_id,))
+        return bytes(rows[0]['peaks']) if rows else None
+    
+    @timed("repository.save_waveforms")
+    def save_waveforms(self, waveforms: Iterable[Tuple[int, bytes]]) -> int:
+        """
+        Guardar formas de onda en una sola transacción
+        
+        Args:
+            waveforms: Pares (id de canción, picos)
+            
+        Returns:
+            int: Número de formas de onda guardadas
+        """
+        return self.db.execute_many(self.SAVE_WAVEFORM_QUERY, waveforms)
+    
+    @timed("repository.get_songs_without_waveform")
+    def get_songs_without_waveform(self) -> List[Tuple[int, str]]:
+        """
+        Obtener las canciones sin forma de onda
+        
+        Returns:
+            List[Tuple[int, str]]: Pares (id, ruta del archivo)
+        """
+        rows = self.db.execute_query(self.MISSING_WAVEFORM_QUERY)
+        return [(row['id'], row['file_path']) for row in rows]
+    
+    @timed("repository.exists")
     def exists(self, file_path: Path) -> bool:
         """
         Verificar si una canción ya existe por su ruta
@@ -166,24 +695,118 @@ class SongRepository:
         Returns:
             bool: True si la canción existe
         """
-        query = "SELECT COUNT(*) as count FROM songs WHERE file_path = ?"
-        result = self.db.execute_query(query, (str(file_path),))[0]
+        result = self.db.execute_query(self.EXISTS_QUERY, (str(file_path),))[0]
         return result["count"] > 0
 
+    @timed("repository.get_distinct_artists")
     def get_distinct_artists(self) -> List[str]:
         """Obtener lista de artistas distintos"""
-        query = "SELECT DISTINCT artist FROM songs WHERE artist IS NOT NULL AND artist != '' ORDER BY artist COLLATE NOCASE"
-        rows = self.db.execute_query(query)
+        rows = self.db.execute_query(self.DISTINCT_ARTISTS_QUERY)
         return [row['artist'] for row in rows]
 
+    @timed("repository.get_distinct_genres")
     def get_distinct_genres(self) -> List[str]:
         """Obtener lista de géneros distintos"""
-        query = "SELECT DISTINCT genre FROM songs WHERE genre IS NOT NULL AND genre != '' ORDER BY genre COLLATE NOCASE"
-        rows = self.db.execute_query(query)
+        rows = self.db.execute_query(self.DISTINCT_GENRES_QUERY)
         return [row['genre'] for row in rows]
 
+    @timed("repository.get_library_stats")
+    def get_library_stats(self) -> dict:
+        """
+        Obtener totales de la biblioteca
+        
+        Returns:
+            dict: 'total_songs', 'total_duration' (segundos) y 'total_size' (bytes)
+        """
+        return dict(self.db.execute_query(self.LIBRARY_STATS_QUERY)[0])
+
+    @timed("repository.get_genre_stats")
+    def get_genre_stats(self) -> List[dict]:
+        """
+        Obtener totales por género
+        
+        Returns:
+            List[dict]: 'genre', 'songs', 'duration' (segundos) y 'size' (bytes)
+        """
+        return [dict(row) for row in self.db.execute_query(self.GENRE_STATS_QUERY)]
+
+    @timed("repository.get_albums")
+    def get_albums(self) -> List[dict]:
+        """
+        Obtener los álbumes de la biblioteca
+        
+        Returns:
+            List[dict]: Álbumes ordenados por nombre con 'album', 'artist',
+            'file_path' (una pista del álbum) y 'tracks'
+        """
+        return [dict(row) for row in self.db.execute_query(self.ALBUMS_QUERY)]
+
+    @timed("repository.get_total_songs_count")
     def get_total_songs_count(self) -> int:
         """Obtener el número total de canciones en la base de datos."""
-        query = "SELECT COUNT(*) as total FROM songs"
-        result = self.db.execute_query(query)
+        result = self.db.execute_query(self.COUNT_QUERY)
         return result[0]['total'] if result and result[0] else 0
+
+    @classmethod
+    def query_shapes(cls) -> List[QueryShape]:
+        """
+        Formas de consulta que ejecuta el repositorio
+        
+        Incluye cada combinación de filtros de búsqueda con cada clave y
+        dirección de ordenación, para comprobar sus planes con QueryPlanChecker.
+        
+        Returns:
+            List[QueryShape]: Consultas SELECT con parámetros de ejemplo
+        """
+        shapes = [
+            QueryShape("songs.count", cls.COUNT_QUERY),
+            QueryShape("songs.exists", cls.EXISTS_QUERY, ("/music/song.mp3",)),
+            QueryShape("songs.distinct_artists", cls.DISTINCT_ARTISTS_QUERY),
+            QueryShape("songs.distinct_genres", cls.DISTINCT_GENRES_QUERY),
+            QueryShape("songs.albums", cls.ALBUMS_QUERY),
+            QueryShape("songs.missing_bpm", cls.MISSING_BPM_QUERY),
+            QueryShape("songs.missing_loudness", cls.MISSING_LOUDNESS_QUERY),
+            QueryShape("songs.waveform", cls.WAVEFORM_QUERY, (1,)),
+            # Hay que comprobar cada canción: el recorrido es inevitable
+            QueryShape("songs.missing_waveform", cls.MISSING_WAVEFORM_QUERY, full_scan_ok=True),
+            # Una agregación sobre toda la tabla la recorre por definición
+            QueryShape("songs.library_stats", cls.LIBRARY_STATS_QUERY, full_scan_ok=True),
+            QueryShape("songs.genre_stats", cls.GENRE_STATS_QUERY),
+        ]
+        filter_values = ("%track%", "%artist%", "%genre%")
+        for sort_by in cls.SORT_COLUMNS:
+            for descending in (False, True):
+                suffix = f"{sort_by}.{'desc' if descending else 'asc'}"
+                shapes.append(QueryShape(
+                    f"songs.get_all.{suffix}",
+                    f"{cls.ordered_query(sort_by, descending)} LIMIT ? OFFSET ?",
+                    (50, 1000),
+                ))
+                shapes.append(QueryShape(
+                    f"songs.iter.{suffix}", cls.ordered_query(sort_by, descending)
+                ))
+                for active_filters in product((False, True), repeat=3):
+                    count_query, select_query = cls.search_queries(
+                        active_filters, sort_by, descending
+                    )
+                    params = tuple(
+                        value for value, active in zip(filter_values, active_filters) if active
+                    )
+                    name = "+".join(
+                        field for field, active in zip(("title", "artist", "genre"), active_filters)
+                        if active
+                    ) or "none"
+                    # LIKE '%texto%' no puede usar un índice: con un filtro
+                    # basta el índice de esa columna, con varios se lee la tabla
+                    shapes.append(QueryShape(
+                        f"songs.search_count.{name}", count_query, params,
+                        full_scan_ok=sum(active_filters) > 1,
+                    ))
+                    shapes.append(QueryShape(
+                        f"songs.search.{name}.{suffix}", select_query, params + (50, 0),
+                    ))
+        # Los conteos no dependen del orden: quitar duplicados conservando el orden
+        unique = {}
+        for shape in shapes:
+            unique.setdefault(shape.sql, shape)
+        return list(unique.values())
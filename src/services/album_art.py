@@ -0,0 +1,233 @@
+"""
+Carátulas de álbum: extracción con mutagen y caché de miniaturas en disco
+
+La imagen incrustada (APIC en ID3, covr en MP4, PICTURE en FLAC y
+METADATA_BLOCK_PICTURE en Ogg) se decodifica con QImage y se reduce a los
+tamaños que usa la interfaz. Las miniaturas se direccionan por contenido
+(<sha1 de la imagen>-<lado>.jpg), así que los álbumes con la misma carátula
+comparten archivos, y una referencia por álbum (albums/<clave>.ref) evita
+volver a leer las demás pistas del mismo álbum.
+
+Todo este módulo puede ejecutarse fuera del hilo principal: QImage, a
+diferencia de QPixmap, es seguro en hilos de trabajo.
+"""
+
+import base64
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+from mutagen import File as MutagenFile
+from mutagen.flac import Picture
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+# Lados (px) de las miniaturas: panel de reproducción y mosaicos de la cuadrícula
+THUMBNAIL_SIZES = (64, 160)
+THUMBNAIL_QUALITY = 85
+
+# Tipo "portada" de APIC/PICTURE
+FRONT_COVER = 3
+
+# Valores de álbum que no identifican un álbum (la carátula va por archivo)
+UNKNOWN_ALBUMS = {"", "sin álbum"}
+
+
+def extract_embedded_art(file_path) -> Optional[bytes]:
+    """
+    Extraer la carátula incrustada en un archivo de audio
+
+    Args:
+        file_path: Ruta del archivo
+
+    Returns:
+        Optional[bytes]: Imagen codificada (JPEG/PNG), preferentemente la
+        portada, o None si el archivo no tiene carátula o no se reconoce
+
+    Raises:
+        OSError: Si el archivo no se puede leer (error de E/S, quizá
+            transitorio: no equivale a "sin carátula")
+    """
+    try:
+        audio = MutagenFile(file_path)
+    except Exception as e:
+        # mutagen envuelve los errores de E/S en MutagenError
+        cause = e if isinstance(e, OSError) else (e.__cause__ or e.__context__)
+        if isinstance(cause, OSError):
+            raise OSError(f"Could not read {file_path} for album art: {cause}") from e
+        logger.debug(f"Could not parse {file_path} for album art: {e}")
+        return None
+    if audio is None:
+        return None
+
+    pictures = [(picture.type, picture.data) for picture in getattr(audio, "pictures", None) or []]
+    tags = audio.tags
+    if tags is not None:
+        if hasattr(tags, "getall"):  # ID3
+            pictures.extend((frame.type, frame.data) for frame in tags.getall("APIC"))
+        elif "covr" in tags:  # MP4
+            pictures.extend((FRONT_COVER, bytes(cover)) for cover in tags["covr"])
+        elif "metadata_block_picture" in tags:  # Ogg Vorbis/Opus
+            for value in tags["metadata_block_picture"]:
+                try:
+                    picture = Picture(base64.b64decode(value))
+                except Exception:
+                    continue
+                pictures.append((picture.type, picture.data))
+
+    pictures = [(kind, data) for kind, data in pictures if data]
+    if not pictures:
+        return None
+    return next((data for kind, data in pictures if kind == FRONT_COVER), pictures[0][1])
+
+
+class AlbumArtCache:
+    """Miniaturas de carátulas direccionadas por contenido, una referencia por álbum"""
+
+    def __init__(self, cache_dir: str, sizes: Iterable[int] = THUMBNAIL_SIZES):
+        """
+        Inicializar caché
+
+        Args:
+            cache_dir: Directorio de las miniaturas
+            sizes: Lados que se generan siempre al guardar una carátula
+        """
+        self.cache_dir = Path(cache_dir)
+        self.sizes = tuple(sizes)
+        # Pistas sin carátula en esta sesión (no se vuelven a leer)
+        self._missing = set()
+
+    @staticmethod
+    def album_key(song_data: dict) -> str:
+        """
+        Clave de deduplicación: artista y álbum, o el archivo si el álbum es desconocido
+
+        Args:
+            song_data: Diccionario de la canción (Song.to_dict)
+
+        Returns:
+            str: Hash corto estable entre sesiones
+        """
+        album = str(song_data.get("album") or "").strip().lower()
+        if album in UNKNOWN_ALBUMS:
+            material = f"file\0{song_data.get('file_path')}"
+        else:
+            material = f"album\0{str(song_data.get('artist') or '').strip().lower()}\0{album}"
+        return hashlib.sha1(material.encode("utf-8")).hexdigest()[:20]
+
+    def thumbnail_path(self, digest: str, size: int) -> Path:
+        """Archivo de una miniatura"""
+        return self.cache_dir / digest[:2] / f"{digest}-{size}.jpg"
+
+    def cached_thumbnail(self, song_data: dict, size: int) -> Optional[Path]:
+        """
+        Miniatura ya guardada para el álbum de una canción (sin leer el audio)
+
+        Returns:
+            Optional[Path]: Ruta de la miniatura o None
+        """
+        digest = self._read_ref(self.album_key(song_data))
+        if digest:
+            path = self.thumbnail_path(digest, size)
+            if path.exists():
+                return path
+        return None
+
+    def get_thumbnail(self, song_data: dict, size: int) -> Optional[Path]:
+        """
+        Obtener la miniatura de una canción, extrayéndola si no está en caché
+
+        Bloquea (lee y decodifica el archivo): llamar fuera del hilo principal.
+
+        Args:
+            song_data: Diccionario de la canción (debe incluir 'file_path')
+            size: Lado de la miniatura en px
+
+        Returns:
+            Optional[Path]: Ruta de la miniatura o None si no hay carátula
+
+        Raises:
+            OSError: Si el archivo no se puede leer (no se recuerda como sin carátula)
+        """
+        path = self.cached_thumbnail(song_data, size)
+        if path is not None:
+            return path
+
+        file_path = song_data.get("file_path")
+        if not file_path or file_path in self._missing:
+            return None
+
+        data = extract_embedded_art(file_path)
+        digest = self.store(data, set(self.sizes) | {size}) if data else None
+        if digest is None:
+            self._missing.add(file_path)
+            return None
+
+        self._write_ref(self.album_key(song_data), digest)
+        path = self.thumbnail_path(digest, size)
+        return path if path.exists() else None
+
+    def store(self, data: bytes, sizes: Optional[Iterable[int]] = None) -> Optional[str]:
+        """
+        Decodificar una imagen y guardar sus miniaturas
+
+        Args:
+            data: Imagen codificada
+            sizes: Lados a generar (por defecto self.sizes)
+
+        Returns:
+            Optional[str]: Hash del contenido o None si la imagen no es válida
+        """
+        digest = hashlib.sha1(data).hexdigest()
+        missing = [size for size in sorted(sizes or self.sizes)
+                   if not self.thumbnail_path(digest, size).exists()]
+        if not missing:
+            return digest
+
+        image = QImage()
+        if not image.loadFromData(data):
+            logger.debug(f"Undecodable album art ({len(data)} bytes)")
+            return None
+
+        for size in missing:
+            thumbnail = image
+            if max(image.width(), image.height()) > size:
+                thumbnail = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                         Qt.TransformationMode.SmoothTransformation)
+            self._save(thumbnail, self.thumbnail_path(digest, size))
+        return digest
+
+    def _ref_path(self, album_key: str) -> Path:
+        """Archivo de referencia álbum -> hash de la carátula"""
+        return self.cache_dir / "albums" / f"{album_key}.ref"
+
+    def _read_ref(self, album_key: str) -> Optional[str]:
+        try:
+            return self._ref_path(album_key).read_text(encoding="ascii").strip() or None
+        except OSError:
+            return None
+
+    def _write_ref(self, album_key: str, digest: str):
+        path = self._ref_path(album_key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(digest, encoding="ascii")
+        except OSError as e:
+            logger.warning(f"Could not write album art reference {path}: {e}")
+
+    @staticmethod
+    def _save(image: QImage, path: Path):
+        """Guardar de forma atómica (varios hilos pueden generar la misma miniatura)"""
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not image.save(str(tmp_path), "JPG", THUMBNAIL_QUALITY):
+                logger.warning(f"Could not encode album art thumbnail {path}")
+                return
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not write album art thumbnail {path}: {e}")
@@ -0,0 +1,91 @@
+"""
+Análisis de audio de las canciones importadas en una sola decodificación
+
+analyze_audio() recorre cada archivo una vez, por bloques, y alimenta a la
+vez la forma de onda (waveform.PeakAccumulator) y la sonoridad
+(loudness.LoudnessMeter). AudioAnalysisJob lo aplica a las canciones a las
+que les falta cualquiera de los dos resultados y solo calcula los que
+faltan (la sonoridad leída de etiquetas ReplayGain no se recalcula).
+"""
+
+import logging
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from .audio_decoding import open_pcm, supported_extensions, to_mono
+from .batch_job import BatchJob
+from .loudness import LoudnessMeter
+from .waveform import PeakAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResult(NamedTuple):
+    """Resultados de analyze_audio (None si no se pidieron o no hay)"""
+    waveform: Optional[bytes]
+    loudness: Optional[Tuple[float, float]]
+
+
+def analyze_audio(file_path, waveform: bool = True, loudness: bool = True) -> AnalysisResult:
+    """
+    Calcular forma de onda y sonoridad de un archivo en una pasada
+    (función de trabajo del pool de procesos)
+
+    Args:
+        file_path: Ruta del archivo
+        waveform: Calcular los picos de la forma de onda
+        loudness: Medir sonoridad y pico
+
+    Returns:
+        AnalysisResult: Picos según waveform.compute_peaks y (LUFS, pico),
+            este None si la pista es silencio
+
+    Raises:
+        UnsupportedAudioError: Si el formato no se puede decodificar
+    """
+    with open_pcm(file_path) as stream:
+        peaks = PeakAccumulator(stream.frames) if waveform else None
+        meter = LoudnessMeter(stream.sample_rate, stream.channels) if loudness else None
+        for block in stream.blocks():
+            if peaks is not None:
+                peaks.add(to_mono(block))
+            if meter is not None:
+                meter.add(block)
+    return AnalysisResult(peaks.result() if peaks is not None else None,
+                          meter.measurement() if meter is not None else None)
+
+
+class AudioAnalysisJob(BatchJob):
+    """Calcular y guardar las formas de onda y sonoridades que faltan"""
+
+    name = "audio_analysis"
+    worker = staticmethod(analyze_audio)
+
+    def __init__(self, repository, max_workers: Optional[int] = None):
+        super().__init__(repository, max_workers)
+        self.waveforms_updated = 0
+        self.loudness_updated = 0
+
+    def pending(self) -> List[Tuple[int, str, bool, bool]]:
+        """Canciones decodificables como (id, ruta, falta forma de onda, falta sonoridad)"""
+        needs = {}
+        for song_id, file_path in self.repository.get_songs_without_waveform():
+            needs[song_id] = [file_path, True, False]
+        for song_id, file_path in self.repository.get_songs_without_loudness():
+            needs.setdefault(song_id, [file_path, False, False])[2] = True
+        extensions = supported_extensions()
+        return [(song_id, file_path, waveform, loudness)
+                for song_id, (file_path, waveform, loudness) in sorted(needs.items())
+                if Path(file_path).suffix.lower() in extensions]
+
+    def store(self, results: List[Tuple[int, AnalysisResult]]) -> int:
+        """Guardar ambos resultados; devuelve las canciones con algún dato nuevo"""
+        waveforms = [(song_id, result.waveform) for song_id, result in results
+                     if result.waveform is not None]
+        measured = [(song_id, *result.loudness) for song_id, result in results
+                    if result.loudness is not None]
+        if waveforms:
+            self.waveforms_updated += self.repository.save_waveforms(waveforms)
+        if measured:
+            self.loudness_updated += self.repository.update_loudness(measured)
+        return len({song_id for song_id, _ in waveforms} | {song_id for song_id, *_ in measured})
@@ -0,0 +1,214 @@
+"""
+Decodificación de audio a PCM para análisis
+
+WAV se decodifica con el módulo estándar ``wave``; FLAC, Ogg y (con
+libsndfile >= 1.1) MP3 con ``soundfile``. Si soundfile no se puede cargar
+(instalación incompleta, libsndfile ausente) solo se analizan los WAV.
+Las muestras se devuelven como un array float32 normalizado a [-1, 1]
+(mono, o con un canal por columna), listo para los análisis vectorizados
+con NumPy (tempo, forma de onda, sonoridad).
+
+decode_pcm() devuelve un fragmento completo en memoria; para recorrer una
+pista entera (forma de onda, sonoridad) open_pcm() la lee por bloques de
+tamaño fijo, de modo que la memoria no crece con la duración.
+"""
+
+import logging
+import wave
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+try:
+    import soundfile
+except (ImportError, OSError):  # OSError: libsndfile no disponible
+    soundfile = None
+
+logger = logging.getLogger(__name__)
+
+# Extensiones que decodifica soundfile (según la versión de libsndfile)
+SOUNDFILE_EXTENSIONS = {".flac", ".ogg", ".oga", ".opus", ".mp3", ".aiff", ".aif"}
+
+# Frames por bloque al leer una pista completa (~1.5 s a 44.1 kHz)
+BLOCK_FRAMES = 1 << 16
+
+
+class UnsupportedAudioError(Exception):
+    """El formato del archivo no se puede decodificar en este entorno"""
+    pass
+
+
+def supported_extensions() -> set:
+    """Extensiones que se pueden decodificar con las dependencias instaladas"""
+    return {".wav"} | (SOUNDFILE_EXTENSIONS if soundfile is not None else set())
+
+
+def decode_pcm(file_path, offset: float = 0.0, duration: Optional[float] = None,
+               mono: bool = True) -> Tuple[np.ndarray, int]:
+    """
+    Decodificar un archivo de audio a muestras float32
+
+    Args:
+        file_path: Ruta del archivo
+        offset: Segundos a saltar desde el inicio
+        duration: Segundos a leer (None para hasta el final)
+        mono: Promediar los canales; con False se devuelve un array
+            (frames, canales)
+
+    Returns:
+        Tuple[np.ndarray, int]: (muestras float32 en [-1, 1], frecuencia de muestreo)
+
+    Raises:
+        UnsupportedAudioError: Si el formato no se puede decodificar
+        OSError: Si el archivo no se puede leer
+    """
+    with open_pcm(file_path) as stream:
+        stream.seek(int(offset * stream.sample_rate))
+        samples = stream.read(None if duration is None else int(duration * stream.sample_rate))
+    return (to_mono(samples) if mono else samples), stream.sample_rate
+
+
+def open_pcm(file_path) -> "PcmStream":
+    """
+    Abrir un archivo de audio para leerlo por bloques
+
+    Args:
+        file_path: Ruta del archivo
+
+    Returns:
+        PcmStream: Lector abierto (usar como context manager)
+
+    Raises:
+        UnsupportedAudioError: Si el formato no se puede decodificar
+        OSError: Si el archivo no se puede leer
+    """
+    path = Path(file_path)
+    extension = path.suffix.lower()
+    if extension == ".wav":
+        try:
+            return _WavStream(path)
+        except wave.Error as e:
+            # WAV en coma flotante o comprimido: probar con soundfile
+            if soundfile is None:
+                raise UnsupportedAudioError(f"{path.name}: {e}") from e
+    elif extension not in SOUNDFILE_EXTENSIONS or soundfile is None:
+        raise UnsupportedAudioError(f"No se puede decodificar {extension or path.name}")
+    return _SoundfileStream(path)
+
+
+def to_mono(samples: np.ndarray) -> np.ndarray:
+    """Promediar los canales de un array (frames, canales)"""
+    return samples.mean(axis=1, dtype=np.float32) if samples.ndim == 2 else samples.astype(np.float32)
+
+
+class PcmStream:
+    """
+    Lector de PCM por bloques
+
+    Atributos:
+        sample_rate: Frecuencia de muestreo
+        channels: Número de canales
+        frames: Frames totales según la cabecera (en MP3 puede ser una estimación)
+    """
+
+    sample_rate: int
+    channels: int
+    frames: int
+
+    def seek(self, frame: int):
+        """Situarse en un frame desde el inicio"""
+        raise NotImplementedError
+
+    def read(self, frames: Optional[int] = None) -> np.ndarray:
+        """
+        Leer frames desde la posición actual
+
+        Args:
+            frames: Frames a leer (None para hasta el final)
+
+        Returns:
+            np.ndarray: Array (frames, canales) float32; vacío al final del archivo
+        """
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+    def blocks(self, block_frames: int = BLOCK_FRAMES) -> Iterator[np.ndarray]:
+        """Recorrer el resto del archivo en bloques (frames, canales)"""
+        while True:
+            block = self.read(block_frames)
+            if not len(block):
+                return
+            yield block
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _WavStream(PcmStream):
+    """WAV PCM entero (8, 16, 24 o 32 bits)"""
+
+    def __init__(self, path: Path):
+        self._wav = wave.open(str(path), "rb")
+        self._name = path.name
+        self.sample_rate = self._wav.getframerate()
+        self.channels = self._wav.getnchannels()
+        self.frames = self._wav.getnframes()
+        self._width = self._wav.getsampwidth()
+        if self._width not in (1, 2, 3, 4):
+            self._wav.close()
+            raise UnsupportedAudioError(f"{self._name}: muestras de {self._width} bytes")
+
+    def seek(self, frame: int):
+        self._wav.setpos(max(0, min(frame, self.frames)))
+
+    def read(self, frames: Optional[int] = None) -> np.ndarray:
+        remaining = self.frames - self._wav.tell()
+        raw = self._wav.readframes(remaining if frames is None else min(frames, remaining))
+        width = self._width
+        if width == 1:
+            samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        elif width == 3:
+            # 24 bits little-endian: ampliar a int32 con el byte alto como signo
+            packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+            widened = np.zeros((len(packed), 4), dtype=np.uint8)
+            widened[:, 1:] = packed
+            samples = widened.view("<i4").ravel().astype(np.float32) / 2**31
+        else:
+            dtype = "<i2" if width == 2 else "<i4"
+            samples = np.frombuffer(raw, dtype=dtype).astype(np.float32) / 2 ** (8 * width - 1)
+        return samples.reshape(-1, self.channels)
+
+    def close(self):
+        self._wav.close()
+
+
+class _SoundfileStream(PcmStream):
+    """Formatos soportados por libsndfile"""
+
+    def __init__(self, path: Path):
+        self._name = path.name
+        try:
+            self._file = soundfile.SoundFile(str(path))
+        except RuntimeError as e:  # soundfile.LibsndfileError
+            raise UnsupportedAudioError(f"{path.name}: {e}") from e
+        self.sample_rate = self._file.samplerate
+        self.channels = self._file.channels
+        self.frames = self._file.frames
+
+    def seek(self, frame: int):
+        self._file.seek(max(0, min(frame, self.frames)))
+
+    def read(self, frames: Optional[int] = None) -> np.ndarray:
+        try:
+            return self._file.read(-1 if frames is None else frames, dtype="float32", always_2d=True)
+        except RuntimeError as e:
+            raise UnsupportedAudioError(f"{self._name}: {e}") from e
+
+    def close(self):
+        self._file.close()
@@ -1,13 +1,61 @@
 """
 Servicio para gestionar la reproducción de archivos de audio.
 Utiliza QMediaPlayer de PyQt6.QtMultimedia.
+
+Usa dos reproductores: mientras suena una pista, la siguiente de la lista
+se carga en el otro, de modo que el cambio no espera a abrir el archivo
+(sin pausa al terminar) y las dos pueden sonar a la vez durante un
+fundido cruzado (PLAYER_CROSSFADE). Las curvas y los momentos de cada
+transición se calculan en services.crossfade.
 """
 
-from PyQt6.QtCore import QObject, pyqtSignal, QUrl, QStandardPaths
+from PyQt6.QtCore import QObject, pyqtSignal, QUrl, QStandardPaths, QTimer, QElapsedTimer
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimedia import QMediaMetaData
 from PyQt6.QtGui import QPixmap, QImage
 
+from ..utils.config import config
+from .replaygain import normalization_gain
+from .crossfade import CURVES, DEFAULT_CURVE, fade_gains, plan_transition
+from .read_ahead import ReadAheadWarmer
+
+
+class _Deck:
+    """Un reproductor con su salida de audio y la canción que tiene cargada."""
+
+    def __init__(self, player: QMediaPlayer, output: QAudioOutput):
+        self.player = player
+        self.output = output # Necesario desde Qt6 para que suene
+        self.player.setAudioOutput(self.output)
+        self.song_data = None
+        self.track_gain = 1.0  # Normalización de la pista (ReplayGain)
+        self.fade_gain = 1.0   # Posición en el fundido cruzado
+
+    @classmethod
+    def create(cls, parent: QObject) -> "_Deck":
+        """Reproductor de QtMultimedia (fábrica por defecto de AudioService)."""
+        return cls(QMediaPlayer(parent), QAudioOutput(parent))
+
+    def load(self, song_data: dict, track_gain: float):
+        """Cargar una canción sin reproducirla."""
+        self.song_data = song_data
+        self.track_gain = track_gain
+        self.fade_gain = 1.0
+        self.player.setSource(QUrl.fromLocalFile(song_data['file_path']))
+
+    def release(self):
+        """Detener y liberar la fuente."""
+        self.song_data = None
+        self.fade_gain = 1.0
+        self.player.stop()
+        self.player.setSource(QUrl())
+
+    def apply_volume(self, volume: float):
+        # QAudioOutput no amplifica por encima de 1.0: las pistas más bajas
+        # que el objetivo solo se igualan si el volumen deja margen
+        self.output.setVolume(min(1.0, volume * self.track_gain) * self.fade_gain)
+
+
 class AudioService(QObject):
     """
     Servicio de reproducción de audio.
@@ -32,33 +80,97 @@ class AudioService(QObject):
     previous_available = pyqtSignal(bool)
     next_available = pyqtSignal(bool)
 
+    # Lado (px) de la carátula que muestra PlaybackPanel
+    ALBUM_ART_SIZE = 64
+
+    # Intervalo de actualización del volumen durante un fundido (~40 pasos/s)
+    FADE_TICK_MS = 25
 
-    def __init__(self, parent=None):
+
+    def __init__(self, parent=None, album_art_loader=None, deck_factory=None):
+        """
+        Args:
+            parent: QObject padre.
+            album_art_loader: AlbumArtLoader para las carátulas (opcional).
+            deck_factory: Función que recibe el padre y crea cada _Deck
+                (por defecto _Deck.create); permite probar el motor con
+                reproductores simulados.
+        """
         super().__init__(parent)
         
-        self._player = QMediaPlayer(self)
-        self._audio_output = QAudioOutput(self) # Necesario desde Qt6 para que suene
-        self._player.setAudioOutput(self._audio_output)
+        deck_factory = deck_factory or _Deck.create
+        self._decks = (deck_factory(self), deck_factory(self))
+        self._active = 0  # Índice del reproductor que suena (el que ve la UI)
         
         print("[AudioService] Inicializando...")
         self._current_song_data = None
         self._current_album_art = None # Nuevo: para almacenar la carátula actual
+        self._album_art_loader = album_art_loader # AlbumArtLoader (opcional)
         self._playlist = []  # Lista de reproducción actual
         self._current_index = -1  # Índice de la canción actual en la lista
         self._is_intentionally_stopped = True # Para distinguir stop de fin de canción
         
-        # Configuración inicial
-        self._audio_output.setVolume(0.5)  # Volumen inicial al 50%
+        # Volumen = volumen del usuario x ganancia de normalización de la pista
+        # x ganancia del fundido
+        self._normalize = config.player_normalize
+        self._target_loudness = config.player_target_loudness
+        self._volume = 0.5  # Volumen inicial al 50%
+        self._apply_volume()
+        
+        # Transiciones: precarga de la siguiente pista y fundido cruzado
+        self._crossfade_ms = int(max(0.0, config.player_crossfade) * 1000)
+        self._crossfade_curve = config.player_crossfade_curve
+        if self._crossfade_curve not in CURVES:
+            print(f"[AudioService] Curva de fundido desconocida '{self._crossfade_curve}', usando {DEFAULT_CURVE}")
+            self._crossfade_curve = DEFAULT_CURVE
+        self._transition = None  # crossfade.Transition de la pista actual
+        self._preloaded_index = None  # Índice de la lista cargado en el reproductor libre
+        self._fading_deck = None  # Reproductor saliente durante un fundido
+        self._fade_ms = 0
+        self._fade_clock = QElapsedTimer()
+        self._fade_timer = QTimer(self)
+        self._fade_timer.setInterval(self.FADE_TICK_MS)
+        self._fade_timer.timeout.connect(self._update_fade)
+        # Lectura anticipada de la siguiente pista mientras suena la actual
+        self._read_ahead = ReadAheadWarmer(config.player_read_ahead_seconds)
         print("[AudioService] Inicializado correctamente.")
 
-        # Conectar señales internas del QMediaPlayer
-        self._player.mediaStatusChanged.connect(self._handle_media_status_changed)
-        self._player.positionChanged.connect(self._handle_position_changed)
-        self._player.durationChanged.connect(self._handle_duration_changed)
-        self._player.errorOccurred.connect(self._handle_player_error)
-        self._player.playingChanged.connect(self._handle_playing_changed)
-        self._player.metaDataChanged.connect(self._handle_metadata_changed) # Nueva conexión
-
+        # Conectar señales internas de los QMediaPlayer: solo las del
+        # reproductor activo llegan a los manejadores de la UI
+        for deck in self._decks:
+            player = deck.player
+            player.mediaStatusChanged.connect(
+                lambda status, deck=deck: self._route_media_status(deck, status))
+            player.errorOccurred.connect(
+                lambda error, message, deck=deck: self._route_player_error(deck, error, message))
+            player.positionChanged.connect(self._active_only(deck, self._handle_position_changed))
+            player.durationChanged.connect(self._active_only(deck, self._handle_duration_changed))
+            player.playingChanged.connect(self._active_only(deck, self._handle_playing_changed))
+            player.metaDataChanged.connect(self._active_only(deck, self._handle_metadata_changed))
+        if self._album_art_loader is not None:
+            self._album_art_loader.art_ready.connect(self._handle_album_art_ready)
+
+
+    @property
+    def _deck(self) -> _Deck:
+        """Reproductor activo"""
+        return self._decks[self._active]
+
+    @property
+    def _idle_deck(self) -> _Deck:
+        """Reproductor libre (precarga de la siguiente pista)"""
+        return self._decks[1 - self._active]
+
+    @property
+    def _player(self) -> QMediaPlayer:
+        return self._deck.player
+
+    def _active_only(self, deck: _Deck, slot):
+        """Envolver un slot para que ignore las señales de un reproductor inactivo."""
+        def forward(*args):
+            if deck is self._deck:
+                slot(*args)
+        return forward
 
     # --- Métodos de Control ---
 
@@ -85,8 +197,9 @@ class AudioService(QObject):
             return
 
         self._is_intentionally_stopped = False
-        self._current_song_data = song_data
-        self._current_album_art = None # Resetear carátula al cambiar de canción
+        self._finish_fade()
+        self._discard_preload()
+        self._set_current_song(song_data)
         
         if self._player.source() == url: # Misma canción, podría ser un play después de pausa
             if self._player.playbackState() == QMediaPlayer.PlaybackState.PausedState:
@@ -97,12 +210,12 @@ class AudioService(QObject):
                  self._player.play()
         else: # Nueva canción
             self._player.setSource(url)
-            # Los metadatos (y carátula) se cargarán y se manejarán en _handle_metadata_changed
+            # La carátula la extrae AlbumArtLoader en segundo plano (_handle_album_art_ready)
             self._player.play()
         
         # Emitir cambio de canción inmediatamente, estado de reproducción lo emitirá _handle_playing_changed
-        # La carátula se emitirá cuando los metadatos cambien.
-        # Forzamos una emisión inicial con la carátula actual (que será None al principio)
+        # La carátula se emitirá cuando el cargador la tenga lista.
+        # Forzamos una emisión inicial con la carátula actual (None si aún no está en memoria)
         song_data_with_art = self._get_song_data_with_art()
         print(f"[AudioService] play_song: emitiendo current_song_changed con: {song_data_with_art}") # DEBUG
         self.current_song_changed.emit(song_data_with_art)
@@ -110,6 +223,7 @@ class AudioService(QObject):
 
     def pause(self):
         """Pausa la reproducción actual."""
+        self._finish_fade()
         if self._player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
             self._player.pause()
             # self.playback_state_changed.emit(False, self._current_song_data) # Se maneja con playingChanged
@@ -123,6 +237,8 @@ class AudioService(QObject):
     def stop(self):
         """Detiene la reproducción actual."""
         self._is_intentionally_stopped = True
+        self._finish_fade()
+        self._discard_preload()
         self._player.stop()
         # self.playback_state_changed.emit(False, None) # Se maneja con playingChanged y mediaStatusChanged
         # self.current_song_changed.emit(None)          # Se maneja con playingChanged y mediaStatusChanged
@@ -137,7 +253,11 @@ class AudioService(QObject):
             position_permil (int): Posición deseada como permil (0-1000) de la duración total.
         """
         if self._player.duration() > 0:
+            self._finish_fade()
             target_ms = int((position_permil / 1000.0) * self._player.duration())
+            if self._transition is None or target_ms < self._transition.preload_at_ms:
+                # Lejos del final: la precarga se repetirá al volver a preload_at_ms
+                self._discard_preload()
             self._player.setPosition(target_ms)
 
     def set_volume(self, volume_percentage: int):
@@ -148,8 +268,46 @@ class AudioService(QObject):
             volume_percentage (int): Volumen deseado (0-100).
         """
         # QAudioOutput usa una escala de 0.0 a 1.0
-        volume_float = max(0.0, min(1.0, volume_percentage / 100.0))
-        self._audio_output.setVolume(volume_float)
+        self._volume = max(0.0, min(1.0, volume_percentage / 100.0))
+        self._apply_volume()
+
+    def set_normalization(self, enabled: bool):
+        """
+        Activar o desactivar la normalización de volumen por pista.
+
+        Args:
+            enabled (bool): True para igualar la sonoridad entre pistas.
+        """
+        self._normalize = enabled
+        for deck in self._decks:
+            deck.track_gain = self._track_gain(deck.song_data)
+        self._apply_volume()
+
+    def set_crossfade(self, seconds: float, curve: str | None = None):
+        """
+        Configura el fundido cruzado entre pistas consecutivas.
+
+        Args:
+            seconds (float): Duración del fundido (0 = cambio sin pausa, sin fundido).
+            curve (str | None): Curva de crossfade.CURVES (None para mantener la actual).
+        """
+        if curve is not None:
+            if curve not in CURVES:
+                raise ValueError(f"Curva de fundido desconocida: {curve}")
+            self._crossfade_curve = curve
+        self._crossfade_ms = int(max(0.0, seconds) * 1000)
+        self._transition = None  # Replanificar con la nueva duración
+
+    def _track_gain(self, song_data: dict | None) -> float:
+        """Calcula la ganancia de una pista a partir de su sonoridad y pico guardados."""
+        if self._normalize and song_data:
+            return normalization_gain(
+                song_data.get('loudness'), song_data.get('peak'), self._target_loudness)
+        return 1.0
+
+    def _apply_volume(self):
+        for deck in self._decks:
+            deck.apply_volume(self._volume)
 
     # --- Métodos de Información ---
 
@@ -175,8 +333,12 @@ class AudioService(QObject):
     def play_next(self):
         """Reproducir la siguiente canción en la lista."""
         if self.has_next():
-            self._current_index += 1
-            self.play_song(self._playlist[self._current_index])
+            if self._preloaded_index == self._current_index + 1:
+                # Ya cargada en el reproductor libre: cambio inmediato
+                self._advance()
+            else:
+                self._current_index += 1
+                self.play_song(self._playlist[self._current_index])
             self._update_navigation_status()
             
     def set_playlist(self, songs: list[dict], start_index: int = 0):
@@ -189,6 +351,10 @@ class AudioService(QObject):
         """
         self._playlist = songs
         self._current_index = max(0, min(start_index, len(songs) - 1)) if songs else -1
+        # La siguiente pista puede haber cambiado
+        self._discard_preload()
+        self._transition = None
+        self._warm_next()
         self._update_navigation_status()
         
     def has_previous(self) -> bool:
@@ -204,6 +370,150 @@ class AudioService(QObject):
         self.previous_available.emit(self.has_previous())
         self.next_available.emit(self.has_next())
 
+    # --- Transiciones entre pistas ---
+
+    def _set_current_song(self, song_data: dict):
+        """Establecer la canción actual del reproductor activo (sin emitir señales)."""
+        self._current_song_data = song_data
+        self._current_album_art = None # Resetear carátula al cambiar de canción
+        self._deck.song_data = song_data
+        self._deck.track_gain = self._track_gain(song_data)
+        self._apply_volume()
+        self._transition = None
+        self._request_album_art()
+        self._warm_next()
+
+    def _warm_next(self):
+        """Precalentar en segundo plano el archivo de la siguiente pista."""
+        if self.has_next():
+            self._read_ahead.warm(self._playlist[self._current_index + 1])
+
+    @staticmethod
+    def _duration_ms(song_data: dict) -> int | None:
+        """Duración guardada al importar, en ms (None si se desconoce)."""
+        duration = song_data.get('duration') if song_data else None
+        return int(duration * 1000) if duration else None
+
+    def _check_transition(self, position_ms: int):
+        """Precargar la siguiente pista y empezar el fundido cuando corresponda."""
+        if self._fading_deck is not None or self._is_intentionally_stopped or not self.has_next():
+            return
+        if self._transition is None:
+            next_song = self._playlist[self._current_index + 1]
+            self._transition = plan_transition(
+                self._player.duration(), self._duration_ms(next_song), self._crossfade_ms)
+            if self._transition is None:
+                return  # Duración aún desconocida
+        if position_ms >= self._transition.preload_at_ms:
+            self._preload_next()
+        if (self._transition.fade_ms > 0 and position_ms >= self._transition.fade_start_ms
+                and self._preloaded_index == self._current_index + 1):
+            self._advance(self._transition.fade_ms)
+
+    def _preload_next(self):
+        """Cargar la siguiente pista de la lista en el reproductor libre."""
+        index = self._current_index + 1
+        if self._preloaded_index == index:
+            return
+        song_data = self._playlist[index]
+        print(f"[AudioService] Precargando siguiente pista: {song_data.get('file_path')}")
+        self._idle_deck.load(song_data, self._track_gain(song_data))
+        self._preloaded_index = index
+
+    def _discard_preload(self):
+        """Liberar la pista precargada (la lista o la posición han cambiado)."""
+        if self._preloaded_index is not None:
+            self._preloaded_index = None
+            self._idle_deck.release()
+
+    def _advance(self, fade_ms: int = 0):
+        """
+        Pasar a la pista precargada.
+
+        Args:
+            fade_ms (int): Duración del fundido cruzado (0 = cambio inmediato).
+        """
+        self._finish_fade()
+        outgoing = self._deck
+        self._active = 1 - self._active
+        self._current_index = self._preloaded_index
+        self._preloaded_index = None
+        incoming = self._deck
+        if fade_ms > 0:
+            self._fading_deck = outgoing
+            self._fade_ms = fade_ms
+            incoming.fade_gain = 0.0
+            self._fade_clock.start()
+            self._fade_timer.start()
+        else:
+            outgoing.release()
+        
+        # Los datos de la canción deben estar listos antes de play(): playingChanged los emite
+        self._set_current_song(incoming.song_data)
+        incoming.player.play()
+        print(f"[AudioService] Transición a {incoming.song_data.get('file_path')} (fundido {fade_ms} ms)")
+        self.current_song_changed.emit(self._get_song_data_with_art())
+        self._update_navigation_status()
+
+    def _update_fade(self):
+        """Aplicar la curva de fundido según el tiempo transcurrido."""
+        if self._fading_deck is None:
+            self._fade_timer.stop()
+            return
+        progress = self._fade_clock.elapsed() / self._fade_ms
+        self._fading_deck.fade_gain, self._deck.fade_gain = fade_gains(progress, self._crossfade_curve)
+        self._apply_volume()
+        if progress >= 1.0:
+            self._finish_fade()
+
+    def _finish_fade(self):
+        """Terminar un fundido en curso: liberar la pista saliente."""
+        if self._fading_deck is None:
+            return
+        self._fade_timer.stop()
+        deck, self._fading_deck = self._fading_deck, None
+        deck.release()
+        self._deck.fade_gain = 1.0
+        self._apply_volume()
+
+    def _route_media_status(self, deck: _Deck, status: QMediaPlayer.MediaStatus):
+        """Repartir los cambios de estado del medio según el papel de cada reproductor."""
+        if deck is self._deck:
+            self._handle_media_status_changed(status)
+        elif deck is self._fading_deck:
+            if status == QMediaPlayer.MediaStatus.EndOfMedia:
+                self._finish_fade()
+        elif status == QMediaPlayer.MediaStatus.InvalidMedia and self._preloaded_index is not None:
+            # La siguiente pista no se puede abrir: play_next() la intentará y mostrará el error
+            print(f"[AudioService] No se pudo precargar: {deck.song_data.get('file_path') if deck.song_data else '?'}")
+            self._discard_preload()
+
+    def _route_player_error(self, deck: _Deck, error: QMediaPlayer.Error, error_string: str):
+        """Errores: los del reproductor activo llegan a la UI; los demás liberan el reproductor."""
+        if deck is self._deck:
+            self._handle_player_error(error, error_string)
+        elif deck is self._fading_deck:
+            self._finish_fade()
+        elif self._preloaded_index is not None:
+            print(f"[AudioService] Error al precargar: {error_string}")
+            self._discard_preload()
+
+    def _request_album_art(self):
+        """Tomar la carátula de la canción actual de memoria o encargar su carga."""
+        if self._album_art_loader is None or not self._current_song_data:
+            return
+        self._current_album_art = self._album_art_loader.request(
+            self._current_song_data, self.ALBUM_ART_SIZE)
+
+    def _handle_album_art_ready(self, album_key: str, size: int, pixmap: QPixmap):
+        """Mostrar una carátula recién cargada si corresponde a la canción actual."""
+        if size != self.ALBUM_ART_SIZE or not self._current_song_data:
+            return
+        if self._album_art_loader.cache.album_key(self._current_song_data) != album_key:
+            return
+        self._current_album_art = pixmap
+        self.current_song_changed.emit(self._get_song_data_with_art())
+
     def _get_song_data_with_art(self) -> dict | None:
         """Helper para combinar _current_song_data con _current_album_art."""
         if not self._current_song_data:
@@ -256,11 +566,13 @@ class AudioService(QObject):
     def _handle_position_changed(self, position_ms: int):
         """Maneja los cambios en la posición de reproducción."""
         self.song_progress_updated.emit(position_ms, self._player.duration())
+        self._check_transition(position_ms)
 
     def _handle_duration_changed(self, duration_ms: int):
         """Maneja los cambios en la duración del medio (cuando se carga)."""
         # Actualizar el progreso una vez que la duración es conocida
         self.song_progress_updated.emit(self._player.position(), duration_ms)
+        self._transition = None  # Replanificar con la duración real
 
     def _handle_player_error(self, error: QMediaPlayer.Error, error_string: str):
         """Maneja errores del QMediaPlayer."""
@@ -317,8 +629,7 @@ class AudioService(QObject):
     def _handle_metadata_changed(self):
         """Maneja los cambios en los metadatos del medio."""
         print("[AudioService] Metadata changed.")
-        # Temporalmente deshabilitado el procesamiento de carátulas para evitar errores
-        self._current_album_art = None
+        # La carátula no se toma de QMediaMetaData: la gestiona AlbumArtLoader
         
         # Emitir señales con los datos actualizados
         song_data_with_art = self._get_song_data_with_art()
@@ -332,6 +643,8 @@ class AudioService(QObject):
         """Limpiar recursos antes de destruir el objeto."""
         print("[AudioService] Limpiando servicio de audio...")
         self.stop()
-        self._player.setSource(QUrl()) # Liberar la fuente actual
+        for deck in self._decks:
+            deck.release() # Liberar las fuentes
+        self._read_ahead.shutdown()
         # self._player.deleteLater() # QMediaPlayer es hijo de self (QObject), se destruirá con él
         # self._audio_output.deleteLater()
@@ -4,9 +4,11 @@ Servicio base para lógica de negocio
 
 import logging
 from abc import ABC, abstractmethod
+from contextlib import closing
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from database.connection import DatabaseConnection
+from typing import List, Optional, Dict, Any, Iterator
+from ..database.connection import DatabaseConnection
+from ..database.query_shape import QueryShape
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +36,29 @@ class BaseService(ABC):
         """
         pass
     
+    @classmethod
+    def query_shapes(cls, table_name: str) -> List[QueryShape]:
+        """
+        Formas de consulta que ejecuta el servicio sobre una tabla
+        
+        Args:
+            table_name: Nombre de la tabla
+            
+        Returns:
+            List[QueryShape]: Consultas con parámetros de ejemplo
+        """
+        return [
+            # get_all/iter_all devuelven la tabla completa en orden de rowid
+            QueryShape(f"{table_name}.base.get_all",
+                       f"SELECT * FROM {table_name} ORDER BY id", full_scan_ok=True),
+            QueryShape(f"{table_name}.base.get_by_id",
+                       f"SELECT * FROM {table_name} WHERE id = ?", (1,)),
+            QueryShape(f"{table_name}.base.update",
+                       f"UPDATE {table_name} SET updated_at = ? WHERE id = ?", ("", 1)),
+            QueryShape(f"{table_name}.base.delete",
+                       f"DELETE FROM {table_name} WHERE id = ?", (1,)),
+        ]
+    
     def get_all(self) -> List[Dict[str, Any]]:
         """
         Obtener todos los registros
@@ -50,6 +75,30 @@ class BaseService(ABC):
             self.logger.error(f"Error getting all records from {self.table_name}: {e}")
             raise
     
+    def iter_all(self, chunk_size: int = DatabaseConnection.DEFAULT_FETCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Recorrer todos los registros sin cargarlos en memoria
+        
+        A diferencia de get_all, las filas se leen por bloques y se convierten
+        a diccionario una a una, así que es apto para tablas completas.
+        Si se deja a medias hay que cerrar el generador (close() o
+        contextlib.closing) para liberar la conexión.
+        
+        Args:
+            chunk_size: Filas leídas por cada fetchmany
+            
+        Yields:
+            Dict[str, Any]: Registros ordenados por id
+        """
+        try:
+            query = f"SELECT * FROM {self.table_name} ORDER BY id"
+            with closing(self.db.iter_query(query, chunk_size=chunk_size)) as rows:
+                for row in rows:
+                    yield dict(row)
+        except Exception as e:
+            self.logger.error(f"Error iterating records from {self.table_name}: {e}")
+            raise
+    
     def get_by_id(self, record_id: int) -> Optional[Dict[str, Any]]:
         """
         Obtener registro por ID
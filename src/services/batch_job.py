@@ -0,0 +1,142 @@
+"""
+Trabajos por lotes sobre la biblioteca en un pool de procesos
+
+Los análisis de audio (tempo, forma de onda, sonoridad) son CPU intensivos
+y en Python puro no escalan con hilos. BatchJob reparte los archivos entre
+procesos, escribe los resultados por lotes desde el proceso principal (la
+base de datos solo se toca desde aquí) y admite progreso y cancelación.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from ..utils.instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class BatchResult(NamedTuple):
+    """Resumen de una ejecución"""
+    processed: int
+    updated: int
+    failed: int
+    cancelled: bool = False
+
+
+def _run_worker(worker: Callable, song_id: int, file_path: str, *args) -> Tuple[int, object, Optional[str]]:
+    """Ejecutar el análisis de un archivo sin propagar excepciones al pool"""
+    try:
+        return song_id, worker(file_path, *args), None
+    except Exception as e:
+        return song_id, None, f"{type(e).__name__}: {e}"
+
+
+class BatchJob:
+    """
+    Trabajo por lotes sobre canciones
+
+    Las subclases definen:
+        name: Nombre para instrumentación y logs
+        worker: Función de módulo (serializable) que recibe la ruta de un
+            archivo (y los argumentos extra de pending) y devuelve el
+            resultado, o None si no hay resultado
+        pending(): Canciones a procesar como (id, ruta, *argumentos extra)
+        store(results): Guardar [(id, resultado)] y devolver cuántas se actualizaron
+    """
+
+    name = "batch"
+    worker: Callable = None
+
+    # Resultados acumulados antes de cada escritura (una transacción)
+    STORE_BATCH_SIZE = 64
+
+    # Tareas en vuelo por proceso: mantiene los procesos ocupados sin
+    # encolar toda la biblioteca de una vez
+    IN_FLIGHT_PER_WORKER = 4
+
+    def __init__(self, repository, max_workers: Optional[int] = None):
+        """
+        Inicializar trabajo
+
+        Args:
+            repository: SongRepository donde leer y escribir
+            max_workers: Procesos del pool (por defecto, uno por CPU)
+        """
+        self.repository = repository
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+
+    def pending(self) -> List[Tuple]:
+        """Canciones a procesar como (id, ruta, *argumentos extra del worker)"""
+        raise NotImplementedError
+
+    def store(self, results: List[Tuple[int, object]]) -> int:
+        """Guardar resultados; devuelve el número de canciones actualizadas"""
+        raise NotImplementedError
+
+    def run(self, progress: Optional[Callable[[int, int], None]] = None,
+            cancel: Optional[threading.Event] = None) -> BatchResult:
+        """
+        Procesar todas las canciones pendientes
+
+        Bloquea hasta terminar: desde la interfaz, llamar con run_in_background.
+
+        Args:
+            progress: Callback(procesadas, total), llamado desde este hilo
+            cancel: Evento que detiene el trabajo; los resultados ya
+                obtenidos se guardan
+
+        Returns:
+            BatchResult: Procesadas, actualizadas y fallidas
+        """
+        items = self.pending()
+        total = len(items)
+        processed = updated = failed = 0
+        buffer = []
+        if not items:
+            return BatchResult(0, 0, 0)
+
+        with instrumentation.span(f"batch.{self.name}"):
+            # spawn: el proceso principal tiene hilos (Qt, pools) y fork no es seguro
+            context = multiprocessing.get_context("spawn")
+            max_in_flight = self.max_workers * self.IN_FLIGHT_PER_WORKER
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as executor:
+                queue = iter(items)
+                in_flight = set()
+                while True:
+                    while len(in_flight) < max_in_flight and not (cancel and cancel.is_set()):
+                        item = next(queue, None)
+                        if item is None:
+                            break
+                        in_flight.add(executor.submit(_run_worker, self.worker, *item))
+                    if not in_flight:
+                        break
+
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        song_id, result, error = future.result()
+                        processed += 1
+                        if error is not None:
+                            failed += 1
+                            logger.warning(f"{self.name}: song {song_id} failed: {error}")
+                        elif result is not None:
+                            buffer.append((song_id, result))
+
+                    if len(buffer) >= self.STORE_BATCH_SIZE:
+                        updated += self.store(buffer)
+                        buffer = []
+                    if progress is not None:
+                        progress(processed, total)
+
+            if buffer:
+                updated += self.store(buffer)
+
+        cancelled = bool(cancel and cancel.is_set()) and processed < total
+        instrumentation.incr(f"batch.{self.name}.processed", processed)
+        instrumentation.incr(f"batch.{self.name}.updated", updated)
+        instrumentation.incr(f"batch.{self.name}.failed", failed)
+        logger.info(f"{self.name}: {processed}/{total} processed, {updated} updated, "
+                    f"{failed} failed{' (cancelled)' if cancelled else ''}")
+        return BatchResult(processed, updated, failed, cancelled)
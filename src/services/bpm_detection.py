@@ -0,0 +1,181 @@
+"""
+Detección de tempo (BPM) sobre PCM decodificado
+
+estimate_bpm() calcula una envolvente de ataques (flujo espectral de la
+magnitud logarítmica de una STFT) y busca su periodo dominante con una
+autocorrelación por FFT, ponderada por una distribución a priori de tempo
+centrada en 120 BPM para elegir la octava. Todo está vectorizado con NumPy.
+
+BpmDetectionJob aplica la detección a las canciones sin BPM en un pool de
+procesos y guarda los resultados con SongRepository.update_bpm.
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .audio_decoding import decode_pcm, supported_extensions
+from .batch_job import BatchJob
+
+logger = logging.getLogger(__name__)
+
+# Frecuencia de análisis: el tempo no necesita más de ~11 kHz
+ANALYSIS_RATE = 11025
+FRAME_SIZE = 1024
+HOP_SIZE = 128  # ~86 envolventes/s: 1 retardo ≈ 3 BPM a 120 BPM antes de interpolar
+
+# Fragmento analizado: se salta la introducción si la pista es larga
+ANALYSIS_OFFSET = 30.0
+ANALYSIS_DURATION = 60.0
+MIN_ANALYSIS_SECONDS = 6.0
+
+# Rango de tempo y distribución a priori (log-normal en octavas)
+MIN_BPM = 60.0
+MAX_BPM = 200.0
+PRIOR_CENTER_BPM = 120.0
+PRIOR_OCTAVES = 1.0
+
+# Rango dinámico del espectro (dB bajo el máximo del fragmento). Por debajo,
+# el lóbulo lateral de un tono estable oscila con la fase de cada trama y el
+# logaritmo convierte esa oscilación en un "pulso" periódico falso.
+SPECTRUM_RANGE_DB = 80.0
+
+# Flujo espectral medio mínimo, relativo a la magnitud logarítmica media de
+# una trama: un tono sostenido sin ataques queda muy por debajo
+MIN_ONSET_STRENGTH = 0.005
+
+# Autocorrelación normalizada mínima para aceptar un tempo, y prominencia
+# mínima del máximo (desviaciones típicas sobre la mediana del rango de tempo)
+MIN_CONFIDENCE = 0.1
+MIN_PROMINENCE = 3.0
+
+
+def onset_envelope(samples: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, float]:
+    """
+    Envolvente de ataques por flujo espectral
+
+    Args:
+        samples: Muestras mono float32
+        sample_rate: Frecuencia de muestreo
+
+    Returns:
+        Tuple[np.ndarray, float]: (envolvente, envolventes por segundo); la
+            envolvente está vacía si no hay ataques (p. ej. un tono sostenido)
+    """
+    # Diezmado con media por bloques (filtro antialias sencillo)
+    factor = max(1, sample_rate // ANALYSIS_RATE)
+    usable = len(samples) - len(samples) % factor
+    signal = samples[:usable].reshape(-1, factor).mean(axis=1)
+    rate = sample_rate / factor
+    if len(signal) < FRAME_SIZE * 2:
+        return np.zeros(0, dtype=np.float32), rate / HOP_SIZE
+
+    frames = sliding_window_view(signal, FRAME_SIZE)[::HOP_SIZE]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(FRAME_SIZE).astype(np.float32), axis=1))
+    spectrum = np.maximum(spectrum, spectrum.max() * 10 ** (-SPECTRUM_RANGE_DB / 20))
+    log_spectrum = np.log1p(1000.0 * spectrum)
+    flux = np.maximum(np.diff(log_spectrum, axis=0), 0.0).sum(axis=1)
+    frame_rate = rate / HOP_SIZE
+    # La autocorrelación normalizada no depende de la escala: un flujo
+    # residual mínimo parecería tan periódico como una batería
+    if flux.mean() < MIN_ONSET_STRENGTH * log_spectrum.sum(axis=1).mean():
+        return np.zeros(0, dtype=np.float32), frame_rate
+
+    # Restar la media local (~0.5 s) y rectificar: quedan solo los picos
+    width = max(1, int(frame_rate * 0.5))
+    local_mean = np.convolve(flux, np.ones(width) / width, mode="same")
+    return np.maximum(flux - local_mean, 0.0), frame_rate
+
+
+def estimate_bpm(samples: np.ndarray, sample_rate: int,
+                 min_bpm: float = MIN_BPM, max_bpm: float = MAX_BPM) -> Optional[float]:
+    """
+    Estimar el tempo de un fragmento de audio
+
+    Args:
+        samples: Muestras mono float32
+        sample_rate: Frecuencia de muestreo
+        min_bpm: Tempo mínimo
+        max_bpm: Tempo máximo
+
+    Returns:
+        Optional[float]: BPM con un decimal, o None si no hay un pulso claro
+    """
+    envelope, frame_rate = onset_envelope(samples, sample_rate)
+    min_lag = int(np.floor(60.0 * frame_rate / max_bpm))
+    max_lag = int(np.ceil(60.0 * frame_rate / min_bpm))
+    if len(envelope) < 2 * max_lag + 2:
+        return None
+
+    envelope = envelope - envelope.mean()
+    size = 1 << int(np.ceil(np.log2(2 * len(envelope))))
+    spectrum = np.fft.rfft(envelope, size)
+    autocorrelation = np.fft.irfft(spectrum * np.conj(spectrum), size)[:len(envelope)]
+    if autocorrelation[0] <= 0:
+        return None  # Silencio o señal sin variación
+    # Normalizar por el número de términos de cada retardo y por la energía
+    autocorrelation = autocorrelation / (len(envelope) - np.arange(len(envelope)))
+    autocorrelation /= autocorrelation[0]
+
+    lags = np.arange(min_lag, max_lag + 1)
+    # Sumar el segundo múltiplo del periodo reduce los errores de octava
+    double = np.minimum(2 * lags, len(autocorrelation) - 1)
+    score = autocorrelation[lags] + 0.5 * autocorrelation[double]
+    bpms = 60.0 * frame_rate / lags
+    prior = np.exp(-0.5 * (np.log2(bpms / PRIOR_CENTER_BPM) / PRIOR_OCTAVES) ** 2)
+    best = int(np.argmax(score * prior))
+    lag = lags[best]
+    # El máximo debe destacar sobre el resto del rango (descarta periodicidades
+    # débiles y repartidas que no son un pulso)
+    window = autocorrelation[lags]
+    prominence = (autocorrelation[lag] - np.median(window)) / (window.std() + 1e-12)
+    if autocorrelation[lag] < MIN_CONFIDENCE or prominence < MIN_PROMINENCE:
+        return None
+
+    # Interpolación parabólica del máximo para afinar por debajo de un retardo
+    if min_lag < lag < len(autocorrelation) - 1:
+        left, center, right = autocorrelation[lag - 1:lag + 2]
+        denominator = left - 2 * center + right
+        if denominator < 0:
+            lag = lag + 0.5 * (left - right) / denominator
+    return round(float(60.0 * frame_rate / lag), 1)
+
+
+def detect_bpm(file_path) -> Optional[float]:
+    """
+    Detectar el tempo de un archivo (función de trabajo del pool de procesos)
+
+    Args:
+        file_path: Ruta del archivo
+
+    Returns:
+        Optional[float]: BPM o None si no se detecta un pulso claro
+
+    Raises:
+        UnsupportedAudioError: Si el formato no se puede decodificar
+    """
+    samples, sample_rate = decode_pcm(file_path, ANALYSIS_OFFSET, ANALYSIS_DURATION)
+    if len(samples) < MIN_ANALYSIS_SECONDS * sample_rate:
+        # Pista corta: analizar desde el principio
+        samples, sample_rate = decode_pcm(file_path, 0.0, ANALYSIS_DURATION)
+    return estimate_bpm(samples, sample_rate)
+
+
+class BpmDetectionJob(BatchJob):
+    """Detectar y guardar el BPM de las canciones que no lo tienen"""
+
+    name = "bpm"
+    worker = staticmethod(detect_bpm)
+
+    def pending(self) -> List[Tuple[int, str]]:
+        """Canciones sin BPM cuyo formato se puede decodificar"""
+        extensions = supported_extensions()
+        return [(song_id, file_path) for song_id, file_path in self.repository.get_songs_without_bpm()
+                if Path(file_path).suffix.lower() in extensions]
+
+    def store(self, results: List[Tuple[int, float]]) -> int:
+        """Guardar los BPM redondeados (la columna es entera)"""
+        return self.repository.update_bpm((song_id, int(round(bpm))) for song_id, bpm in results)
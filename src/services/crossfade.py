@@ -0,0 +1,81 @@
+"""
+Curvas y planificación de transiciones entre pistas
+
+Lógica pura (sin Qt) del motor de dos reproductores de AudioService:
+fade_gains() da la ganancia de la pista saliente y la entrante en cada
+punto del fundido y plan_transition() decide cuándo precargar la
+siguiente pista y cuándo empezar el fundido.
+"""
+
+import math
+from typing import NamedTuple, Optional, Tuple
+
+CURVE_LINEAR = "linear"
+CURVE_EQUAL_POWER = "equal_power"
+CURVE_S_CURVE = "s_curve"
+CURVES = (CURVE_LINEAR, CURVE_EQUAL_POWER, CURVE_S_CURVE)
+DEFAULT_CURVE = CURVE_EQUAL_POWER
+
+# Antelación con la que se carga la siguiente pista antes de la transición
+PRELOAD_LEAD_MS = 10000
+
+# El fundido no ocupa más de esta fracción de ninguna de las dos pistas
+MAX_FADE_FRACTION = 0.25
+
+
+class Transition(NamedTuple):
+    """Momentos (ms de la pista actual) de una transición"""
+    preload_at_ms: int
+    fade_start_ms: int
+    fade_ms: int
+
+
+def fade_gains(progress: float, curve: str = DEFAULT_CURVE) -> Tuple[float, float]:
+    """
+    Ganancias de un fundido cruzado
+
+    Args:
+        progress: Avance del fundido entre 0 (inicio) y 1 (fin)
+        curve: CURVE_LINEAR (amplitud constante, baja ~3 dB a mitad con
+            material no correlacionado), CURVE_EQUAL_POWER (potencia
+            constante) o CURVE_S_CURVE (suave en los extremos)
+
+    Returns:
+        Tuple[float, float]: (ganancia saliente, ganancia entrante) en [0, 1]
+
+    Raises:
+        ValueError: Si la curva no existe
+    """
+    progress = min(1.0, max(0.0, progress))
+    if curve == CURVE_LINEAR:
+        incoming = progress
+        return 1.0 - incoming, incoming
+    if curve == CURVE_EQUAL_POWER:
+        angle = progress * math.pi / 2
+        return math.cos(angle), math.sin(angle)
+    if curve == CURVE_S_CURVE:
+        incoming = progress * progress * (3.0 - 2.0 * progress)
+        return 1.0 - incoming, incoming
+    raise ValueError(f"Curva de fundido desconocida: {curve}")
+
+
+def plan_transition(current_ms: int, next_ms: Optional[int], crossfade_ms: int) -> Optional[Transition]:
+    """
+    Planificar la transición de la pista actual a la siguiente
+
+    Args:
+        current_ms: Duración de la pista actual (0 o negativa si se desconoce)
+        next_ms: Duración de la siguiente, si se conoce
+        crossfade_ms: Duración configurada del fundido (0 = sin fundido)
+
+    Returns:
+        Optional[Transition]: Momentos de precarga y fundido, o None si la
+            duración actual no se conoce todavía
+    """
+    if current_ms <= 0:
+        return None
+    fade_ms = max(0, crossfade_ms)
+    limit = current_ms if not next_ms or next_ms <= 0 else min(current_ms, next_ms)
+    fade_ms = min(fade_ms, int(limit * MAX_FADE_FRACTION))
+    fade_start_ms = current_ms - fade_ms
+    return Transition(max(0, fade_start_ms - PRELOAD_LEAD_MS), fade_start_ms, fade_ms)
@@ -0,0 +1,284 @@
+"""
+Medida de sonoridad integrada (ITU-R BS.1770-4 / EBU R128)
+
+integrated_loudness() aplica la ponderación K, calcula la energía de bloques
+de 400 ms solapados un 75 % y promedia los que superan la puerta absoluta
+(-70 LUFS) y la relativa (-10 LU). Todo está vectorizado con NumPy: los dos
+filtros bicuadráticos de la ponderación se aplican en el dominio de la
+frecuencia por tramos solapados, sin un bucle por muestra.
+
+LoudnessMeter hace la misma medida sobre bloques sucesivos (los mismos
+tramos de filtrado) y solo conserva la energía de cada paso de 100 ms, de
+modo que measure_loudness() recorre el archivo sin cargarlo entero.
+
+LoudnessJob mide las canciones sin sonoridad (las que no traían etiquetas
+ReplayGain) y guarda sonoridad y pico con SongRepository.update_loudness.
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .audio_decoding import open_pcm, supported_extensions
+from .batch_job import BatchJob
+
+logger = logging.getLogger(__name__)
+
+# Bloques de la medida (BS.1770): 400 ms cada 100 ms
+BLOCK_SECONDS = 0.4
+STEP_SECONDS = 0.1
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+
+# Filtrado por FFT: tramos de FFT_SIZE con FILTER_LEAD muestras de margen a
+# cada lado para que el estado inicial y la cola circular del filtro (que se
+# extinguen en unos cientos de muestras) no afecten al resultado
+FFT_SIZE = 1 << 17
+FILTER_LEAD = 1 << 13
+
+# Parámetros analógicos de la ponderación K, de los que salen los
+# coeficientes de BS.1770 a 48 kHz y sus equivalentes a otras frecuencias
+SHELF_FREQUENCY = 1681.974450955533
+SHELF_GAIN_DB = 3.999843853973347
+SHELF_Q = 0.7071752369554196
+HIGHPASS_FREQUENCY = 38.13547087602444
+HIGHPASS_Q = 0.5003270373238773
+
+
+def k_weighting(sample_rate: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Coeficientes (b, a) de los dos filtros de la ponderación K
+
+    Args:
+        sample_rate: Frecuencia de muestreo
+
+    Returns:
+        List[Tuple[np.ndarray, np.ndarray]]: Estante de agudos y paso alto
+    """
+    k = np.tan(np.pi * SHELF_FREQUENCY / sample_rate)
+    vh = 10 ** (SHELF_GAIN_DB / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / SHELF_Q + k * k
+    shelf = (np.array([vh + vb * k / SHELF_Q + k * k, 2 * (k * k - vh), vh - vb * k / SHELF_Q + k * k]) / a0,
+             np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / SHELF_Q + k * k) / a0]))
+
+    k = np.tan(np.pi * HIGHPASS_FREQUENCY / sample_rate)
+    a0 = 1 + k / HIGHPASS_Q + k * k
+    highpass = (np.array([1.0, -2.0, 1.0]),
+                np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / HIGHPASS_Q + k * k) / a0]))
+    return [shelf, highpass]
+
+
+def _frequency_response(filters, size: int) -> np.ndarray:
+    """Respuesta en frecuencia de una cascada de bicuadráticos en rfft(size)"""
+    z = np.exp(-2j * np.pi * np.arange(size // 2 + 1) / size)  # z^-1
+    response = np.ones(size // 2 + 1, dtype=np.complex128)
+    for b, a in filters:
+        response *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+    return response
+
+
+def k_weighted(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    Aplicar la ponderación K
+
+    Args:
+        samples: Array (frames, canales)
+        sample_rate: Frecuencia de muestreo
+
+    Returns:
+        np.ndarray: Muestras filtradas, misma forma, float32
+    """
+    response = _frequency_response(k_weighting(sample_rate), FFT_SIZE)[:, None]
+    chunk = FFT_SIZE - 2 * FILTER_LEAD
+    output = np.empty(samples.shape, dtype=np.float32)
+    for start in range(0, len(samples), chunk):
+        lead = min(start, FILTER_LEAD)
+        segment = samples[start - lead:start + chunk]
+        spectrum = np.fft.rfft(segment, FFT_SIZE, axis=0)
+        filtered = np.fft.irfft(spectrum * response, FFT_SIZE, axis=0)
+        output[start:start + chunk] = filtered[lead:len(segment)]
+    return output
+
+
+def integrated_loudness(samples: np.ndarray, sample_rate: int) -> Optional[float]:
+    """
+    Sonoridad integrada con puertas absoluta y relativa
+
+    Todos los canales pesan 1.0 (estéreo y mono; en multicanal no se
+    distinguen los envolventes ni se excluye el LFE).
+
+    Args:
+        samples: Array (frames, canales) o mono
+        sample_rate: Frecuencia de muestreo
+
+    Returns:
+        Optional[float]: Sonoridad en LUFS, o None si es más corta que un
+            bloque o no supera la puerta absoluta (silencio)
+    """
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    step = int(round(STEP_SECONDS * sample_rate))
+    steps_per_block = int(round(BLOCK_SECONDS / STEP_SECONDS))
+    steps = len(samples) // step
+    if steps < steps_per_block:
+        return None
+
+    weighted = k_weighted(samples[:steps * step], sample_rate)
+    return gated_loudness(_step_energy(weighted, step), step)
+
+
+def _step_energy(weighted: np.ndarray, step: int) -> np.ndarray:
+    """Energía de cada tramo de 100 ms sumada en canales (frames múltiplo de step)"""
+    return np.square(weighted, dtype=np.float64).reshape(len(weighted) // step, step, -1).sum(axis=(1, 2))
+
+
+def gated_loudness(step_energy: np.ndarray, step: int) -> Optional[float]:
+    """
+    Sonoridad integrada a partir de la energía de los tramos de 100 ms
+
+    Args:
+        step_energy: Energía ponderada de cada tramo, sumada en canales
+        step: Frames por tramo
+
+    Returns:
+        Optional[float]: Sonoridad en LUFS, o None si no hay un bloque
+            completo o ninguno supera la puerta absoluta
+    """
+    steps_per_block = int(round(BLOCK_SECONDS / STEP_SECONDS))
+    if len(step_energy) < steps_per_block:
+        return None
+    # Cada bloque de 400 ms suma 4 tramos
+    cumulative = np.concatenate(([0.0], np.cumsum(step_energy)))
+    blocks = (cumulative[steps_per_block:] - cumulative[:-steps_per_block]) / (steps_per_block * step)
+
+    with np.errstate(divide="ignore"):
+        block_loudness = -0.691 + 10 * np.log10(blocks)
+    gated = blocks[block_loudness > ABSOLUTE_GATE]
+    if len(gated) == 0:
+        return None
+    threshold = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE
+    gated = gated[-0.691 + 10 * np.log10(gated) > threshold]
+    return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+class LoudnessMeter:
+    """
+    Medida de sonoridad y pico sobre bloques sucesivos
+
+    La memoria no depende de la duración: solo se retienen el tramo de
+    filtrado en curso y la energía de cada paso de 100 ms.
+    """
+
+    def __init__(self, sample_rate: int, channels: int):
+        """
+        Args:
+            sample_rate: Frecuencia de muestreo
+            channels: Número de canales de los bloques
+        """
+        self.sample_rate = sample_rate
+        self.peak = 0.0
+        self._response = _frequency_response(k_weighting(sample_rate), FFT_SIZE)[:, None]
+        self._chunk = FFT_SIZE - 2 * FILTER_LEAD
+        self._step = int(round(STEP_SECONDS * sample_rate))
+        # Entrada sin filtrar, precedida de hasta FILTER_LEAD frames ya filtrados como contexto
+        self._pending = np.zeros((0, channels), dtype=np.float32)
+        self._lead = 0
+        # Salida filtrada que aún no completa un paso
+        self._rest = np.zeros((0, channels), dtype=np.float32)
+        self._energy: List[np.ndarray] = []
+
+    def add(self, samples: np.ndarray):
+        """
+        Añadir un bloque
+
+        Args:
+            samples: Array (frames, canales) o mono
+        """
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        if not len(samples):
+            return
+        self.peak = max(self.peak, float(np.abs(samples).max()))
+        self._pending = np.concatenate([self._pending, samples])
+        while len(self._pending) - self._lead >= self._chunk:
+            self._filter(self._chunk)
+
+    def loudness(self) -> Optional[float]:
+        """
+        Sonoridad integrada de todo lo añadido
+
+        Returns:
+            Optional[float]: LUFS (ver integrated_loudness)
+        """
+        if len(self._pending) > self._lead:
+            self._filter(len(self._pending) - self._lead)
+        energy = np.concatenate(self._energy) if self._energy else np.zeros(0)
+        return gated_loudness(energy, self._step)
+
+    def measurement(self) -> Optional[Tuple[float, float]]:
+        """
+        Resultado redondeado para guardar
+
+        Returns:
+            Optional[Tuple[float, float]]: (LUFS, pico de muestra lineal), o
+                None si lo añadido es silencio
+        """
+        loudness = self.loudness()
+        if loudness is None:
+            return None
+        return round(loudness, 2), round(self.peak, 4)
+
+    def _filter(self, frames: int):
+        """Filtrar los siguientes frames (mismos tramos que k_weighted)"""
+        segment = self._pending[:self._lead + frames]
+        spectrum = np.fft.rfft(segment, FFT_SIZE, axis=0)
+        filtered = np.fft.irfft(spectrum * self._response, FFT_SIZE, axis=0)
+        weighted = np.concatenate([self._rest, filtered[self._lead:len(segment)].astype(np.float32)])
+        steps = len(weighted) // self._step
+        self._energy.append(_step_energy(weighted[:steps * self._step], self._step))
+        self._rest = weighted[steps * self._step:]
+
+        keep = min(FILTER_LEAD, len(segment))
+        self._pending = self._pending[len(segment) - keep:]
+        self._lead = keep
+
+
+def measure_loudness(file_path) -> Optional[Tuple[float, float]]:
+    """
+    Medir sonoridad y pico de un archivo (función de trabajo del pool de procesos)
+
+    Args:
+        file_path: Ruta del archivo
+
+    Returns:
+        Optional[Tuple[float, float]]: (LUFS, pico de muestra lineal), o
+            None si la pista es silencio
+
+    Raises:
+        UnsupportedAudioError: Si el formato no se puede decodificar
+    """
+    with open_pcm(file_path) as stream:
+        meter = LoudnessMeter(stream.sample_rate, stream.channels)
+        for block in stream.blocks():
+            meter.add(block)
+    return meter.measurement()
+
+
+class LoudnessJob(BatchJob):
+    """Medir y guardar la sonoridad de las canciones que no la tienen"""
+
+    name = "loudness"
+    worker = staticmethod(measure_loudness)
+
+    def pending(self) -> List[Tuple[int, str]]:
+        """Canciones sin sonoridad cuyo formato se puede decodificar"""
+        extensions = supported_extensions()
+        return [(song_id, file_path) for song_id, file_path in self.repository.get_songs_without_loudness()
+                if Path(file_path).suffix.lower() in extensions]
+
+    def store(self, results: List[Tuple[int, Tuple[float, float]]]) -> int:
+        return self.repository.update_loudness(
+            (song_id, loudness, peak) for song_id, (loudness, peak) in results)
@@ -1,5 +1,6 @@
 """Utility class to extract audio metadata using mutagen."""
 
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -7,6 +8,42 @@ from mutagen import File as MutagenFile
 from mutagen.easyid3 import EasyID3
 
 from ..models.song import Song
+from .replaygain import read_replaygain
+
+
+# Codec names for mutagen file types whose stream info has no ``codec``.
+CODEC_NAMES = {
+    "MP3": "mp3",
+    "EasyMP3": "mp3",
+    "FLAC": "flac",
+    "OggVorbis": "vorbis",
+    "OggOpus": "opus",
+    "OggFLAC": "flac",
+    "WAVE": "pcm",
+    "AIFF": "pcm",
+    "ASF": "wma",
+}
+
+
+def audio_properties(audio, file_path: Path) -> dict:
+    """Return the :class:`Song` audio fields read from ``audio.info`` and the file size."""
+    info = getattr(audio, "info", None)
+    length = getattr(info, "length", None)
+    codec = getattr(info, "codec", None) or CODEC_NAMES.get(
+        type(audio).__name__, type(audio).__name__.lower()
+    )
+    try:
+        file_size = os.path.getsize(file_path)
+    except OSError:
+        file_size = None
+    return {
+        "duration": round(length, 3) if length else None,
+        "bitrate": getattr(info, "bitrate", None) or None,
+        "sample_rate": getattr(info, "sample_rate", None) or None,
+        "channels": getattr(info, "channels", None) or None,
+        "codec": codec,
+        "file_size": file_size,
+    }
 
 
 class MetadataExtractor:
@@ -50,6 +87,7 @@ class MetadataExtractor:
                     genre = "Sin género"
                     bpm = None
 
+            loudness, peak = read_replaygain(audio.tags)
             return Song(
                 id=None,
                 title=title,
@@ -58,6 +96,9 @@ class MetadataExtractor:
                 genre=genre,
                 bpm=bpm,
                 file_path=file_path,
+                **audio_properties(audio, file_path),
+                loudness=loudness,
+                peak=peak,
             )
         except Exception:
             return None
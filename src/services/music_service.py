@@ -4,11 +4,12 @@ Servicio para gestión de archivos de música
 
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from ..models.song import Song, SongRepository
 from ..database.connection import DatabaseConnection
 from ..utils.file_scanner import FileScanner
+from ..utils.instrumentation import instrumentation, timed
 from .metadata_extractor import MetadataExtractor
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class MusicService:
         self.scanner = FileScanner()
         self.metadata_extractor = MetadataExtractor()
         
+    @timed("import.folder")
     def import_folder(self, folder_path: str) -> tuple[int, int]:
         """
         Importar archivos de música desde una carpeta
@@ -41,14 +43,16 @@ class MusicService:
         failed = 0
 
         try:
-            files = self.scanner.scan(folder_path)
+            with instrumentation.span("import.scan"):
+                files = self.scanner.scan(folder_path)
         except FileNotFoundError:
             raise
 
         for file_path in files:
             try:
                 if not self.songs.exists(file_path):
-                    song = self.metadata_extractor.extract(file_path)
+                    with instrumentation.span("import.extract"):
+                        song = self.metadata_extractor.extract(file_path)
                     if song:
                         self.songs.add(song)
                         imported += 1
@@ -60,8 +64,11 @@ class MusicService:
                 failed += 1
                 logger.error(f"Error importando {file_path.name}: {e}")
         
+        instrumentation.incr("import.files_imported", imported)
+        instrumentation.incr("import.files_failed", failed)
         return imported, failed
     
+    @timed("import.files")
     def import_files(self, file_paths: List[str]) -> tuple[int, int]:
         """
         Importar archivos de música específicos
@@ -89,7 +96,8 @@ class MusicService:
 
             try:
                 if not self.songs.exists(path):
-                    song = self.metadata_extractor.extract(path)
+                    with instrumentation.span("import.extract"):
+                        song = self.metadata_extractor.extract(path)
                     if song:
                         self.songs.add(song)
                         imported += 1
@@ -101,6 +109,8 @@ class MusicService:
                 failed += 1
                 logger.error(f"Error importando {path.name}: {e}")
         
+        instrumentation.incr("import.files_imported", imported)
+        instrumentation.incr("import.files_failed", failed)
         return imported, failed
     
     
@@ -109,7 +119,9 @@ class MusicService:
                     artist: str = "", 
                     genre: str = "",
                     page: int = 1,
-                    per_page: int = 50) -> tuple[List[Song], int]:
+                    per_page: int = 50,
+                    sort_by: str = SongRepository.DEFAULT_SORT,
+                    descending: bool = False) -> tuple[List[Song], int]:
         """
         Buscar canciones con filtros
         
@@ -119,25 +131,33 @@ class MusicService:
             genre: Filtro por género
             page: Número de página actual
             per_page: Canciones por página
+            sort_by: Clave de ordenación (ver SongRepository.SORT_COLUMNS)
+            descending: True para orden descendente
             
         Returns:
             tuple[List[Song], int]: Lista de canciones que coinciden con el filtro y el número total de canciones que coinciden.
         """
-        songs, total_items_matching_filter = self.songs.search(title, artist, genre, page, per_page)
+        songs, total_items_matching_filter = self.songs.search(
+            title, artist, genre, page, per_page, sort_by, descending
+        )
         return songs, total_items_matching_filter
     
-    def get_songs(self, page: int = 1, per_page: int = 50) -> tuple[List[Song], int]:
+    def get_songs(self, page: int = 1, per_page: int = 50,
+                  sort_by: str = SongRepository.DEFAULT_SORT,
+                  descending: bool = False) -> tuple[List[Song], int]:
         """
         Obtener lista paginada de canciones
         
         Args:
             page: Número de página actual
             per_page: Canciones por página
+            sort_by: Clave de ordenación (ver SongRepository.SORT_COLUMNS)
+            descending: True para orden descendente
             
         Returns:
             tuple[List[Song], int]: Lista de canciones y total de páginas
         """
-        songs = self.songs.get_all(page, per_page)
+        songs = self.songs.get_all(page, per_page, sort_by, descending)
         total_pages = self.songs.get_total_pages(per_page)
         return songs, total_pages
 
@@ -149,6 +169,22 @@ class MusicService:
         """Obtener lista de géneros distintos para filtros."""
         return self.songs.get_distinct_genres()
 
+    def get_albums(self) -> List[dict]:
+        """Obtener los álbumes para la vista de cuadrícula."""
+        return self.songs.get_albums()
+
+    def get_library_stats(self) -> dict:
+        """Obtener totales de la biblioteca (canciones, duración y tamaño)."""
+        return self.songs.get_library_stats()
+
+    def get_genre_stats(self) -> List[dict]:
+        """Obtener canciones, duración y tamaño por género."""
+        return self.songs.get_genre_stats()
+
+    def get_waveform(self, song_id: int) -> Optional[bytes]:
+        """Obtener la forma de onda precalculada de una canción (None si no existe)."""
+        return self.songs.get_waveform(song_id)
+
     def get_total_songs_count(self) -> int:
         """Obtener el número total de canciones."""
         return self.songs.get_total_songs_count()
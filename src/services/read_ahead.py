@@ -0,0 +1,143 @@
+"""
+Precalentamiento de la siguiente pista de la lista
+
+Al cambiar de pista QMediaPlayer abre el archivo y analiza su cabecera en
+frío; en unidades de red eso cuesta cientos de ms. ReadAheadWarmer lee en
+un hilo aparte la cabecera, los primeros segundos y la cola del archivo
+(etiquetas ID3v1/APE, índice 'moov' de MP4) de la pista que sonará
+después, de modo que cuando se carga ya está en la caché de páginas del
+sistema. En POSIX se pide además la lectura anticipada con posix_fadvise;
+la lectura explícita es la que garantiza el efecto en sistemas de
+archivos que ignoran el consejo (SMB, NFS, FUSE).
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cabecera y cola que se leen siempre (etiquetas, carátulas incrustadas, índices)
+HEADER_BYTES = 256 * 1024
+TAIL_BYTES = 128 * 1024
+
+# Bitrate supuesto si la canción no lo tiene guardado (bps)
+DEFAULT_BITRATE = 320_000
+
+# Tope del tramo inicial (audio de alta resolución)
+MAX_HEAD_BYTES = 8 * 1024 * 1024
+
+CHUNK_BYTES = 1024 * 1024
+
+
+def warm_ranges(file_size: int, seconds: float, bitrate: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Tramos (offset, longitud) a leer de un archivo
+
+    Args:
+        file_size: Tamaño del archivo en bytes
+        seconds: Segundos de audio a precargar desde el inicio
+        bitrate: Bitrate en bps (None si se desconoce)
+
+    Returns:
+        List[Tuple[int, int]]: Inicio y, si no se solapa con él, la cola
+    """
+    head = HEADER_BYTES + int(seconds * (bitrate or DEFAULT_BITRATE) / 8)
+    head = min(head, MAX_HEAD_BYTES)
+    if head + TAIL_BYTES >= file_size:
+        return [(0, file_size)]
+    return [(0, head), (file_size - TAIL_BYTES, TAIL_BYTES)]
+
+
+def warm_file(file_path: str, seconds: float, bitrate: Optional[int] = None) -> int:
+    """
+    Cargar en la caché del sistema el inicio y la cola de un archivo
+
+    Args:
+        file_path: Ruta del archivo
+        seconds: Segundos de audio a precargar desde el inicio
+        bitrate: Bitrate en bps (None si se desconoce)
+
+    Returns:
+        int: Bytes leídos
+
+    Raises:
+        OSError: Si el archivo no se puede abrir o leer
+    """
+    buffer = bytearray(CHUNK_BYTES)
+    total = 0
+    with open(file_path, "rb", buffering=0) as file:
+        ranges = warm_ranges(os.fstat(file.fileno()).st_size, seconds, bitrate)
+        if hasattr(os, "posix_fadvise"):
+            # Pedir todos los tramos a la vez; el núcleo los lee en paralelo
+            for offset, length in ranges:
+                os.posix_fadvise(file.fileno(), offset, length, os.POSIX_FADV_WILLNEED)
+        for offset, length in ranges:
+            file.seek(offset)
+            end = offset + length
+            while offset < end:
+                read = file.readinto(memoryview(buffer)[:min(CHUNK_BYTES, end - offset)])
+                if not read:
+                    break
+                offset += read
+                total += read
+    return total
+
+
+class ReadAheadWarmer:
+    """Precalienta archivos en un hilo de fondo, de uno en uno"""
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: Segundos de audio a precargar (0 desactiva el precalentamiento)
+        """
+        self.seconds = seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._latest: Optional[str] = None  # Último archivo pedido
+
+    def warm(self, song_data: Optional[dict]):
+        """
+        Precalentar el archivo de una canción sin bloquear
+
+        Una petición nueva deja sin efecto la anterior si aún no ha empezado;
+        pedir dos veces seguidas el mismo archivo no lo lee de nuevo.
+
+        Args:
+            song_data: Datos de la canción (usa 'file_path' y 'bitrate')
+        """
+        if self.seconds <= 0 or not song_data or not song_data.get('file_path'):
+            return
+        file_path = song_data['file_path']
+        with self._lock:
+            if file_path == self._latest:
+                return
+            self._latest = file_path
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="read-ahead")
+            self._executor.submit(self._run, file_path, song_data.get('bitrate'))
+
+    def _run(self, file_path: str, bitrate: Optional[int]):
+        if file_path != self._latest:
+            return  # Ya se ha pedido otra pista
+        try:
+            read = warm_file(file_path, self.seconds, bitrate)
+            logger.debug(f"Precalentados {read} bytes de {file_path}")
+        except OSError as e:
+            logger.debug(f"No se pudo precalentar {file_path}: {e}")
+
+    def shutdown(self, wait: bool = False):
+        """
+        Detener el hilo de fondo, descartando lo pendiente
+
+        Args:
+            wait: Esperar a que termine la lectura en curso
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._latest = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,101 @@
+"""
+Normalización de volumen por pista (ReplayGain 2.0 / EBU R128)
+
+Cada canción guarda su sonoridad integrada en LUFS y su pico de muestra
+(lineal, 1.0 = fondo de escala). Se obtienen de las etiquetas ReplayGain
+o R128 al importar o, si no existen, del análisis de LoudnessJob.
+normalization_gain() convierte ambos valores en el factor de volumen que
+aplica AudioService. Este módulo no depende de NumPy ni de QtMultimedia.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from mutagen.easyid3 import EasyID3
+from mutagen.easymp4 import EasyMP4Tags
+
+logger = logging.getLogger(__name__)
+
+# Sonoridad de referencia de ReplayGain 2.0 (LUFS)
+REFERENCE_LOUDNESS = -18.0
+
+# Las ganancias R128 de Opus son relativas a -23 LUFS (EBU R128)
+R128_REFERENCE_LOUDNESS = -23.0
+
+# Límite de amplificación: evita subir el ruido de grabaciones casi mudas
+MAX_GAIN_DB = 12.0
+
+# EasyID3 lee replaygain_* de marcos RVA2; la mayoría de programas escriben
+# marcos TXXX. Registrar claves propias para no alterar las estándar.
+EasyID3.RegisterTXXXKey("txxx_replaygain_track_gain", "REPLAYGAIN_TRACK_GAIN")
+EasyID3.RegisterTXXXKey("txxx_replaygain_track_peak", "REPLAYGAIN_TRACK_PEAK")
+EasyMP4Tags.RegisterFreeformKey("replaygain_track_gain", "replaygain_track_gain")
+EasyMP4Tags.RegisterFreeformKey("replaygain_track_peak", "replaygain_track_peak")
+
+
+def _first_number(tags, *keys) -> Optional[float]:
+    """Primer valor numérico de las claves dadas ("-6.54 dB" -> -6.54)"""
+    for key in keys:
+        try:
+            values = tags.get(key)
+        except (KeyError, ValueError):
+            continue
+        if not values:
+            continue
+        value = values[0] if isinstance(values, list) else values
+        try:
+            return float(str(value).split()[0])
+        except (ValueError, IndexError):
+            logger.debug(f"Valor no numérico en {key}: {value!r}")
+    return None
+
+
+def read_replaygain(tags) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Leer la sonoridad y el pico de las etiquetas de un archivo
+
+    Admite REPLAYGAIN_TRACK_GAIN/PEAK (Vorbis, FLAC, APE, TXXX de ID3 y
+    freeform de MP4) y R128_TRACK_GAIN (Opus).
+
+    Args:
+        tags: Etiquetas de mutagen en modo "easy" (o None)
+
+    Returns:
+        Tuple[Optional[float], Optional[float]]: (sonoridad en LUFS, pico lineal)
+    """
+    if not tags:
+        return None, None
+    peak = _first_number(tags, "replaygain_track_peak", "txxx_replaygain_track_peak")
+    gain = _first_number(tags, "replaygain_track_gain", "txxx_replaygain_track_gain")
+    if gain is not None:
+        return round(REFERENCE_LOUDNESS - gain, 2), peak
+    r128_gain = _first_number(tags, "r128_track_gain")
+    if r128_gain is not None:
+        # Entero Q7.8 en dB
+        return round(R128_REFERENCE_LOUDNESS - r128_gain / 256.0, 2), peak
+    return None, peak
+
+
+def normalization_gain(loudness: Optional[float], peak: Optional[float] = None,
+                       target: float = REFERENCE_LOUDNESS) -> float:
+    """
+    Factor de volumen lineal que lleva una pista a la sonoridad objetivo
+
+    La ganancia se limita para que el pico no supere el fondo de escala y
+    para no amplificar más de MAX_GAIN_DB.
+
+    Args:
+        loudness: Sonoridad integrada de la pista en LUFS (None si se desconoce)
+        peak: Pico de muestra lineal (None si se desconoce)
+        target: Sonoridad objetivo en LUFS
+
+    Returns:
+        float: Factor a multiplicar por el volumen (1.0 si no hay datos)
+    """
+    if loudness is None:
+        return 1.0
+    gain_db = min(target - loudness, MAX_GAIN_DB)
+    factor = 10 ** (gain_db / 20)
+    if peak:
+        factor = min(factor, 1.0 / peak)
+    return factor
@@ -0,0 +1,124 @@
+"""
+Formas de onda precalculadas para la barra de búsqueda
+
+compute_peaks() reduce el PCM decodificado a WAVEFORM_BINS pares (mín, máx)
+int8 intercalados (2 KB por pista) con reducciones vectorizadas de NumPy.
+PeakAccumulator hace la misma reducción bloque a bloque, de modo que
+extract_waveform() no necesita la pista entera en memoria. WaveformJob
+las calcula en segundo plano para las canciones importadas y las guarda
+en la tabla waveforms, de modo que abrir una pista solo lee un BLOB
+pequeño y nunca espera a decodificar el audio.
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from .audio_decoding import open_pcm, supported_extensions, to_mono
+from .batch_job import BatchJob
+
+logger = logging.getLogger(__name__)
+
+# Resolución de la forma de onda: suficiente para una barra de ~1000 px
+WAVEFORM_BINS = 1024
+
+
+class PeakAccumulator:
+    """Picos (mín, máx) por intervalo calculados sobre bloques sucesivos"""
+
+    def __init__(self, total_frames: int, bins: int = WAVEFORM_BINS):
+        """
+        Args:
+            total_frames: Frames de la pista (de la cabecera; si llegan menos,
+                los intervalos vacíos quedan en silencio, y si llegan más,
+                se acumulan en el último)
+            bins: Número de intervalos
+        """
+        # Pista muy corta: un frame por intervalo y el resto en silencio
+        length = max(total_frames, bins)
+        self._starts = np.linspace(0, length, bins, endpoint=False).astype(np.int64)
+        self._min = np.full(bins, np.inf, dtype=np.float32)
+        self._max = np.full(bins, -np.inf, dtype=np.float32)
+        self._position = 0
+
+    def add(self, samples: np.ndarray):
+        """
+        Añadir el siguiente bloque
+
+        Args:
+            samples: Muestras mono float32 en [-1, 1]
+        """
+        if not len(samples):
+            return
+        end = self._position + len(samples)
+        first = int(np.searchsorted(self._starts, self._position, side="right")) - 1
+        last = int(np.searchsorted(self._starts, end - 1, side="right")) - 1
+        # Inicio, dentro del bloque, de cada intervalo que abarca
+        offsets = np.concatenate(([0], self._starts[first + 1:last + 1] - self._position))
+        span = slice(first, last + 1)
+        self._min[span] = np.minimum(self._min[span], np.minimum.reduceat(samples, offsets))
+        self._max[span] = np.maximum(self._max[span], np.maximum.reduceat(samples, offsets))
+        self._position = end
+
+    def result(self) -> bytes:
+        """
+        Returns:
+            bytes: 2 * bins valores int8 (mín, máx intercalados)
+        """
+        peaks = np.stack([self._min, self._max], axis=1)
+        peaks[~np.isfinite(peaks)] = 0.0  # Intervalos sin muestras
+        return np.round(np.clip(peaks, -1.0, 1.0) * 127).astype(np.int8).tobytes()
+
+
+def compute_peaks(samples: np.ndarray, bins: int = WAVEFORM_BINS) -> bytes:
+    """
+    Reducir muestras a picos (mín, máx) por intervalo
+
+    Args:
+        samples: Muestras mono float32 en [-1, 1]
+        bins: Número de intervalos
+
+    Returns:
+        bytes: 2 * bins valores int8 (mín, máx intercalados)
+    """
+    accumulator = PeakAccumulator(len(samples), bins)
+    accumulator.add(samples)
+    return accumulator.result()
+
+
+def extract_waveform(file_path) -> bytes:
+    """
+    Calcular la forma de onda de un archivo (función de trabajo del pool de procesos)
+
+    Args:
+        file_path: Ruta del archivo
+
+    Returns:
+        bytes: Picos según compute_peaks
+
+    Raises:
+        UnsupportedAudioError: Si el formato no se puede decodificar
+    """
+    with open_pcm(file_path) as stream:
+        accumulator = PeakAccumulator(stream.frames)
+        for block in stream.blocks():
+            accumulator.add(to_mono(block))
+    return accumulator.result()
+
+
+class WaveformJob(BatchJob):
+    """Calcular y guardar la forma de onda de las canciones que no la tienen"""
+
+    name = "waveform"
+    worker = staticmethod(extract_waveform)
+
+    def pending(self) -> List[Tuple[int, str]]:
+        """Canciones sin forma de onda cuyo formato se puede decodificar"""
+        extensions = supported_extensions()
+        return [(song_id, file_path) for song_id, file_path in self.repository.get_songs_without_waveform()
+                if Path(file_path).suffix.lower() in extensions]
+
+    def store(self, results: List[Tuple[int, bytes]]) -> int:
+        return self.repository.save_waveforms(results)
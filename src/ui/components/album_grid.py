@@ -0,0 +1,211 @@
+"""
+Cuadrícula de álbumes con carga diferida de carátulas
+"""
+
+from PyQt6.QtWidgets import QListView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QTimer
+from PyQt6.QtGui import QPixmap, QColor
+
+from ..managers.album_art_loader import AlbumArtLoader
+
+
+class AlbumGridModel(QAbstractListModel):
+    """
+    Modelo de álbumes que solo carga las carátulas de la zona visible
+
+    La vista informa del rango visible con set_visible_range(). Los
+    mosaicos visibles se piden con prioridad PRIORITY_VISIBLE y un margen
+    alrededor con PRIORITY_PREFETCH; las peticiones y pixmaps que quedan
+    fuera del rango se cancelan y se liberan (el LRU de AlbumArtLoader
+    conserva los recientes por si el usuario vuelve atrás).
+    """
+
+    # Filas pedidas por delante y por detrás de la zona visible
+    PREFETCH_ROWS = 24
+
+    def __init__(self, art_loader: AlbumArtLoader, tile_size: int = 160, parent=None):
+        super().__init__(parent)
+        self.art_loader = art_loader
+        self.tile_size = tile_size
+        self._albums = []
+        self._keys = {}          # fila -> clave de álbum (solo dentro de la ventana)
+        self._pixmaps = {}       # fila -> QPixmap (solo dentro de la ventana)
+        self._requested = set()  # filas con petición pendiente
+        self._window = range(0)
+        self._placeholder = QPixmap(tile_size, tile_size)
+        self._placeholder.fill(QColor(128, 128, 128, 40))
+        art_loader.art_ready.connect(self._on_art_ready)
+
+    def set_albums(self, albums: list):
+        """
+        Reemplazar los álbumes
+
+        Args:
+            albums: Diccionarios con 'album', 'artist', 'file_path' y 'tracks'
+        """
+        self.beginResetModel()
+        self._cancel_requests(self._requested)
+        self._albums = list(albums)
+        self._keys.clear()
+        self._pixmaps.clear()
+        self._window = range(0)
+        self.endResetModel()
+
+    def album(self, row: int) -> dict:
+        """Álbum de una fila"""
+        return self._albums[row]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._albums)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        album = self._albums[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{album['album']}\n{album['artist']}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self._pixmaps.get(index.row())
+            if pixmap is None:
+                # Sin petición: solo lo que ya esté en memoria
+                pixmap = self.art_loader.pixmap(album, self.tile_size)
+            return pixmap if pixmap is not None else self._placeholder
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{album['album']} — {album['artist']} ({album['tracks']} canciones)"
+        if role == Qt.ItemDataRole.UserRole:
+            return album
+        return None
+
+    def set_visible_range(self, first: int, last: int):
+        """
+        Actualizar la zona visible: pedir sus carátulas y liberar las demás
+
+        Args:
+            first: Primera fila visible
+            last: Última fila visible (inclusive)
+        """
+        if not self._albums:
+            return
+        first = max(0, first)
+        last = min(len(self._albums) - 1, last)
+        window = range(max(0, first - self.PREFETCH_ROWS),
+                       min(len(self._albums), last + 1 + self.PREFETCH_ROWS))
+
+        # Reciclar lo que sale de la ventana
+        self._cancel_requests([row for row in self._requested if row not in window])
+        for row in [row for row in self._pixmaps if row not in window]:
+            del self._pixmaps[row]
+        self._keys = {row: self._keys.get(row) or self.art_loader.cache.album_key(self._albums[row])
+                      for row in window}
+        self._window = window
+
+        # Primero las visibles, luego el margen (cerca de la zona visible primero)
+        visible = range(first, last + 1)
+        margin = sorted((row for row in window if row not in visible),
+                        key=lambda row: min(abs(row - first), abs(row - last)))
+        for rows, priority in ((visible, AlbumArtLoader.PRIORITY_VISIBLE),
+                               (margin, AlbumArtLoader.PRIORITY_PREFETCH)):
+            for row in rows:
+                if row in self._pixmaps:
+                    continue
+                pixmap = self.art_loader.request(self._albums[row], self.tile_size, priority)
+                if pixmap is not None:
+                    self._pixmaps[row] = pixmap
+                    self._requested.discard(row)
+                else:
+                    self._requested.add(row)
+
+    def _cancel_requests(self, rows):
+        """Retirar de la cola las peticiones de unas filas"""
+        for row in list(rows):
+            self.art_loader.cancel(self._albums[row], self.tile_size)
+            self._requested.discard(row)
+
+    def _on_art_ready(self, album_key: str, size: int, pixmap: QPixmap):
+        """Asignar una carátula recién cargada a las filas visibles de su álbum"""
+        rows = [row for row, key in self._keys.items() if key == album_key]
+        if size != self.tile_size:
+            # Otra pista del álbum tiene carátula (p. ej. la que suena): si la
+            # pista representativa no la tenía, volver a pedirla a este tamaño
+            for row in rows:
+                if row not in self._pixmaps:
+                    self.art_loader.request(self._albums[row], self.tile_size,
+                                            AlbumArtLoader.PRIORITY_VISIBLE)
+                    self._requested.add(row)
+            return
+        for row in rows:
+            self._requested.discard(row)
+            self._pixmaps[row] = pixmap
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class AlbumGridView(QListView):
+    """Vista de cuadrícula (modo icono) de AlbumGridModel"""
+
+    TILE_SIZE = 160
+    LAYOUT_BATCH_SIZE = 2000
+
+    # Coalescencia del cálculo de la zona visible durante el desplazamiento (~1 frame)
+    VISIBLE_RANGE_DELAY_MS = 16
+
+    def __init__(self, art_loader: AlbumArtLoader, parent=None):
+        super().__init__(parent)
+        self.setObjectName("albumGrid")
+
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setMovement(QListView.Movement.Static)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(True)
+        # Posicionar los mosaicos por lotes en el bucle de eventos
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(self.LAYOUT_BATCH_SIZE)
+        self.setWordWrap(True)
+        self.setIconSize(QSize(self.TILE_SIZE, self.TILE_SIZE))
+        self.setGridSize(QSize(self.TILE_SIZE + 24, self.TILE_SIZE + 56))
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+        self.album_model = AlbumGridModel(art_loader, self.TILE_SIZE, self)
+        self.setModel(self.album_model)
+
+        self._visible_timer = QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.timeout.connect(self.update_visible_range)
+        self.verticalScrollBar().valueChanged.connect(self._schedule_visible_range)
+        self.album_model.modelReset.connect(self._schedule_visible_range)
+
+    def set_albums(self, albums: list):
+        """Mostrar una lista de álbumes (ver AlbumGridModel.set_albums)"""
+        self.album_model.set_albums(albums)
+
+    def visible_rows(self) -> tuple:
+        """
+        Filas visibles según la rejilla y el desplazamiento
+
+        Returns:
+            tuple: (primera, última) fila visible, inclusive
+        """
+        grid = self.gridSize()
+        columns = max(1, self.viewport().width() // grid.width())
+        top = self.verticalScrollBar().value()
+        first_line = top // grid.height()
+        last_line = (top + self.viewport().height()) // grid.height()
+        return (first_line * columns, (last_line + 1) * columns - 1)
+
+    def update_visible_range(self):
+        """Informar al modelo de la zona visible"""
+        self.album_model.set_visible_range(*self.visible_rows())
+
+    def _schedule_visible_range(self):
+        if not self._visible_timer.isActive():
+            self._visible_timer.start(self.VISIBLE_RANGE_DELAY_MS)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_visible_range()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_visible_range()
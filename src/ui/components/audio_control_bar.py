@@ -8,6 +8,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QIcon
 
+from .waveform_slider import WaveformSlider
+
 # Suponiendo que tienes iconos en assets/icons
 # Ejemplo de rutas (ajusta según tu estructura)
 PLAY_ICON_PATH = "assets/icons/play.svg"
@@ -78,7 +80,7 @@ class AudioControlBar(QWidget):
         layout.addWidget(self.current_time_label)
 
         # Barra de progreso (seek bar)
-        self.progress_slider = QSlider(Qt.Orientation.Horizontal)
+        self.progress_slider = WaveformSlider()
         self.progress_slider.setObjectName("audioProgressSlider")
         self.progress_slider.setRange(0, 1000) # Representa progreso (ej. 0-1000 para permil)
         self.progress_slider.sliderMoved.connect(self.on_seek) # Cuando el usuario arrastra
@@ -8,9 +8,12 @@ from PyQt6.QtWidgets import (
     QProgressBar
 )
 from PyQt6.QtCore import pyqtSignal, QSize, Qt, QTimer, QPropertyAnimation, QEasingCurve
+import time
 
 from src.views.base_view import BaseView
+from src.utils.instrumentation import instrumentation, timed
 from ..song_table import SongTable
+from ..album_grid import AlbumGridView
 from ...config import UIConfig
 
 class LibraryView(QWidget, BaseView):
@@ -21,10 +24,21 @@ class LibraryView(QWidget, BaseView):
     song_selection_changed = pyqtSignal(list, int)
     song_double_clicked = pyqtSignal(dict)
     page_changed_requested = pyqtSignal(int)
+    sort_changed = pyqtSignal(str, bool)
     
-    def __init__(self, audio_service, parent=None):
+    # La barra de carga solo aparece si la carga supera este tiempo (ms)
+    LOADING_BAR_DELAY_MS = 150
+    
+    # Modos del selector de vista
+    VIEW_LIST = "Lista"
+    VIEW_GRID = "Cuadrícula"
+    
+    def __init__(self, audio_service=None, album_art_loader=None, parent=None):
         QWidget.__init__(self, parent)
         self.audio_service = audio_service
+        self.album_art_loader = album_art_loader
+        self.view_mode = self.VIEW_LIST
+        self.album_grid = None  # Se crea al elegir la cuadrícula por primera vez
         self.current_page = 1
         self.total_pages = 1
         self.items_per_page = 50
@@ -32,6 +46,10 @@ class LibraryView(QWidget, BaseView):
         # Estado de carga y animaciones
         self.is_loading = False
         self._loading_animation = None
+        self._load_requested_at = 0.0
+        self._loading_bar_timer = QTimer(self)
+        self._loading_bar_timer.setSingleShot(True)
+        self._loading_bar_timer.timeout.connect(lambda: self.show_loading(True))
         
         # Debouncing para búsquedas
         self._search_timer = QTimer()
@@ -59,6 +77,7 @@ class LibraryView(QWidget, BaseView):
         layout.addWidget(self.loading_bar)
         
         self.create_table(layout)
+        self._content_layout = layout
         self.create_pagination_controls(layout)
         
         # Estado vacío
@@ -113,22 +132,26 @@ class LibraryView(QWidget, BaseView):
     def show_empty_state(self, show: bool = True):
         """Mostrar/ocultar estado vacío"""
         self.empty_state.setVisible(show)
-        self.table.setVisible(not show)
+        self.table.setVisible(not show and self.view_mode == self.VIEW_LIST)
 
     def load_songs(self, songs: list, total_items: int = None):
-        """Cargar canciones en la tabla y actualizar paginación."""
-        self.show_loading(True)
+        """
+        Cargar canciones en la tabla y actualizar paginación
+        
+        Las filas se añaden por bloques sin bloquear la interfaz; la barra de
+        carga solo se muestra si la carga supera LOADING_BAR_DELAY_MS.
+        """
+        self._load_requested_at = time.perf_counter()
+        if not self.is_loading:
+            self._loading_bar_timer.start(self.LOADING_BAR_DELAY_MS)
         
-        # Simular una pequeña demora para la animación
-        QTimer.singleShot(300, lambda: self._finish_loading_songs(songs, total_items))
+        self.table.load_songs_progressive(
+            songs, on_finished=lambda: self._finish_loading_songs(songs, total_items)
+        )
 
     def _finish_loading_songs(self, songs: list, total_items: int = None):
-        """Completar la carga de canciones después de la animación"""
-        # Procesar canciones solo si no estamos en otro estado de carga
-        if not self.is_loading:
-            return
-            
-        self.table.load_songs(songs)
+        """Completar la carga una vez que todas las filas están en la tabla"""
+        self._loading_bar_timer.stop()
         
         if total_items is not None:
             if total_items == 0:
@@ -146,6 +169,10 @@ class LibraryView(QWidget, BaseView):
         # Mostrar estado vacío si no hay canciones
         self.show_empty_state(len(songs) == 0)
         
+        # Tiempo desde la petición hasta que la página está en la tabla
+        instrumentation.observe("ui.library_view.load_latency",
+                                (time.perf_counter() - self._load_requested_at) * 1000)
+        
     def update_ui_playback_state(self, is_playing: bool, song_data: dict = None):
         """Actualizar estado de reproducción en la interfaz"""
         current_song_from_service = self.audio_service.get_current_song_data()
@@ -185,8 +212,8 @@ class LibraryView(QWidget, BaseView):
         
         self.view_selector = QComboBox()
         self.view_selector.setObjectName("viewSelector")
-        self.view_selector.addItems(["Lista", "Cuadrícula"])
-        self.view_selector.currentTextChanged.connect(self.view_changed.emit)
+        self.view_selector.addItems([self.VIEW_LIST, self.VIEW_GRID])
+        self.view_selector.currentTextChanged.connect(self.set_view_mode)
         header_layout.addWidget(self.view_selector)
         
         layout.addWidget(header)
@@ -223,6 +250,7 @@ class LibraryView(QWidget, BaseView):
         """Crear tabla de canciones"""
         self.table = SongTable()
         self.items_per_page = self.table.items_per_page
+        self.table.sort_changed.connect(self.on_sort_changed)
         layout.addWidget(self.table)
         
     def create_pagination_controls(self, main_layout: QVBoxLayout):
@@ -255,8 +283,41 @@ class LibraryView(QWidget, BaseView):
         
         layout.addStretch()
         
+        self.pagination_container = pagination_container
         main_layout.addWidget(pagination_container)
 
+    def set_view_mode(self, mode: str):
+        """
+        Alternar entre la tabla de canciones y la cuadrícula de álbumes
+        
+        Emite view_changed; quien lo escucha carga los álbumes con load_albums.
+        """
+        if mode == self.view_mode:
+            return
+        self.view_mode = mode
+        is_grid = mode == self.VIEW_GRID
+        
+        if is_grid and self.album_grid is None:
+            self.album_grid = AlbumGridView(self.album_art_loader)
+            # Justo debajo de la tabla, en su misma posición del layout
+            self._content_layout.insertWidget(self._content_layout.indexOf(self.table) + 1,
+                                              self.album_grid)
+        if self.album_grid is not None:
+            self.album_grid.setVisible(is_grid)
+        self.table.setVisible(not is_grid and not self.empty_state.isVisible())
+        self.pagination_container.setVisible(not is_grid)
+        self.view_changed.emit(mode)
+
+    def load_albums(self, albums: list):
+        """
+        Mostrar los álbumes en la cuadrícula
+        
+        Args:
+            albums: Diccionarios de SongRepository.get_albums
+        """
+        if self.album_grid is not None:
+            self.album_grid.set_albums(albums)
+
     def update_pagination_controls(self):
         """Actualizar controles de paginación"""
         self.page_label.setText(f"Página {self.current_page} de {self.total_pages}")
@@ -275,6 +336,7 @@ class LibraryView(QWidget, BaseView):
             self.current_page += 1
             self.page_changed_requested.emit(self.current_page)
 
+    @timed("ui.library_view.update_filters")
     def update_filters(self, stats: dict):
         """Actualizar filtros con nuevos datos"""
         self.artist_combo.clear()
@@ -290,6 +352,11 @@ class LibraryView(QWidget, BaseView):
         self._search_timer.stop()
         self._search_timer.start(self._search_debounce_delay)
     
+    def on_sort_changed(self, sort_by: str, descending: bool):
+        """Reiniciar la paginación y propagar el cambio de ordenación"""
+        self.current_page = 1
+        self.sort_changed.emit(sort_by, descending)
+    
     def _emit_search_changed(self):
         """Emitir señal de búsqueda con filtros actuales"""
         if self.is_loading:
@@ -326,14 +393,25 @@ class LibraryView(QWidget, BaseView):
 
     def connect_audio_signals(self):
         """Conectar señales relacionadas con la reproducción de audio"""
-        if not self.audio_service:
-            return
-            
         # Conectar señales de la tabla con el servicio de audio
         self.table.song_double_clicked.connect(self.song_double_clicked.emit)
         self.table.song_selected.connect(self.song_selection_changed.emit)
         
-        # Conectar señales del servicio de audio con la interfaz
+        if self.audio_service:
+            self._connect_audio_service()
+    
+    def set_audio_service(self, audio_service):
+        """
+        Asignar el servicio de audio cuando se crea después de la vista
+        
+        Args:
+            audio_service: Instancia de AudioService
+        """
+        self.audio_service = audio_service
+        self._connect_audio_service()
+    
+    def _connect_audio_service(self):
+        """Conectar señales del servicio de audio con la interfaz"""
         self.audio_service.playback_state_changed.connect(self.update_ui_playback_state)
         self.audio_service.current_song_changed.connect(self.update_ui_current_song)
         self.audio_service.playback_finished.connect(self.handle_playback_finished)
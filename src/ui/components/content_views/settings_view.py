@@ -1,17 +1,169 @@
 """
-Placeholder para la vista de Configuración.
+Vista de Configuración: panel de diagnóstico con métricas en vivo.
 """
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt
+import time
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel, QPushButton
+from PyQt6.QtCore import Qt, QTimer
+
+from src.utils.diagnostics import DiagnosticsCollector, DB_SPANS, EVENT_LOOP_LAG, EVENT_LOOP_STALL
+from src.utils.instrumentation import instrumentation
+
+# Filas del panel: (sección, clave, etiqueta)
+METRIC_ROWS = (
+    ("Base de datos", "db.query", "Consultas (p50 / p95 / p99)"),
+    ("Base de datos", "db.write", "Escrituras (p50 / p95 / p99)"),
+    ("Base de datos", "db.iter_query", "Consultas incrementales (p50 / p95 / p99)"),
+    ("Base de datos", "db.execute_many", "Escrituras por lotes (p50 / p95 / p99)"),
+    ("Base de datos", "statement_cache", "Caché de sentencias (aciertos)"),
+    ("Base de datos", "slow_queries", "Consultas lentas registradas"),
+    ("Importación", "import", "Archivos importados"),
+    ("Importación", "import_rate", "Rendimiento"),
+    ("Interfaz", EVENT_LOOP_STALL, "Paradas del bucle de eventos"),
+    ("Interfaz", EVENT_LOOP_LAG, "Retraso del temporizador (p95 / máx)"),
+    ("Proceso", "memory", "Memoria (actual / pico)"),
+    ("Proceso", "library_size", "Canciones en la biblioteca"),
+)
+
+
+def _format_latency(summary: dict) -> str:
+    """p50 / p95 / p99 de un histograma en ms"""
+    return (f"{summary['p50']:.1f} / {summary['p95']:.1f} / {summary['p99']:.1f} ms"
+            f"  (n={summary['count']})")
+
+
+def _format_bytes(value) -> str:
+    """Tamaño en MiB, o guion si no está disponible"""
+    return "—" if value is None else f"{value / 1_048_576:.0f} MiB"
+
 
 class SettingsView(QWidget):
-    def __init__(self, parent=None):
+    """Panel de diagnóstico de rendimiento"""
+
+    # Intervalo de refresco del panel (ms)
+    REFRESH_INTERVAL_MS = 1000
+
+    def __init__(self, db_connection=None, parent=None):
         super().__init__(parent)
-        layout = QVBoxLayout(self)
-        label = QLabel("Vista de Configuración (Placeholder)")
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(label)
         self.setObjectName("settingsView")
+        self.collector = DiagnosticsCollector(db_connection)
+        self._value_labels = {}
+        self._last_tick = None
+
+        # Solo se refresca mientras la vista es visible (showEvent/hideEvent)
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self._timer.timeout.connect(self._on_timer)
+
+        self.init_ui()
+
+    def init_ui(self):
+        """Inicializar interfaz"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 24, 24, 24)
+
+        title = QLabel("Diagnóstico")
+        title.setObjectName("settingsTitle")
+        layout.addWidget(title)
+
+        self.profiling_label = QLabel(
+            "La instrumentación está desactivada (ENABLE_PROFILING=false): "
+            "las latencias y contadores aparecerán al activarla."
+        )
+        self.profiling_label.setWordWrap(True)
+        layout.addWidget(self.profiling_label)
+
+        self.profiling_button = QPushButton("Activar instrumentación")
+        self.profiling_button.clicked.connect(self.enable_profiling)
+        layout.addWidget(self.profiling_button, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        grid = QGridLayout()
+        grid.setHorizontalSpacing(24)
+        row = 0
+        current_section = None
+        for section, key, text in METRIC_ROWS:
+            if section != current_section:
+                header = QLabel(section)
+                header.setObjectName("settingsSection")
+                grid.addWidget(header, row, 0, 1, 2)
+                row += 1
+                current_section = section
+            grid.addWidget(QLabel(text), row, 0)
+            value = QLabel("—")
+            value.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            grid.addWidget(value, row, 1)
+            self._value_labels[key] = value
+            row += 1
+        layout.addLayout(grid)
+        layout.addStretch()
+
+    def enable_profiling(self):
+        """Activar la instrumentación global desde el panel"""
+        instrumentation.enable()
+        print(f"[{self.__class__.__name__}] Instrumentación activada.")
+        self.update_metrics()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._last_tick = None
+        self.update_metrics()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
+
+    def _on_timer(self):
+        """Tick del temporizador: medir su propio retraso y refrescar"""
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            lag_ms = (now - self._last_tick) * 1000 - self.REFRESH_INTERVAL_MS
+            instrumentation.observe(EVENT_LOOP_LAG, max(0.0, lag_ms))
+        self._last_tick = now
+        self.update_metrics()
+
+    def _set_value(self, key: str, text: str):
+        """Actualizar una etiqueta solo si cambia (evita relayouts innecesarios)"""
+        label = self._value_labels[key]
+        if label.text() != text:
+            label.setText(text)
+
+    def update_metrics(self):
+        """Leer las métricas y actualizar las etiquetas"""
+        data = self.collector.collect()
+
+        self.profiling_label.setVisible(not data['profiling'])
+        self.profiling_button.setVisible(not data['profiling'])
+
+        for name in DB_SPANS:
+            summary = data['db_latency'].get(name)
+            self._set_value(name, _format_latency(summary) if summary else "—")
+
+        cache = data['statement_cache']
+        self._set_value("statement_cache",
+                        f"{cache['hit_rate']:.1%}  ({cache['hits']} / {cache['hits'] + cache['misses']})"
+                        if cache else "—")
+        slow = data['slow_queries']
+        self._set_value("slow_queries", "registro desactivado" if slow is None else str(slow))
+
+        imports = data['import']
+        self._set_value("import", f"{imports['files']} correctos, {imports['failed']} fallidos")
+        self._set_value("import_rate",
+                        f"{imports['files_per_second']:.1f} archivos/s en {imports['seconds']:.1f} s"
+                        if imports['seconds'] else "—")
+
+        stalls = data['event_loop'].get(EVENT_LOOP_STALL)
+        self._set_value(EVENT_LOOP_STALL,
+                        f"{stalls['count']} (máx {stalls['max']:.0f} ms)" if stalls else "0")
+        lag = data['event_loop'].get(EVENT_LOOP_LAG)
+        self._set_value(EVENT_LOOP_LAG,
+                        f"{lag['p95']:.1f} / {lag['max']:.1f} ms" if lag else "—")
+
+        memory = data['memory']
+        self._set_value("memory", f"{_format_bytes(memory['rss_bytes'])} / "
+                                  f"{_format_bytes(memory['peak_rss_bytes'])}")
+        size = data['library_size']
+        self._set_value("library_size", "—" if size is None else str(size))
 
     def get_minimum_size(self):
         return self.sizeHint()
@@ -21,9 +173,12 @@ class SettingsView(QWidget):
 
     def refresh(self):
         print(f"[{self.__class__.__name__}] Refresh solicitado.")
+        self.collector.invalidate_library_size()
+        self.update_metrics()
 
     def cleanup(self):
         print(f"[{self.__class__.__name__}] Cleanup solicitado.")
+        self._timer.stop()
 
     def on_scale_changed(self, scale_factor: float):
         print(f"[{self.__class__.__name__}] Scale changed: {scale_factor}")
@@ -9,6 +9,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QIcon
 
+from src.utils.instrumentation import timed
+
 class NavigationRail(QFrame):
     """Panel de navegación lateral Material Design 3"""
     
@@ -54,6 +56,7 @@ class NavigationRail(QFrame):
         
         layout.addWidget(self.nav_tree)
         
+    @timed("ui.nav_rail.update_library_stats")
     def update_library_stats(self, stats: dict, 
                                library_icon: QIcon = None, 
                                playlist_icon: QIcon = None, 
@@ -10,6 +10,9 @@ from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTime
 from PyQt6.QtGui import QPixmap, QKeySequence, QShortcut
 import os
 
+from .waveform_slider import WaveformSlider
+from ..styles.stylesheet_cache import repolish
+
 class PlaybackPanel(QFrame):
     """Panel de reproducción de música Material Design 3"""
     
@@ -169,7 +172,7 @@ class PlaybackPanel(QFrame):
         self.time_current.setObjectName("timeLabel")
         progress_layout.addWidget(self.time_current)
 
-        self.progress_slider = QSlider(Qt.Orientation.Horizontal)
+        self.progress_slider = WaveformSlider()
         self.progress_slider.setObjectName("progressSlider")
         self.progress_slider.setRange(0, 1000)
         self.progress_slider.setToolTip("Buscar")
@@ -309,10 +312,10 @@ class PlaybackPanel(QFrame):
         """Alternar modo aleatorio"""
         self.shuffle_enabled = not self.shuffle_enabled
         self.shuffle_button.setText("🔀")
-        if self.shuffle_enabled:
-            self.shuffle_button.setProperty("checked", True)
-        else:
-            self.shuffle_button.setProperty("checked", False)
+        # Propiedad dinámica usada en el selector [active="true"]: Qt no la
+        # reevalúa sola, basta repulir el botón (no toda la ventana)
+        self.shuffle_button.setProperty("active", self.shuffle_enabled)
+        repolish(self.shuffle_button)
         self.shuffle_button.setToolTip(f"Aleatorio [S]: {'On' if self.shuffle_enabled else 'Off'}")
         self.shuffle_mode_changed.emit(self.shuffle_enabled)
 
@@ -344,6 +347,17 @@ class PlaybackPanel(QFrame):
         """Emitir señal seek_requested cuando el usuario mueve el slider de progreso."""
         self.seek_requested.emit(position_permil)
 
+    def set_waveform(self, song_id: int, peaks: bytes):
+        """
+        Mostrar la forma de onda precalculada en la barra de progreso
+        
+        Args:
+            song_id: Canción a la que pertenecen los picos (se ignoran si ya no es la actual)
+            peaks: Picos (mín, máx) int8 intercalados, o None si no se han calculado
+        """
+        if self.current_song and self.current_song.get('id') == song_id:
+            self.progress_slider.set_peaks(peaks)
+
     def clear(self):
         """Limpiar panel"""
         self.current_song = None
@@ -354,6 +368,7 @@ class PlaybackPanel(QFrame):
         self.play_button.setEnabled(False)
         self.progress_slider.setValue(0)
         self.progress_slider.setEnabled(False)
+        self.progress_slider.set_peaks(None)
         self.album_art_label.clear()
 
     # --- Slots para ser llamados por AudioService ---
@@ -362,6 +377,7 @@ class PlaybackPanel(QFrame):
         Establecer canción actual y su información en el panel.
         Llamado por AudioService cuando cambia la canción.
         """
+        previous_song = self.current_song
         self.current_song = song_data
         if song_data:
             print(f"[PlaybackPanel] update_current_song RECIBIDO: {song_data}") # DEBUG
@@ -371,6 +387,15 @@ class PlaybackPanel(QFrame):
             self.play_button.setEnabled(True)
             self.prev_button.setEnabled(True) # Habilitar si hay lógica de playlist
             self.next_button.setEnabled(True) # Habilitar si hay lógica de playlist
+            
+            # Duración guardada al importar: no esperar a que QMediaPlayer la conozca
+            duration = song_data.get('duration')
+            is_new_song = not previous_song or previous_song.get('file_path') != song_data.get('file_path')
+            if duration and is_new_song:
+                self.update_progress(0, int(duration * 1000))
+            if is_new_song:
+                # La forma de onda de la nueva pista llega después con set_waveform
+                self.progress_slider.set_peaks(None)
 
             # Actualizar carátula
             album_art_pixmap = song_data.get('album_art')
@@ -401,6 +426,7 @@ class PlaybackPanel(QFrame):
             self.artist_label.setText("")
             self.progress_slider.setEnabled(False)
             self.progress_slider.setValue(0)
+            self.progress_slider.set_peaks(None)
             self.play_button.setEnabled(False) # Deshabilitar si no hay canción
             self.prev_button.setEnabled(False)
             self.next_button.setEnabled(False)
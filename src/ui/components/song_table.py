@@ -6,7 +6,10 @@ from PyQt6.QtWidgets import (
     QFrame, QVBoxLayout, QTableWidget,
     QTableWidgetItem, QHeaderView, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+import time
+
+from src.utils.instrumentation import timed
 
 class SongTable(QFrame):
     """Tabla de canciones Material Design 3"""
@@ -14,6 +17,7 @@ class SongTable(QFrame):
     # Señales
     song_selected = pyqtSignal(dict)  # Información de la canción seleccionada
     song_double_clicked = pyqtSignal(dict)  # Canción para reproducir
+    sort_changed = pyqtSignal(str, bool)  # (clave de ordenación, descendente)
     
     # Columnas (Añadida columna para indicador de reproducción al inicio)
     COLUMNS = [
@@ -22,9 +26,29 @@ class SongTable(QFrame):
         "Artista",
         "Álbum",
         "Género",
-        "BPM"
+        "BPM",
+        "Añadida",
+        "Duración"
     ]
     
+    # Columna -> clave de ordenación del repositorio (SongRepository.SORT_COLUMNS)
+    SORT_KEYS = {
+        1: "title",
+        2: "artist",
+        3: "album",
+        4: "genre",
+        5: "bpm",
+        6: "date_added",
+        7: "duration"
+    }
+    
+    # Presupuesto de cada bloque de la carga progresiva (ms), por debajo de
+    # un frame de 16 ms para que el bucle de eventos siga pintando
+    FRAME_BUDGET_MS = 8
+    
+    # Filas que se añaden entre comprobaciones del presupuesto
+    ROWS_PER_STEP = 32
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("tableContainer")
@@ -33,6 +57,9 @@ class SongTable(QFrame):
         self.items_per_page = 50
         self.total_items = 0
         self.currently_playing_row = -1 # Fila de la canción en reproducción
+        self.sort_by = "title"
+        self.sort_descending = False
+        self._load_generation = 0 # Invalida cargas progresivas anteriores
         
         self.init_ui()
         
@@ -59,6 +86,16 @@ class SongTable(QFrame):
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # Álbum
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)  # Género
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)  # BPM
+        header.setSectionResizeMode(6, QHeaderView.ResizeMode.ResizeToContents)  # Añadida
+        header.setSectionResizeMode(7, QHeaderView.ResizeMode.Fixed)  # Duración
+        header.resizeSection(7, 72)
+        
+        # Ordenación en el servidor: la tabla no ordena por sí misma, solo
+        # muestra el indicador y solicita la página ordenada
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.sectionClicked.connect(self.on_header_clicked)
+        self._update_sort_indicator()
         
         # Configurar selección
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
@@ -77,6 +114,7 @@ class SongTable(QFrame):
         self.total_items = 0
         self.currently_playing_row = -1 # Resetear indicador
         
+    @timed("ui.song_table.load_songs")
     def load_songs(self, songs: list):
         """
         Cargar canciones en la tabla
@@ -84,45 +122,94 @@ class SongTable(QFrame):
         Args:
             songs: Lista de canciones
         """
+        self._load_generation += 1
         self.clear()
+        
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.table.setRowCount(len(songs))
+            for row, song in enumerate(songs):
+                self._set_row(row, song)
+        finally:
+            self.table.setUpdatesEnabled(True)
             
-        # Agregar filas
-        for song in songs:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            
-            # Crear items
-            # Item vacío para el indicador de reproducción
-            indicator_item = QTableWidgetItem("")
-            indicator_item.setFlags(indicator_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-
-            items = [
-                indicator_item, # Celda para el indicador
-                QTableWidgetItem(str(song.title)),
-                QTableWidgetItem(str(song.artist)),
-                QTableWidgetItem(str(song.album)),
-                QTableWidgetItem(str(song.genre)),
-                QTableWidgetItem(str(song.bpm or ""))
-            ]
+    def load_songs_progressive(self, songs: list, on_finished=None):
+        """
+        Cargar canciones en bloques que caben en un frame
+        
+        Las filas anteriores siguen visibles hasta que el primer bloque está
+        listo; el resto se añade en iteraciones sucesivas del bucle de
+        eventos. Una nueva carga cancela la que esté en curso.
+        
+        Args:
+            songs: Lista de canciones
+            on_finished: Llamada sin argumentos al completar la carga
+        """
+        self._load_generation += 1
+        self._load_chunk(self._load_generation, songs, 0, on_finished)
+        
+    def _load_chunk(self, generation: int, songs: list, start: int, on_finished):
+        """Añadir filas desde start hasta agotar el presupuesto del frame"""
+        if generation != self._load_generation:
+            return  # Carga sustituida por otra más reciente
             
-            # Configurar alineación
-            items[5].setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter) # BPM (ahora en índice 5)
+        if start == 0:
+            self.clear()
             
-            # Guardar datos completos en el item de Título (índice 1)
-            title_item = items[1]
-            title_item.setData(Qt.ItemDataRole.UserRole, {
-                'title': song.title,
-                'artist': song.artist,
-                'album': song.album,
-                'genre': song.genre,
-                'bpm': song.bpm,
-                'file_path': str(song.file_path) # Asegurarse que song.file_path existe
-            })
+        deadline = time.perf_counter() + self.FRAME_BUDGET_MS / 1000
+        row = start
+        while row < len(songs):
+            end = min(row + self.ROWS_PER_STEP, len(songs))
+            self.table.setRowCount(end)
+            for index in range(row, end):
+                self._set_row(index, songs[index])
+            row = end
+            if time.perf_counter() >= deadline:
+                break
+                
+        if row < len(songs):
+            QTimer.singleShot(0, lambda: self._load_chunk(generation, songs, row, on_finished))
+        elif on_finished:
+            on_finished()
             
-            # Agregar items a la fila
-            for col, item in enumerate(items):
-                self.table.setItem(row, col, item)
+    def _set_row(self, row: int, song):
+        """Crear los items de una fila"""
+        # Item vacío para el indicador de reproducción
+        indicator_item = QTableWidgetItem("")
+        indicator_item.setFlags(indicator_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
+
+        items = [
+            indicator_item, # Celda para el indicador
+            QTableWidgetItem(str(song.title)),
+            QTableWidgetItem(str(song.artist)),
+            QTableWidgetItem(str(song.album)),
+            QTableWidgetItem(str(song.genre)),
+            QTableWidgetItem(str(song.bpm or "")),
+            QTableWidgetItem(str(song.created_at or "")[:10]),
+            QTableWidgetItem(self.format_duration(song.duration))
+        ]
+        
+        # Configurar alineación
+        items[5].setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter) # BPM (ahora en índice 5)
+        items[7].setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter) # Duración
+        
+        # Guardar la canción en el item de Título (índice 1). Se guarda la
+        # instancia inmutable (sin copiarla a un dict por fila); el dict
+        # que esperan las señales se construye solo al emitirlas.
+        items[1].setData(Qt.ItemDataRole.UserRole, song)
+        
+        # Agregar items a la fila
+        for col, item in enumerate(items):
+            self.table.setItem(row, col, item)
                 
+    @staticmethod
+    def format_duration(seconds) -> str:
+        """Duración como m:ss (vacía si no se conoce)"""
+        if not seconds:
+            return ""
+        minutes, secs = divmod(int(round(seconds)), 60)
+        return f"{minutes}:{secs:02d}"
+        
     def get_current_song(self) -> dict:
         """Obtener información de la canción seleccionada"""
         items = self.table.selectedItems()
@@ -131,7 +218,12 @@ class SongTable(QFrame):
             
         row = items[0].row()
         # Los datos de la canción están en el item de Título (columna 1)
-        return self.table.item(row, 1).data(Qt.ItemDataRole.UserRole)
+        return self._song_data(row)
+        
+    def _song_data(self, row: int) -> dict:
+        """Obtener los datos de la canción de una fila como diccionario"""
+        song = self.table.item(row, 1).data(Qt.ItemDataRole.UserRole)
+        return song.to_dict() if song else None
         
     def on_selection_changed(self):
         """Manejar cambio de selección"""
@@ -143,7 +235,7 @@ class SongTable(QFrame):
         """Manejar doble click en item"""
         # El item clickeado puede ser cualquiera de la fila.
         # Necesitamos obtener los datos de la canción de la columna de Título.
-        song_data = self.table.item(item.row(), 1).data(Qt.ItemDataRole.UserRole)
+        song_data = self._song_data(item.row())
         if song_data:
             self.song_double_clicked.emit(song_data)
             
@@ -166,9 +258,10 @@ class SongTable(QFrame):
             return
 
         # Encontrar la fila de la canción
+        target_path = song_data_to_play.get('file_path')
         for row in range(self.table.rowCount()):
-            item_data = self.table.item(row, 1).data(Qt.ItemDataRole.UserRole)
-            if item_data and item_data.get('file_path') == song_data_to_play.get('file_path'):
+            song = self.table.item(row, 1).data(Qt.ItemDataRole.UserRole)
+            if song and song.file_path_str == target_path:
                 self.table.item(row, 0).setText("▶️") # O usar un QIcon
                 # self.table.item(row, 0).setIcon(QIcon(PLAYING_NOW_ICON_PATH))
                 self.currently_playing_row = row
@@ -181,6 +274,32 @@ class SongTable(QFrame):
             # self.table.item(self.currently_playing_row, 0).setIcon(QIcon())
         self.currently_playing_row = -1
 
+    def on_header_clicked(self, column: int):
+        """
+        Manejar click en una cabecera: cambia la clave de ordenación o
+        invierte la dirección si ya se ordenaba por esa columna.
+        """
+        sort_key = self.SORT_KEYS.get(column)
+        if sort_key is None:
+            # Columna no ordenable (indicador): restaurar el indicador actual
+            self._update_sort_indicator()
+            return
+            
+        if sort_key == self.sort_by:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_by = sort_key
+            self.sort_descending = False
+            
+        self._update_sort_indicator()
+        self.sort_changed.emit(self.sort_by, self.sort_descending)
+        
+    def _update_sort_indicator(self):
+        """Sincronizar el indicador de la cabecera con la ordenación actual"""
+        column = next(col for col, key in self.SORT_KEYS.items() if key == self.sort_by)
+        order = Qt.SortOrder.DescendingOrder if self.sort_descending else Qt.SortOrder.AscendingOrder
+        self.table.horizontalHeader().setSortIndicator(column, order)
+        
     def get_pagination_info(self) -> tuple:
         """
         Obtener información de paginación
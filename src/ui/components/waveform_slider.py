@@ -0,0 +1,129 @@
+"""
+Barra de búsqueda que dibuja la forma de onda de la pista
+"""
+
+from typing import Optional
+
+from PyQt6.QtWidgets import QSlider, QStyle
+from PyQt6.QtCore import Qt, QRect, QEvent
+from PyQt6.QtGui import QPainter, QPixmap, QColor, QPalette
+
+
+class WaveformSlider(QSlider):
+    """
+    QSlider horizontal que muestra los picos precalculados de la pista
+
+    Sin forma de onda se comporta y se dibuja como un QSlider normal. Con
+    ella, la forma de onda se rasteriza dos veces (parte reproducida y
+    pendiente) solo cuando cambian los picos o el tamaño; cada repintado
+    durante la reproducción se limita a copiar dos pixmaps recortados.
+    """
+
+    MIN_WAVEFORM_HEIGHT = 24
+
+    def __init__(self, parent=None):
+        super().__init__(Qt.Orientation.Horizontal, parent)
+        self.setMinimumHeight(self.MIN_WAVEFORM_HEIGHT)
+        self._peaks = None
+        self._played_pixmap = None
+        self._pending_pixmap = None
+
+    def set_peaks(self, peaks: Optional[bytes]):
+        """
+        Mostrar una forma de onda
+
+        Args:
+            peaks: Pares (mín, máx) int8 intercalados (ver services.waveform),
+                o None para volver a la barra normal
+        """
+        self._peaks = memoryview(peaks).cast("b") if peaks else None
+        self._played_pixmap = self._pending_pixmap = None
+        self.update()
+
+    def has_peaks(self) -> bool:
+        return self._peaks is not None
+
+    def _value_at(self, x: int) -> int:
+        return QStyle.sliderValueFromPosition(self.minimum(), self.maximum(), x, max(1, self.width() - 1))
+
+    def _render_pixmaps(self):
+        """Rasterizar la forma de onda al tamaño actual en los dos colores"""
+        width, height = self.width(), self.height()
+        bins = len(self._peaks) // 2
+        center = height / 2
+        scale = (height / 2 - 1) / 127
+        ratio = self.devicePixelRatioF()
+        palette = self.palette()
+        pixmaps = []
+        for color in (palette.color(QPalette.ColorRole.Highlight),
+                      palette.color(QPalette.ColorRole.PlaceholderText)):
+            pixmap = QPixmap(int(width * ratio), int(height * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setPen(color)
+            for x in range(width):
+                # Agregar los intervalos que caen en cada columna
+                first = x * bins // width
+                last = max(first + 1, (x + 1) * bins // width)
+                low = min(self._peaks[2 * first:2 * last:2])
+                high = max(self._peaks[2 * first + 1:2 * last:2])
+                painter.drawLine(x, int(center - high * scale), x, int(center - low * scale))
+            painter.end()
+            pixmaps.append(pixmap)
+        self._played_pixmap, self._pending_pixmap = pixmaps
+
+    def paintEvent(self, event):
+        if self._peaks is None:
+            super().paintEvent(event)
+            return
+        if self._played_pixmap is None:
+            self._render_pixmaps()
+
+        span = self.maximum() - self.minimum()
+        progress = (self.sliderPosition() - self.minimum()) / span if span else 0.0
+        split = int(round(progress * self.width()))
+        painter = QPainter(self)
+        if not self.isEnabled():
+            painter.setOpacity(0.5)
+        painter.drawPixmap(QRect(0, 0, split, self.height()), self._played_pixmap,
+                           QRect(0, 0, split, self.height()))
+        painter.drawPixmap(QRect(split, 0, self.width() - split, self.height()), self._pending_pixmap,
+                           QRect(split, 0, self.width() - split, self.height()))
+        painter.setPen(QColor(self.palette().color(QPalette.ColorRole.Highlight)))
+        painter.drawLine(min(split, self.width() - 1), 0, min(split, self.width() - 1), self.height())
+        painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._played_pixmap = self._pending_pixmap = None
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() in (QEvent.Type.PaletteChange, QEvent.Type.StyleChange):
+            # Cambio de tema: volver a rasterizar con la nueva paleta
+            self._played_pixmap = self._pending_pixmap = None
+
+    # Con forma de onda no hay tirador: un clic salta a esa posición y
+    # arrastrar busca de forma continua (emite sliderMoved como el tirador)
+    def mousePressEvent(self, event):
+        if self._peaks is None or event.button() != Qt.MouseButton.LeftButton:
+            super().mousePressEvent(event)
+            return
+        self.setSliderDown(True)
+        self.setSliderPosition(self._value_at(int(event.position().x())))
+        event.accept()
+
+    def mouseMoveEvent(self, event):
+        if self._peaks is None or not self.isSliderDown():
+            super().mouseMoveEvent(event)
+            return
+        self.setSliderPosition(self._value_at(int(event.position().x())))
+        event.accept()
+
+    def mouseReleaseEvent(self, event):
+        if self._peaks is None or not self.isSliderDown():
+            super().mouseReleaseEvent(event)
+            return
+        self.setSliderDown(False)
+        event.accept()
@@ -2,11 +2,32 @@
 Configuración de la interfaz de usuario
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Tuple
 
 from src.utils.config import config
 
+
+@lru_cache(maxsize=8)
+def _parse_resolution(resolution: str) -> Tuple[int, int]:
+    """Resolución WIDTHxHEIGHT como tupla de enteros"""
+    try:
+        width, height = resolution.split('x')
+        return (int(width), int(height))
+    except (ValueError, AttributeError):
+        return (1920, 1080)  # Valores por defecto
+
+
+@lru_cache(maxsize=1024)
+def _scale_table(resolution: str, sizes: Tuple[int, ...],
+                 current_width: int, current_height: int) -> Tuple[int, ...]:
+    """Tamaños escalados para una resolución base y un tamaño de ventana"""
+    base_width, base_height = _parse_resolution(resolution)
+    scale = min(current_width / base_width, current_height / base_height)
+    return tuple(int(size * scale) for size in sizes)
+
+
 class UIConfig:
     """Configuración de la interfaz tomada del módulo central Config"""
 
@@ -27,11 +48,7 @@ class UIConfig:
     @classmethod
     def get_base_resolution(cls) -> Tuple[int, int]:
         """Obtener resolución base como tupla de enteros"""
-        try:
-            width, height = cls.BASE_RESOLUTION.split('x')
-            return (int(width), int(height))
-        except (ValueError, AttributeError):
-            return (1920, 1080)  # Valores por defecto
+        return _parse_resolution(cls.BASE_RESOLUTION)
             
     @classmethod
     def get_scale_factor(cls, current_width: int, current_height: int) -> float:
@@ -66,8 +83,22 @@ class UIConfig:
         Returns:
             int: Tamaño escalado
         """
-        scale = cls.get_scale_factor(current_width, current_height)
-        return int(size * scale)
+        return _scale_table(cls.BASE_RESOLUTION, (size,), current_width, current_height)[0]
+    
+    @classmethod
+    def scale_table(cls, sizes: Tuple[int, ...], current_width: int, current_height: int) -> Tuple[int, ...]:
+        """
+        Escalar varios tamaños a la vez; el resultado se cachea por tamaño de ventana
+        
+        Args:
+            sizes: Tamaños base a escalar
+            current_width: Ancho actual de la ventana
+            current_height: Alto actual de la ventana
+            
+        Returns:
+            Tuple[int, ...]: Tamaños escalados en el mismo orden
+        """
+        return _scale_table(cls.BASE_RESOLUTION, tuple(sizes), current_width, current_height)
         
     @classmethod
     def is_dark_theme(cls) -> bool:
@@ -0,0 +1,148 @@
+"""
+Carga de carátulas para la interfaz
+
+Las miniaturas se resuelven en un pool de hilos propio (AlbumArtCache
+extrae y decodifica con mutagen y QImage) y se convierten en QPixmap en el
+hilo principal, donde se guardan en un LRU por álbum y tamaño.
+
+Las peticiones esperan en una cola con prioridad gestionada en el hilo
+principal y solo se entregan al pool cuando hay un hilo libre, de modo que
+las que dejan de interesar (p. ej. mosaicos que salen de la vista) se
+pueden cancelar antes de decodificarse.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QPixmap
+
+from src.services.album_art import AlbumArtCache
+from .background_task import run_in_background
+
+logger = logging.getLogger(__name__)
+
+class AlbumArtLoader(QObject):
+    """Carátulas como QPixmap con LRU en memoria y decodificación en segundo plano"""
+
+    # str: clave de álbum, int: lado en px, QPixmap: carátula
+    art_ready = pyqtSignal(str, int, object)
+
+    # Pixmaps retenidos en memoria (64 px ≈ 16 KiB, 160 px ≈ 100 KiB)
+    MAX_PIXMAPS = 512
+
+    # Hilos de decodificación: la lectura de disco domina, más hilos no ayudan
+    MAX_THREADS = 2
+
+    # Prioridades de la cola (mayor primero; a igual prioridad, orden de llegada)
+    PRIORITY_PREFETCH = 0   # Mosaicos próximos a la zona visible
+    PRIORITY_VISIBLE = 1    # Mosaicos visibles
+    PRIORITY_HIGH = 2       # Peticiones puntuales (canción en reproducción)
+
+    def __init__(self, cache: AlbumArtCache, max_pixmaps: int = MAX_PIXMAPS,
+                 pool: Optional[QThreadPool] = None, parent=None):
+        """
+        Inicializar cargador
+
+        Args:
+            cache: Caché de miniaturas en disco
+            max_pixmaps: Capacidad del LRU de QPixmap
+            pool: Pool de hilos (por defecto uno propio con MAX_THREADS)
+            parent: QObject padre
+        """
+        super().__init__(parent)
+        self.cache = cache
+        self.max_pixmaps = max_pixmaps
+        self._pixmaps = OrderedDict()
+        self._queue = {}      # clave -> (prioridad, orden de llegada, song_data)
+        self._running = set() # claves entregadas al pool
+        # clave de álbum -> archivos sin carátula incrustada: en muchos álbumes
+        # solo algunas pistas la llevan, así que se prueban las demás
+        self._missing = {}
+        self._sequence = 0
+        if pool is None:
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(self.MAX_THREADS)
+        self._pool = pool
+
+    def pixmap(self, song_data: dict, size: int) -> Optional[QPixmap]:
+        """Carátula en memoria para el álbum de una canción, sin cargarla"""
+        key = (self.cache.album_key(song_data), size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def request(self, song_data: dict, size: int,
+                priority: int = PRIORITY_HIGH) -> Optional[QPixmap]:
+        """
+        Obtener la carátula de una canción o encargar su carga
+
+        Args:
+            song_data: Diccionario de la canción (debe incluir 'file_path')
+            size: Lado de la miniatura en px
+            priority: Prioridad en la cola (ver PRIORITY_*)
+
+        Returns:
+            Optional[QPixmap]: La carátula si ya está en memoria; si no, None
+            y art_ready se emite cuando esté lista (nada si no tiene carátula)
+        """
+        pixmap = self.pixmap(song_data, size)
+        if pixmap is not None:
+            return pixmap
+
+        key = (self.cache.album_key(song_data), size)
+        if key in self._running:
+            return None  # Ya se está cargando (otra pista del mismo álbum)
+        if song_data.get("file_path") in self._missing.get(key[0], ()):
+            return None  # Esta pista no tiene carátula
+        queued = self._queue.get(key)
+        if queued is None or queued[0] != priority:
+            self._sequence += 1
+            self._queue[key] = (priority, self._sequence, dict(song_data))
+        self._dispatch()
+        return None
+
+    def cancel(self, song_data: dict, size: int):
+        """Retirar de la cola una petición que aún no ha empezado"""
+        self._queue.pop((self.cache.album_key(song_data), size), None)
+
+    def _dispatch(self):
+        """Entregar al pool las peticiones más prioritarias mientras haya hilos libres"""
+        while self._queue and len(self._running) < self._pool.maxThreadCount():
+            key = min(self._queue, key=lambda k: (-self._queue[k][0], self._queue[k][1]))
+            song_data = self._queue.pop(key)[2]
+            self._running.add(key)
+            run_in_background(self.cache.get_thumbnail, song_data, key[1],
+                              on_finished=lambda path, key=key, song_data=song_data:
+                                  self._on_loaded(key, song_data, path),
+                              on_failed=lambda error, key=key: self._on_failed(key, error),
+                              pool=self._pool)
+
+    def _on_failed(self, key: tuple, error: Exception):
+        """
+        Liberar una petición fallida sin marcar el álbum como sin carátula
+
+        Un error de lectura puede ser transitorio (unidad de red, archivo
+        bloqueado): la siguiente petición del álbum lo vuelve a intentar.
+        """
+        logger.debug(f"Album art for {key[0]} failed: {error}")
+        self._running.discard(key)
+        self._dispatch()
+
+    def _on_loaded(self, key: tuple, song_data: dict, path):
+        """Convertir la miniatura en QPixmap (hilo principal)"""
+        self._running.discard(key)
+        self._dispatch()
+        pixmap = QPixmap(str(path)) if path is not None else None
+        if pixmap is None or pixmap.isNull():
+            self._missing.setdefault(key[0], set()).add(song_data.get("file_path"))
+            return
+
+        # El álbum ya tiene carátula en la caché de disco: cualquier pista sirve
+        self._missing.pop(key[0], None)
+        self._pixmaps[key] = pixmap
+        while len(self._pixmaps) > self.max_pixmaps:
+            self._pixmaps.popitem(last=False)
+        self.art_ready.emit(key[0], key[1], pixmap)
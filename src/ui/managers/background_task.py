@@ -0,0 +1,66 @@
+"""
+Ejecución de tareas en segundo plano con QThreadPool
+"""
+
+import logging
+import traceback
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSignals(QObject):
+    """Señales de una tarea; se entregan en el hilo que las conectó"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class BackgroundTask(QRunnable):
+    """QRunnable que ejecuta una función y emite su resultado o su excepción"""
+
+    def __init__(self, func: Callable, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.error(f"Background task {getattr(self.func, '__qualname__', self.func)} failed: "
+                         f"{e}\n{traceback.format_exc()}")
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(func: Callable, *args,
+                      on_finished: Optional[Callable] = None,
+                      on_failed: Optional[Callable] = None,
+                      pool: Optional[QThreadPool] = None, **kwargs) -> BackgroundTask:
+    """
+    Ejecutar func(*args, **kwargs) en un hilo del pool
+
+    Los callbacks se conectan desde el hilo llamante (normalmente el
+    principal), así que se ejecutan en él y pueden tocar widgets.
+
+    Args:
+        func: Función a ejecutar fuera del hilo principal
+        on_finished: Callback(resultado)
+        on_failed: Callback(excepción)
+        pool: Pool de hilos (por defecto QThreadPool.globalInstance())
+
+    Returns:
+        BackgroundTask: Tarea encolada
+    """
+    task = BackgroundTask(func, *args, **kwargs)
+    if on_finished is not None:
+        task.signals.finished.connect(on_finished)
+    if on_failed is not None:
+        task.signals.failed.connect(on_failed)
+    (pool or QThreadPool.globalInstance()).start(task)
+    return task
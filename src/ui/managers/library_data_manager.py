@@ -4,6 +4,7 @@ Gestor de datos de la biblioteca
 
 from src.database.connection import DatabaseConnectionError, DatabaseTimeoutError
 from src.utils.error_handler import LoadingCircuitBreaker, ErrorHandler
+from src.utils.instrumentation import instrumentation, timed
 
 class LibraryDataManager:
     """Maneja la lógica de carga y gestión de datos de la biblioteca"""
@@ -13,7 +14,9 @@ class LibraryDataManager:
         self._logger = logger
         self._loading_circuit_breaker = LoadingCircuitBreaker(cooldown=2.0)
 
-    def load_songs(self, page: int, filters: dict, per_page: int, on_data_loaded, on_status_message):
+    @timed("library.load_songs")
+    def load_songs(self, page: int, filters: dict, per_page: int, on_data_loaded, on_status_message,
+                   sort_by: str = "title", descending: bool = False):
         """
         Cargar canciones aplicando filtros y paginación
         
@@ -23,21 +26,27 @@ class LibraryDataManager:
             per_page: Cantidad de items por página
             on_data_loaded: Callback(songs, total_items) cuando los datos se cargan
             on_status_message: Callback(message) para mostrar mensajes de estado
+            sort_by: Clave de ordenación (title, artist, album, genre, bpm, date_added)
+            descending: True para orden descendente
         """
         if not self._loading_circuit_breaker.start_loading():
             self._logger.warning(f"Load request for page {page} blocked by circuit breaker")
             return
 
         try:
-            songs, total_items = self._fetch_songs(
-                page, 
-                filters.get('title', ""),
-                filters.get('artist', ""),
-                filters.get('genre', ""),
-                per_page
-            )
+            with instrumentation.span("library.fetch_songs"):
+                songs, total_items = self._fetch_songs(
+                    page, 
+                    filters.get('title', ""),
+                    filters.get('artist', ""),
+                    filters.get('genre', ""),
+                    per_page,
+                    sort_by,
+                    descending
+                )
             
-            on_data_loaded(songs, total_items)
+            with instrumentation.span("library.deliver_songs"):
+                on_data_loaded(songs, total_items)
             on_status_message(
                 f"Mostrando página {page}. {len(songs)} canciones (de {total_items} encontradas)."
             )
@@ -54,11 +63,12 @@ class LibraryDataManager:
             error_msg = ErrorHandler.handle_loading_error(self._logger, e, page)
             on_status_message(error_msg)
 
-    def _fetch_songs(self, page: int, title: str, artist: str, genre: str, per_page: int):
-        """Obtener canciones aplicando filtros"""
+    def _fetch_songs(self, page: int, title: str, artist: str, genre: str, per_page: int,
+                     sort_by: str = "title", descending: bool = False):
+        """Obtener canciones aplicando filtros y ordenación"""
         if title or artist or genre:
-            return self.music_service.search_songs(title, artist, genre, page, per_page)
-        songs, _ = self.music_service.get_songs(page, per_page)
+            return self.music_service.search_songs(title, artist, genre, page, per_page, sort_by, descending)
+        songs, _ = self.music_service.get_songs(page, per_page, sort_by, descending)
         total = self.music_service.get_total_songs_count()
         return songs, total
 
@@ -68,14 +78,17 @@ class LibraryDataManager:
         self._logger.info("Circuit breaker error state reset")
         return "Estado de errores reiniciado. Puede intentar cargar datos nuevamente."
 
+    @timed("library.update_metadata")
     def update_library_metadata(self):
         """Obtener metadata actualizada de la biblioteca"""
         artists = self.music_service.get_distinct_artists()
         genres = self.music_service.get_distinct_genres()
-        total_songs = self.music_service.get_total_songs_count()
+        totals = self.music_service.get_library_stats()
         
         return {
-            'total_songs': total_songs,
+            'total_songs': totals['total_songs'],
+            'total_duration': totals['total_duration'],
+            'total_size': totals['total_size'],
             'artists': artists,
             'genres': genres,
             'years': []
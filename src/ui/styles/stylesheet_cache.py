@@ -0,0 +1,166 @@
+"""
+Caché de hojas de estilo QSS
+
+Las variantes renderizadas por MD3Theme.get_stylesheet se guardan en memoria
+y en disco (CACHE_DIR/styles/md3-<clave>.qss). La clave combina tema, hash
+de la paleta, familia de fuente y una huella de theme.py, de modo que
+cualquier cambio en la plantilla o en los colores invalida la variante.
+
+apply_stylesheet() solo llama a setStyleSheet cuando la variante aplicada al
+widget cambia: Qt vuelve a analizar la hoja y a repulir todo el árbol de
+widgets en cada llamada, aunque el texto sea idéntico.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.utils.config import config
+from .color_scheme import get_theme_colors
+from .theme import MD3Theme
+from ..config import UIConfig
+
+logger = logging.getLogger(__name__)
+
+# Propiedad Qt con la clave de la variante aplicada a un widget
+APPLIED_KEY_PROPERTY = "stylesheetKey"
+
+
+def _template_fingerprint() -> str:
+    """Huella del módulo que define la plantilla QSS"""
+    source = Path(__file__).with_name("theme.py")
+    try:
+        return hashlib.sha1(source.read_bytes()).hexdigest()[:12]
+    except OSError:
+        return "unknown"
+
+
+class StylesheetCache:
+    """Variantes de la hoja de estilos MD3 en memoria y en disco"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Inicializar caché
+
+        Args:
+            cache_dir: Directorio de las variantes en disco (None para solo memoria)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: Dict[str, str] = {}
+        self._fingerprint = _template_fingerprint()
+
+    def key(self, is_dark: bool, colors: Optional[dict] = None) -> str:
+        """
+        Clave de una variante
+
+        Args:
+            is_dark: Tema oscuro
+            colors: Paleta (por defecto la del tema)
+
+        Returns:
+            str: Hash corto de tema, paleta, fuente y plantilla
+        """
+        colors = colors if colors is not None else get_theme_colors(is_dark)
+        material = json.dumps([is_dark, colors, UIConfig.FONT_FAMILY, self._fingerprint],
+                              sort_keys=True)
+        return hashlib.sha1(material.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, is_dark: bool, colors: Optional[dict] = None) -> str:
+        """
+        Obtener una variante, renderizándola solo si no está en caché
+
+        Args:
+            is_dark: Tema oscuro
+            colors: Paleta (por defecto la del tema)
+
+        Returns:
+            str: Hoja de estilos QSS
+        """
+        key = self.key(is_dark, colors)
+        stylesheet = self._memory.get(key)
+        if stylesheet is not None:
+            return stylesheet
+
+        path = self._path(key)
+        if path is not None and path.exists():
+            try:
+                stylesheet = path.read_text(encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"Could not read cached stylesheet {path}: {e}")
+
+        if stylesheet is None:
+            stylesheet = MD3Theme.get_stylesheet(
+                colors=colors if colors is not None else get_theme_colors(is_dark), is_dark=is_dark
+            )
+            self._write(path, stylesheet)
+
+        self._memory[key] = stylesheet
+        return stylesheet
+
+    def prerender(self):
+        """Renderizar y guardar las variantes clara y oscura"""
+        for is_dark in (False, True):
+            self.get(is_dark)
+
+    def _path(self, key: str) -> Optional[Path]:
+        """Archivo de una variante en disco"""
+        return self.cache_dir / f"md3-{key}.qss" if self.cache_dir else None
+
+    @staticmethod
+    def _write(path: Optional[Path], stylesheet: str):
+        """Guardar una variante (los errores de disco no son fatales)"""
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(stylesheet, encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not write cached stylesheet {path}: {e}")
+
+
+def apply_stylesheet(widget, stylesheet: str, key: str) -> bool:
+    """
+    Aplicar una hoja de estilos a un widget si cambió su variante
+
+    Durante el cambio se desactivan las actualizaciones del widget para que
+    la repulida de sus hijos produzca un único repintado.
+
+    Args:
+        widget: Widget raíz (p. ej. la ventana principal)
+        stylesheet: Hoja de estilos QSS
+        key: Clave de la variante (StylesheetCache.key)
+
+    Returns:
+        bool: True si se aplicó, False si ya estaba aplicada
+    """
+    if widget.property(APPLIED_KEY_PROPERTY) == key:
+        return False
+    updates_enabled = widget.updatesEnabled()
+    widget.setUpdatesEnabled(False)
+    try:
+        widget.setStyleSheet(stylesheet)
+    finally:
+        widget.setUpdatesEnabled(updates_enabled)
+    widget.setProperty(APPLIED_KEY_PROPERTY, key)
+    return True
+
+
+def repolish(widget):
+    """
+    Repulir un único widget tras cambiar una propiedad usada en selectores
+
+    Alternativa acotada a volver a aplicar la hoja completa, p. ej. para
+    QPushButton#playbackButton[active="true"] (botón de aleatorio).
+    """
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
+
+# Caché global de la aplicación
+stylesheet_cache = StylesheetCache(str(Path(config.cache_dir) / "styles"))
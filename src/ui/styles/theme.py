@@ -93,7 +93,20 @@ class MD3Theme:
                 font-weight: 600;
                 font-size: 20px;
             }}
-            
+
+            /* Panel de diagnóstico */
+            QLabel#settingsTitle {{
+                color: {colors["primary"]};
+                font-weight: 600;
+                font-size: 20px;
+            }}
+
+            QLabel#settingsSection {{
+                color: {colors["on-surface-variant"]};
+                font-weight: 600;
+                padding-top: 12px;
+            }}
+
             /* Panel de reproducción */
             QFrame#playbackPanel {{
                 background-color: {colors["surface-variant"]};
@@ -151,7 +164,8 @@ class MD3Theme:
                 background-color: {colors["surface-variant"]};
             }}
 
-            QPushButton#playbackButton:checked {{
+            QPushButton#playbackButton:checked,
+            QPushButton#playbackButton[active="true"] {{
                 background-color: {colors["primary-container"]};
                 color: {colors["on-primary-container"]};
                 border-color: {colors["primary"]};
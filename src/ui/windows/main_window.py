@@ -3,17 +3,18 @@ Ventana principal con Material Design 3
 """
 
 import logging
+import threading
 import time
+from pathlib import Path
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout,
     QHBoxLayout, QStackedWidget, QMenuBar,
     QMenu, QStatusBar, QApplication, QMessageBox, QFileDialog
 )
-from PyQt6.QtCore import Qt, QSize, QEvent
+from PyQt6.QtCore import Qt, QSize, QEvent, QTimer
 from PyQt6.QtGui import QAction, QFontDatabase, QResizeEvent, QIcon
 
-from ..styles.theme import MD3Theme
-from ..styles.color_scheme import get_theme_colors
+from ..styles.stylesheet_cache import stylesheet_cache, apply_stylesheet
 from ..config import UIConfig
 from ..components.navigation_rail import NavigationRail
 from ..components.playback_panel import PlaybackPanel
@@ -21,28 +22,60 @@ from ..components.content_views.library_view import LibraryView
 from ..components.content_views.playlist_view import PlaylistView
 from ..components.content_views.settings_view import SettingsView
 from src.services.music_service import MusicService
-from src.services.audio_service import AudioService
+from src.services.album_art import AlbumArtCache
 from src.database.connection import DatabaseConnection, DatabaseConnectionError, DatabaseTimeoutError
 from src.views.base_view import BaseView
+from src.utils.config import config
 from src.utils.error_handler import ErrorHandler
+from src.utils.instrumentation import timed
+from src.utils.startup_profiler import startup_profiler
 from ..managers.library_data_manager import LibraryDataManager
+from ..managers.background_task import run_in_background
+from ..managers.album_art_loader import AlbumArtLoader
+
+# Clase del servicio de audio; se importa en el primer uso del reproductor
+# (MainWindow.audio_service) para no inicializar QtMultimedia en el arranque
+AudioService = None
 
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación"""
     
+    # Intervalo mínimo entre aplicaciones de escala durante un redimensionado (~1 frame)
+    RESIZE_COALESCE_MS = 16
+    
+    # Tamaños base escalados con la ventana: ancho del NavigationRail,
+    # alto del PlaybackPanel y tamaño de fuente de la aplicación
+    SCALED_SIZES = (280, 100, 12)
+    
     def __init__(self, db_connection: DatabaseConnection, parent=None):
         super().__init__(parent)
         
         # Servicios
         self.db = db_connection # Usar la conexión inyectada
         self.music_service = MusicService(self.db)
-        self.audio_service = AudioService(self)
+        self._audio_service = None
+        self.album_art_loader = AlbumArtLoader(
+            AlbumArtCache(str(Path(config.cache_dir) / "album_art")), parent=self)
+        
+        # Vistas que no se muestran al arrancar: se construyen en el primer acceso
+        self._playlist_view = None
+        self._settings_view = None
         
         # Estado
         self.current_scale = 1.0
+        self._applied_sizes = None  # Último (nav, panel, fuente) aplicado
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(self.RESIZE_COALESCE_MS)
+        self._resize_timer.timeout.connect(self.apply_pending_resize)
         self._force_exit = False  # Flag para control de salida
+        self._batch_cancel = threading.Event()  # Detiene los trabajos por lotes al cerrar
+        self._analysis_running = False
+        self._analysis_again = False  # Hubo importaciones durante el análisis
+        self._waveform_song_id = None  # Pista cuya forma de onda se ha pedido
         self._is_initial_loading = False # Flag para la carga inicial
         self.current_search_filters = {'title': '', 'artist': '', 'genre': ''} # Inicializar filtros
+        self.current_sort = {'sort_by': 'title', 'descending': False}
         
         # Logger y gestor de datos
         self._logger = ErrorHandler.setup_logging(__name__)
@@ -52,17 +85,21 @@ class MainWindow(QMainWindow):
         
         print("[MainWindow] Iniciando configuración...")
         self.init_ui()
+        startup_profiler.mark("interfaz construida")
         self.setup_theme()
+        startup_profiler.mark("tema aplicado")
+        # Dejar preparada en disco la otra variante para el cambio de tema
+        QTimer.singleShot(0, stylesheet_cache.prerender)
         
         # Establecer tamaño inicial
         self.resize(1280, 720)
         self.show()
+        startup_profiler.mark("ventana mostrada")
         
         print("[MainWindow] Configuración completada.")
-        # Cargar datos de la biblioteca para poblar NavigationRail y mostrar vista inicial
+        # Cargar datos de la biblioteca después del primer pintado y fuera del hilo principal
         self._is_initial_loading = True
-        self.load_library_data()
-        self._is_initial_loading = False
+        QTimer.singleShot(0, self.load_library_data_async)
 
     def init_ui(self):
         """Inicializar interfaz"""
@@ -110,19 +147,15 @@ class MainWindow(QMainWindow):
         
         # Vistas principales
         # Vista de biblioteca
-        self.library_view = LibraryView(audio_service=self.audio_service)
+        self.library_view = LibraryView(album_art_loader=self.album_art_loader)
+        self.library_view.view_changed.connect(self.on_library_view_mode_changed)
         self.library_view.search_changed.connect(self.on_search_changed)
         self.library_view.song_selection_changed.connect(self.on_song_selection_changed)
         self.library_view.song_double_clicked.connect(self.on_song_double_clicked)
         self.library_view.page_changed_requested.connect(self.on_library_page_changed)
+        self.library_view.sort_changed.connect(self.on_sort_changed)
         self.content_stack.addWidget(self.library_view)
         
-        self.playlist_view = PlaylistView()
-        self.content_stack.addWidget(self.playlist_view)
-        
-        self.settings_view = SettingsView()
-        self.content_stack.addWidget(self.settings_view)
-        
         content_layout.addWidget(self.content_stack)
         
         # Panel de reproducción
@@ -144,36 +177,75 @@ class MainWindow(QMainWindow):
         # Agregar al layout central
         self.centralWidget().layout().addWidget(container)
 
+    @property
+    def playlist_view(self) -> PlaylistView:
+        """Vista de playlists, construida en el primer acceso"""
+        if self._playlist_view is None:
+            print("[MainWindow] Construyendo PlaylistView...")
+            self._playlist_view = PlaylistView()
+            self.content_stack.addWidget(self._playlist_view)
+        return self._playlist_view
+    
+    @property
+    def settings_view(self) -> SettingsView:
+        """Vista de configuración, construida en el primer acceso"""
+        if self._settings_view is None:
+            print("[MainWindow] Construyendo SettingsView...")
+            self._settings_view = SettingsView(db_connection=self.db)
+            self.content_stack.addWidget(self._settings_view)
+        return self._settings_view
+    
+    @property
+    def audio_service(self):
+        """
+        Servicio de audio, creado en el primer uso del reproductor
+        
+        Importa QtMultimedia e inicializa el backend de QMediaPlayer, y conecta
+        sus señales con PlaybackPanel y LibraryView.
+        """
+        if self._audio_service is None:
+            global AudioService
+            if AudioService is None:
+                from src.services.audio_service import AudioService
+            print("[MainWindow] Inicializando AudioService...")
+            self._audio_service = AudioService(self, album_art_loader=self.album_art_loader)
+            self.connect_audio_service_signals()
+            self.library_view.set_audio_service(self._audio_service)
+        return self._audio_service
+    
     def setup_theme(self):
         """Configurar tema Material Design 3"""
         is_dark = UIConfig.is_dark_theme()
-        colors = get_theme_colors(is_dark)
-        self.setStyleSheet(MD3Theme.get_stylesheet(colors=colors, is_dark=is_dark))
+        stylesheet = stylesheet_cache.get(is_dark)
+        apply_stylesheet(self, stylesheet, stylesheet_cache.key(is_dark))
         
-        # Aplicar fuente del sistema a la aplicación
+        # Aplicar fuente del sistema a la aplicación (setFont relayouta toda la aplicación)
         app = QApplication.instance()
-        if app:
+        if app and app.font().family() != UIConfig.FONT_FAMILY:
             current_font = app.font()
             current_font.setFamily(UIConfig.FONT_FAMILY)
             app.setFont(current_font)
         
     def connect_playback_panel_signals(self):
-        """Conectar señales entre AudioService y PlaybackPanel."""
-        if not self.audio_service or not self.playback_panel:
-            print("[MainWindow] Error: AudioService o PlaybackPanel no inicializados para conectar señales.")
+        """Conectar acciones de PlaybackPanel con AudioService (creado en el primer uso)."""
+        if not self.playback_panel:
+            print("[MainWindow] Error: PlaybackPanel no inicializado para conectar señales.")
             return
 
         # Conectar acciones de PlaybackPanel a AudioService
         # Conectar controles básicos
-        self.playback_panel.play_requested.connect(self.audio_service.resume)
-        self.playback_panel.pause_requested.connect(self.audio_service.pause)
-        self.playback_panel.seek_requested.connect(self.audio_service.seek)
-        self.playback_panel.volume_change_requested.connect(self.audio_service.set_volume)
+        self.playback_panel.play_requested.connect(lambda: self.audio_service.resume())
+        self.playback_panel.pause_requested.connect(lambda: self.audio_service.pause())
+        self.playback_panel.seek_requested.connect(lambda position: self.audio_service.seek(position))
+        self.playback_panel.volume_change_requested.connect(
+            lambda volume: self.audio_service.set_volume(volume))
         
         # Conectar controles de navegación
-        self.playback_panel.previous_requested.connect(self.audio_service.play_previous)
-        self.playback_panel.next_requested.connect(self.audio_service.play_next)
+        self.playback_panel.previous_requested.connect(lambda: self.audio_service.play_previous())
+        self.playback_panel.next_requested.connect(lambda: self.audio_service.play_next())
 
+    def connect_audio_service_signals(self):
+        """Conectar señales de AudioService con PlaybackPanel y la barra de estado."""
         # Conectar señales de AudioService a slots de PlaybackPanel
         # Conectar señales de estado
         self.audio_service.playback_state_changed.connect(self.playback_panel.update_playback_state)
@@ -187,6 +259,9 @@ class MainWindow(QMainWindow):
         # Conectar error de audio a la status bar
         self.audio_service.error_occurred.connect(self.show_audio_error)
         
+        # Forma de onda precalculada de la pista actual
+        self.audio_service.current_song_changed.connect(self.load_waveform)
+        
     def create_menu_bar(self):
         """Crear barra de menú"""
         menubar = self.menuBar()
@@ -229,6 +304,18 @@ class MainWindow(QMainWindow):
         dark_action.setChecked(UIConfig.is_dark_theme())
         theme_menu.addAction(dark_action)
         
+        # Menú Herramientas
+        tools_menu = menubar.addMenu("&Herramientas")
+        
+        self.detect_bpm_action = QAction("Detectar &BPM", self)
+        self.detect_bpm_action.triggered.connect(self.detect_missing_bpm)
+        tools_menu.addAction(self.detect_bpm_action)
+        
+        analyze_action = QAction("&Analizar audio", self)
+        analyze_action.setToolTip("Calcular formas de onda y sonoridad pendientes")
+        analyze_action.triggered.connect(self.analyze_new_songs)
+        tools_menu.addAction(analyze_action)
+        
         # Menú Ayuda
         help_menu = menubar.addMenu("&Ayuda")
         
@@ -241,20 +328,14 @@ class MainWindow(QMainWindow):
         status_bar.showMessage("Listo")
         self.setStatusBar(status_bar)
     
+    @timed("ui.update_library")
     def update_library_filters_and_songs(self):
         """Actualiza los desplegables de filtros y recarga las canciones en LibraryView
            respetando los filtros y página actuales."""
         try:
             print("[MainWindow] Actualizando filtros de la biblioteca...")
             stats = self.library_manager.update_library_metadata()
-            self.library_view.update_filters(stats)
-
-            # Actualizar NavigationRail con iconos
-            if hasattr(self.nav_rail, 'update_library_stats'):
-                library_icon = QApplication.style().standardIcon(QApplication.style().StandardPixmap.SP_ComputerIcon)
-                playlist_icon = QApplication.style().standardIcon(QApplication.style().StandardPixmap.SP_DriveDVDIcon)
-                settings_icon = QApplication.style().standardIcon(QApplication.style().StandardPixmap.SP_FileDialogDetailedView)
-                self.nav_rail.update_library_stats(stats, library_icon, playlist_icon, settings_icon)
+            self.apply_library_stats(stats)
 
             # Recargar las canciones usando los filtros actuales y la página actual de LibraryView
             self._logger.info(f"Recargando canciones para la página: {self.library_view.current_page} con filtros: {self.current_search_filters}")
@@ -268,6 +349,51 @@ class MainWindow(QMainWindow):
             error_msg = ErrorHandler.handle_general_error(self._logger, e, "updating library filters")
             self.statusBar().showMessage(error_msg, 5000)
 
+    def load_library_data_async(self):
+        """Consultar la metadata de la biblioteca en segundo plano y aplicarla al terminar."""
+        startup_profiler.mark("primer pintado")
+        self._is_initial_loading = True
+        self.statusBar().showMessage(self.tr("Cargando biblioteca..."))
+        self._metadata_task = run_in_background(
+            self.library_manager.update_library_metadata,
+            on_finished=self._on_library_metadata_loaded,
+            on_failed=self._on_library_metadata_failed
+        )
+    
+    def _on_library_metadata_loaded(self, stats: dict):
+        """Aplicar la metadata cargada en segundo plano y cargar la primera página."""
+        startup_profiler.mark("metadata de biblioteca")
+        try:
+            self.apply_library_stats(stats)
+            self.load_songs_for_library_view(page=self.library_view.current_page)
+        except Exception as e:
+            error_msg = ErrorHandler.handle_general_error(self._logger, e, "loading initial library data")
+            self.statusBar().showMessage(error_msg, 5000)
+        finally:
+            self._is_initial_loading = False
+            startup_profiler.finish()
+    
+    def _on_library_metadata_failed(self, error: Exception):
+        """Informar del error de la carga en segundo plano."""
+        if isinstance(error, (DatabaseConnectionError, DatabaseTimeoutError)):
+            error_msg = ErrorHandler.handle_db_error(self._logger, error, "loading initial library data")
+        else:
+            error_msg = ErrorHandler.handle_general_error(self._logger, error, "loading initial library data")
+        self.statusBar().showMessage(error_msg, 5000)
+        self._is_initial_loading = False
+        startup_profiler.finish()
+
+    def apply_library_stats(self, stats: dict):
+        """Actualizar filtros de LibraryView y NavigationRail con la metadata de la biblioteca."""
+        self.library_view.update_filters(stats)
+
+        # Actualizar NavigationRail con iconos
+        if hasattr(self.nav_rail, 'update_library_stats'):
+            library_icon = QApplication.style().standardIcon(QApplication.style().StandardPixmap.SP_ComputerIcon)
+            playlist_icon = QApplication.style().standardIcon(QApplication.style().StandardPixmap.SP_DriveDVDIcon)
+            settings_icon = QApplication.style().standardIcon(QApplication.style().StandardPixmap.SP_FileDialogDetailedView)
+            self.nav_rail.update_library_stats(stats, library_icon, playlist_icon, settings_icon)
+
     def load_library_data(self):
         """Cargar datos iniciales de la biblioteca (filtros y primera página)."""
         try:
@@ -329,6 +455,96 @@ class MainWindow(QMainWindow):
         """Manejar solicitud de cambio de página desde LibraryView."""
         self.load_songs_for_library_view(page=page)
 
+    def on_sort_changed(self, sort_by: str, descending: bool):
+        """Manejar cambio de ordenación desde la tabla, cargar página 1."""
+        self.current_sort = {'sort_by': sort_by, 'descending': descending}
+        self.load_songs_for_library_view(page=1)
+
+    def on_library_view_mode_changed(self, mode: str):
+        """Cargar los álbumes en segundo plano al pasar a la cuadrícula."""
+        if mode != LibraryView.VIEW_GRID:
+            return
+        run_in_background(
+            self.music_service.get_albums,
+            on_finished=self.library_view.load_albums,
+            on_failed=lambda error: self.statusBar().showMessage(
+                f"Error al cargar los álbumes: {error}", 5000)
+        )
+
+    def detect_missing_bpm(self):
+        """Detectar en segundo plano el BPM de las canciones que no lo tienen."""
+        # NumPy y el pool de procesos solo se cargan al usar la herramienta
+        from src.services.bpm_detection import BpmDetectionJob
+        
+        self.detect_bpm_action.setEnabled(False)
+        self.statusBar().showMessage("Detectando BPM...")
+        run_in_background(
+            BpmDetectionJob(self.music_service.songs).run,
+            cancel=self._batch_cancel,
+            on_finished=self._on_bpm_detection_finished,
+            on_failed=self._on_bpm_detection_failed
+        )
+    
+    def _on_bpm_detection_finished(self, result):
+        self.detect_bpm_action.setEnabled(True)
+        self.statusBar().showMessage(
+            f"BPM detectado en {result.updated} de {result.processed} canciones"
+            f"{f' ({result.failed} con errores)' if result.failed else ''}", 5000)
+        if result.updated:
+            self.load_songs_for_library_view(self.library_view.current_page)
+    
+    def _on_bpm_detection_failed(self, error: Exception):
+        self.detect_bpm_action.setEnabled(True)
+        self.statusBar().showMessage(f"Error al detectar el BPM: {error}", 5000)
+    
+    def analyze_new_songs(self):
+        """Calcular en segundo plano formas de onda y sonoridad pendientes (tras importar)."""
+        if self._analysis_running:
+            self._analysis_again = True
+            return
+        # NumPy y el pool de procesos solo se cargan al analizar
+        from src.services.audio_analysis import AudioAnalysisJob
+        
+        self._analysis_running = True
+        self._analysis_again = False
+        # Una sola decodificación por archivo para la forma de onda y la sonoridad
+        job = AudioAnalysisJob(self.music_service.songs)
+        run_in_background(
+            job.run, cancel=self._batch_cancel,
+            on_finished=lambda result: self._on_analysis_finished(job),
+            on_failed=self._on_analysis_failed
+        )
+    
+    def _on_analysis_finished(self, job):
+        self._analysis_running = False
+        if job.waveforms_updated or job.loudness_updated:
+            self.statusBar().showMessage(
+                f"Audio analizado: {job.waveforms_updated} formas de onda, "
+                f"{job.loudness_updated} sonoridades", 5000)
+        if job.loudness_updated:
+            # Las filas cargadas aún no tienen la sonoridad para normalizar
+            self.load_songs_for_library_view(self.library_view.current_page)
+        if self._analysis_again and not self._batch_cancel.is_set():
+            self.analyze_new_songs()
+    
+    def _on_analysis_failed(self, error: Exception):
+        self._analysis_running = False
+        self.statusBar().showMessage(f"Error al analizar el audio: {error}", 5000)
+    
+    def load_waveform(self, song_data: dict):
+        """Leer en segundo plano la forma de onda de la pista actual."""
+        song_id = song_data.get('id') if song_data else None
+        # current_song_changed se repite al llegar metadatos de la misma pista
+        if song_id is None or song_id == self._waveform_song_id:
+            self._waveform_song_id = song_id
+            return
+        self._waveform_song_id = song_id
+        run_in_background(
+            self.music_service.get_waveform, song_id,
+            on_finished=lambda peaks: self.playback_panel.set_waveform(song_id, peaks)
+        )
+
+    @timed("ui.load_page")
     def load_songs_for_library_view(self, page: int):
         """Carga canciones en LibraryView para una página específica."""
         self.library_manager.load_songs(
@@ -336,7 +552,9 @@ class MainWindow(QMainWindow):
             filters=self.current_search_filters,
             per_page=self.library_view.items_per_page,
             on_data_loaded=lambda songs, total: self.library_view.load_songs(songs, total),
-            on_status_message=lambda msg: self.statusBar().showMessage(msg, 5000)
+            on_status_message=lambda msg: self.statusBar().showMessage(msg, 5000),
+            sort_by=self.current_sort['sort_by'],
+            descending=self.current_sort['descending']
         )
 
     def on_song_selection_changed(self, selected_songs: list[dict], selected_index: int):
@@ -377,6 +595,8 @@ class MainWindow(QMainWindow):
                 imported, failed = self.music_service.import_folder(folder_path)
                 self.statusBar().showMessage(self.tr(f"{imported} canciones importadas, {failed} fallaron."), 5000)
                 self.update_library_filters_and_songs()
+                if imported:
+                    self.analyze_new_songs()
             except FileNotFoundError as e:
                 QMessageBox.warning(self, self.tr("Error"), str(e))
                 self.statusBar().showMessage(self.tr(f"Error al importar: {e}"), 5000)
@@ -404,6 +624,8 @@ class MainWindow(QMainWindow):
                     5000
                 )
                 self.update_library_filters_and_songs()
+                if imported:
+                    self.analyze_new_songs()
             except Exception as e:
                 QMessageBox.critical(
                     self,
@@ -418,27 +640,37 @@ class MainWindow(QMainWindow):
         """Manejar cambio de tamaño de la ventana"""
         super().resizeEvent(event)
         
-        # Calcular nueva escala
-        width = event.size().width()
-        height = event.size().height()
-        self.current_scale = UIConfig.get_scale_factor(width, height)
-        
-        # Actualizar tamaños de componentes
+        # Coalescer los eventos de un arrastre: como mucho una aplicación de
+        # escala por frame, y siempre una con el tamaño final
+        if not self._resize_timer.isActive():
+            self._resize_timer.start()
+    
+    def apply_pending_resize(self):
+        """Aplicar la escala correspondiente al tamaño actual de la ventana"""
+        self._resize_timer.stop()
+        self.current_scale = UIConfig.get_scale_factor(self.width(), self.height())
         self.update_component_sizes()
         
     def update_component_sizes(self):
-        """Actualizar tamaños de componentes según escala"""
-        nav_width = UIConfig.scale_size(280, self.width(), self.height())
-        self.nav_rail.setFixedWidth(nav_width)
+        """Actualizar tamaños de componentes según escala (solo los que cambian)"""
+        sizes = UIConfig.scale_table(self.SCALED_SIZES, self.width(), self.height())
+        previous = self._applied_sizes or (None, None, None)
+        if sizes == previous:
+            return
+        nav_width, panel_height, font_size = sizes
         
-        self.playback_panel.setFixedHeight(UIConfig.scale_size(100, self.width(), self.height()))
+        if nav_width != previous[0]:
+            self.nav_rail.setFixedWidth(nav_width)
+        if panel_height != previous[1]:
+            self.playback_panel.setFixedHeight(panel_height)
         
-        font_size = UIConfig.scale_size(12, self.width(), self.height())
+        # setFont repule y relayouta todos los widgets de la aplicación
         app = QApplication.instance()
-        if app:
+        if app and font_size != previous[2]:
             current_font = app.font()
             current_font.setPointSize(font_size)
             app.setFont(current_font)
+        self._applied_sizes = sizes
 
     def show_audio_error(self, error_message: str):
         """Muestra un mensaje de error de audio en la barra de estado."""
@@ -474,8 +706,9 @@ class MainWindow(QMainWindow):
                 
         if self._force_exit:
             print("[MainWindow] Cerrando aplicación...")
-            if hasattr(self, 'audio_service') and self.audio_service:
-                self.audio_service.cleanup()
+            self._batch_cancel.set()
+            if self._audio_service:
+                self._audio_service.cleanup()
             event.accept()
         else:
             print("[MainWindow] Ignorando cierre no autorizado")
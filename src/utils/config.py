@@ -61,6 +61,11 @@ class Config:
         """Ruta para backups de base de datos"""
         return os.getenv('DATABASE_BACKUP_PATH', 'data/backups/')
     
+    @property
+    def cache_dir(self) -> str:
+        """Directorio de cachés en disco (hojas de estilo, carátulas...)"""
+        return os.getenv('CACHE_DIR', 'data/cache')
+    
     # Configuración de logging
     @property
     def log_level(self) -> str:
@@ -104,6 +109,57 @@ class Config:
         """Profiling activado"""
         return os.getenv('ENABLE_PROFILING', 'false').lower() == 'true'
     
+    @property
+    def stall_watchdog(self) -> bool:
+        """Detector de bloqueos del bucle de eventos activado"""
+        return os.getenv('STALL_WATCHDOG', 'false').lower() == 'true'
+    
+    @property
+    def stall_threshold_ms(self) -> float:
+        """Tiempo sin respuesta del hilo principal que se considera bloqueo"""
+        return float(os.getenv('STALL_THRESHOLD_MS', '200'))
+    
+    @property
+    def slow_query_log(self) -> bool:
+        """Registro de consultas lentas activado"""
+        return os.getenv('SLOW_QUERY_LOG', 'false').lower() == 'true'
+    
+    @property
+    def slow_query_log_file(self) -> str:
+        """Archivo del registro de consultas lentas"""
+        return os.getenv('SLOW_QUERY_LOG_FILE', 'logs/slow_queries.log')
+    
+    @property
+    def slow_query_threshold_ms(self) -> float:
+        """Duración a partir de la cual una consulta se considera lenta"""
+        return float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '100'))
+    
+    # Configuración del reproductor
+    @property
+    def player_crossfade(self) -> float:
+        """Duración del fundido cruzado entre pistas en segundos (0 = sin fundido)"""
+        return float(os.getenv('PLAYER_CROSSFADE', '0'))
+    
+    @property
+    def player_crossfade_curve(self) -> str:
+        """Curva del fundido cruzado: linear, equal_power o s_curve"""
+        return os.getenv('PLAYER_CROSSFADE_CURVE', 'equal_power').lower()
+    
+    @property
+    def player_read_ahead_seconds(self) -> float:
+        """Segundos de la siguiente pista que se leen por adelantado (0 = desactivado)"""
+        return float(os.getenv('PLAYER_READ_AHEAD_SECONDS', '10'))
+    
+    @property
+    def player_normalize(self) -> bool:
+        """Normalización de volumen por pista (ReplayGain / EBU R128) activada"""
+        return os.getenv('PLAYER_NORMALIZE', 'true').lower() == 'true'
+    
+    @property
+    def player_target_loudness(self) -> float:
+        """Sonoridad objetivo de la normalización en LUFS"""
+        return float(os.getenv('PLAYER_TARGET_LOUDNESS', '-18'))
+    
     # Configuración de seguridad
     @property
     def secret_key(self) -> str:
@@ -144,6 +200,7 @@ class Config:
         return {
             'database_path': self.database_path,
             'database_backup_path': self.database_backup_path,
+            'cache_dir': self.cache_dir,
             'log_level': self.log_level,
             'log_file': self.log_file,
             'theme': self.theme,
@@ -151,7 +208,17 @@ class Config:
             'window_width': self.window_width,
             'window_height': self.window_height,
             'debug': self.debug,
-            'enable_profiling': self.enable_profiling
+            'enable_profiling': self.enable_profiling,
+            'stall_watchdog': self.stall_watchdog,
+            'stall_threshold_ms': self.stall_threshold_ms,
+            'slow_query_log': self.slow_query_log,
+            'slow_query_log_file': self.slow_query_log_file,
+            'slow_query_threshold_ms': self.slow_query_threshold_ms,
+            'player_crossfade': self.player_crossfade,
+            'player_crossfade_curve': self.player_crossfade_curve,
+            'player_read_ahead_seconds': self.player_read_ahead_seconds,
+            'player_normalize': self.player_normalize,
+            'player_target_loudness': self.player_target_loudness
         }
 
 # Instancia global de configuración
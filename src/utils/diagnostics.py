@@ -0,0 +1,153 @@
+"""
+Métricas de diagnóstico de la aplicación
+
+Reúne en un único diccionario los datos que muestra el panel de
+diagnóstico: latencias de base de datos (histogramas de instrumentación),
+caché de sentencias preparadas, rendimiento de importación, paradas del
+bucle de eventos, memoria del proceso y tamaño de la biblioteca.
+
+collect() solo lee contadores ya calculados; la única consulta a la base de
+datos (el recuento de canciones) se repite cuando cambia el número de
+archivos importados o se invalida explícitamente.
+"""
+
+import logging
+import os
+import sys
+from typing import Callable, Optional
+
+from .instrumentation import Instrumentation, instrumentation
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Spans de DatabaseConnection cuyos percentiles se muestran
+DB_SPANS = ('db.query', 'db.write', 'db.iter_query', 'db.execute_many')
+
+# Spans de MusicService que cubren una importación completa
+IMPORT_SPANS = ('import.folder', 'import.files')
+
+# Histogramas del bucle de eventos de la interfaz (ms)
+EVENT_LOOP_STALL = 'ui.event_loop_stall'
+EVENT_LOOP_LAG = 'ui.event_loop_lag'
+
+
+def memory_usage() -> dict:
+    """
+    Memoria del proceso
+
+    Returns:
+        dict: rss_bytes (actual, solo Linux) y peak_rss_bytes (máximo);
+              None donde la plataforma no lo expone
+    """
+    rss = None
+    try:
+        with open("/proc/self/statm") as statm:
+            rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss está en KiB en Linux y en bytes en macOS
+        if sys.platform != "darwin":
+            peak *= 1024
+    return {'rss_bytes': rss, 'peak_rss_bytes': peak}
+
+
+class DiagnosticsCollector:
+    """Lector de métricas para el panel de diagnóstico"""
+
+    def __init__(self, db=None, registry: Instrumentation = instrumentation,
+                 count_songs: Optional[Callable[[], int]] = None):
+        """
+        Inicializar lector
+
+        Args:
+            db: DatabaseConnection de la aplicación (opcional)
+            registry: Registro de instrumentación
+            count_songs: Función que devuelve el tamaño de la biblioteca
+                         (por defecto SongRepository.get_total_songs_count)
+        """
+        self.db = db
+        self.registry = registry
+        if count_songs is None and db is not None:
+            count_songs = self._repository_count
+        self._count_songs = count_songs
+        self._library_size: Optional[int] = None
+        self._imported_at_count: Optional[int] = None
+
+    def _repository_count(self) -> int:
+        """Recuento de canciones a través del repositorio"""
+        from ..models.song import SongRepository
+        return SongRepository(self.db).get_total_songs_count()
+
+    def invalidate_library_size(self):
+        """Forzar un nuevo recuento de canciones en la próxima lectura"""
+        self._library_size = None
+
+    def library_size(self) -> Optional[int]:
+        """
+        Tamaño de la biblioteca
+
+        Returns:
+            Optional[int]: Número de canciones, o None si no hay origen de datos
+        """
+        if self._count_songs is None:
+            return None
+        imported = self.registry.counter('import.files_imported')
+        if self._library_size is None or imported != self._imported_at_count:
+            try:
+                self._library_size = self._count_songs()
+                self._imported_at_count = imported
+            except Exception as e:
+                logger.warning(f"Could not count songs for diagnostics: {e}")
+        return self._library_size
+
+    def import_throughput(self, histograms: dict, counters: dict) -> dict:
+        """
+        Rendimiento acumulado de las importaciones
+
+        Args:
+            histograms: Resúmenes de histogramas de snapshot()
+            counters: Contadores de snapshot()
+
+        Returns:
+            dict: files, failed, seconds y files_per_second
+        """
+        seconds = sum(histograms[name]['mean'] * histograms[name]['count']
+                      for name in IMPORT_SPANS if name in histograms) / 1000
+        files = counters.get('import.files_imported', 0)
+        return {
+            'files': files,
+            'failed': counters.get('import.files_failed', 0),
+            'seconds': seconds,
+            'files_per_second': files / seconds if seconds else 0.0,
+        }
+
+    def collect(self) -> dict:
+        """
+        Leer todas las métricas
+
+        Returns:
+            dict: Métricas agrupadas por sección
+        """
+        data = self.registry.snapshot()
+        histograms, counters = data['histograms'], data['counters']
+        slow_query_log = getattr(self.db, 'slow_query_log', None)
+        return {
+            'profiling': self.registry.enabled,
+            'db_latency': {name: histograms[name] for name in DB_SPANS if name in histograms},
+            'statement_cache': self.db.get_statement_cache_stats() if self.db is not None else None,
+            'slow_queries': slow_query_log.count if slow_query_log is not None else None,
+            'import': self.import_throughput(histograms, counters),
+            'event_loop': {name: histograms[name] for name in (EVENT_LOOP_STALL, EVENT_LOOP_LAG)
+                           if name in histograms},
+            'memory': memory_usage(),
+            'library_size': self.library_size(),
+        }
@@ -0,0 +1,263 @@
+"""
+Instrumentación de rutas críticas: spans, contadores e histogramas
+
+Uso:
+
+    from src.utils.instrumentation import instrumentation, timed
+
+    with instrumentation.span("import.extract"):
+        ...
+
+    @timed("repository.search")
+    def search(...):
+        ...
+
+    instrumentation.incr("import.files_imported")
+
+Los spans miden con time.perf_counter (monótono) y guardan la duración en
+milisegundos en un histograma con el nombre del span. Se activa con
+ENABLE_PROFILING=true; desactivada, span() devuelve un contexto vacío
+compartido y los decoradores solo comprueban un atributo antes de llamar
+a la función original.
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """
+    Distribución de valores (p. ej. duraciones en ms)
+
+    Conserva contadores exactos (n, suma, mínimo, máximo) y una ventana con
+    las últimas muestras para calcular percentiles con memoria acotada.
+    """
+
+    def __init__(self, window: int = 2048):
+        """
+        Inicializar histograma
+
+        Args:
+            window: Muestras recientes conservadas para los percentiles
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._samples = deque(maxlen=window)
+
+    def add(self, value: float):
+        """Registrar un valor"""
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._samples.append(value)
+
+    @property
+    def mean(self) -> float:
+        """Media de todos los valores registrados"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Percentil sobre las muestras recientes
+
+        Args:
+            percent: Percentil entre 0 y 100
+
+        Returns:
+            float: Valor del percentil (0.0 si no hay muestras)
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> dict:
+        """Resumen del histograma"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min or 0.0,
+            'max': self.max or 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class _NullSpan:
+    """Span vacío usado cuando la instrumentación está desactivada"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Span activo: mide su duración y la registra al salir"""
+
+    __slots__ = ('_registry', 'name', 'start', 'duration_ms')
+
+    def __init__(self, registry: 'Instrumentation', name: str):
+        self._registry = registry
+        self.name = name
+        self.start = 0.0
+        self.duration_ms = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+        self._registry.observe(self.name, self.duration_ms)
+        if exc_type is not None:
+            self._registry.incr(f"{self.name}.errors")
+        return False
+
+
+class Instrumentation:
+    """Registro de spans, contadores e histogramas"""
+
+    def __init__(self, enabled: bool = False):
+        """
+        Inicializar registro
+
+        Args:
+            enabled: Estado inicial
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def enable(self):
+        """Activar la instrumentación"""
+        self.enabled = True
+
+    def disable(self):
+        """Desactivar la instrumentación (los datos recogidos se conservan)"""
+        self.enabled = False
+
+    def span(self, name: str):
+        """
+        Context manager que mide un bloque de código
+
+        Args:
+            name: Nombre del span (y del histograma de duraciones en ms)
+
+        Returns:
+            Span activo, o un span vacío si la instrumentación está desactivada
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """
+        Decorador que mide cada llamada a una función
+
+        Args:
+            name: Nombre del span (por defecto módulo.función)
+
+        Returns:
+            Callable: Decorador
+        """
+        def decorator(func):
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def incr(self, name: str, value: int = 1):
+        """Incrementar un contador"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float):
+        """Registrar un valor en un histograma"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(value)
+
+    def counter(self, name: str) -> int:
+        """Valor actual de un contador"""
+        return self._counters.get(name, 0)
+
+    def histogram(self, name: str) -> Optional[Histogram]:
+        """Histograma registrado con ese nombre, si existe"""
+        return self._histograms.get(name)
+
+    def snapshot(self) -> dict:
+        """
+        Copia de todos los datos recogidos
+
+        Returns:
+            dict: {'counters': {...}, 'histograms': {nombre: resumen}}
+        """
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {name: hist.to_dict() for name, hist in self._histograms.items()},
+            }
+
+    def reset(self):
+        """Descartar todos los datos recogidos"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def report(self) -> str:
+        """
+        Resumen legible de los datos recogidos
+
+        Returns:
+            str: Una línea por histograma y por contador
+        """
+        data = self.snapshot()
+        lines = [f"{'span':<40} {'n':>7} {'media':>9} {'p95':>9} {'max':>9}  (ms)"]
+        for name, hist in sorted(data['histograms'].items()):
+            lines.append(f"{name:<40} {hist['count']:>7} {hist['mean']:>9.2f} "
+                         f"{hist['p95']:>9.2f} {hist['max']:>9.2f}")
+        for name, value in sorted(data['counters'].items()):
+            lines.append(f"{name:<40} {value:>7}")
+        return "\n".join(lines)
+
+
+# Registro global de la aplicación
+instrumentation = Instrumentation(enabled=config.enable_profiling)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorador que mide cada llamada con el registro global (ver Instrumentation.timed)"""
+    return instrumentation.timed(name)
@@ -0,0 +1,172 @@
+"""
+Detector de bloqueos del bucle de eventos de Qt
+
+Un temporizador del hilo principal llama a beat() cada heartbeat_ms. Un hilo
+de vigilancia comprueba cuánto hace del último latido; si supera el umbral,
+el hilo principal está bloqueado dentro de algún slot, así que se captura su
+pila con sys._current_frames() y se registra junto con el slot que la
+originó (el marco más externo del código de la aplicación).
+
+Cuando el latido vuelve, la duración total de la parada se registra en el
+histograma ui.event_loop_stall de la instrumentación.
+
+Uso:
+
+    watchdog = StallWatchdog(threshold_ms=200)
+    watchdog.attach_qt(app)   # crea el QTimer del latido
+    watchdog.start()
+"""
+
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from .diagnostics import EVENT_LOOP_STALL
+from .instrumentation import Instrumentation, instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Raíz del código de la aplicación (src/) para identificar el slot
+SOURCE_ROOT = Path(__file__).resolve().parent.parent
+
+
+class Stall(NamedTuple):
+    """Parada del bucle de eventos"""
+    slot: str
+    duration_ms: float
+    stack: List[str]
+
+
+def _frame_name(frame) -> str:
+    """Nombre cualificado de la función de un marco (Clase.método)"""
+    code = frame.f_code
+    return getattr(code, 'co_qualname', code.co_name)
+
+
+class StallWatchdog:
+    """Vigilante de la latencia del hilo principal"""
+
+    def __init__(self, threshold_ms: float = 200.0, heartbeat_ms: int = 50,
+                 registry: Instrumentation = instrumentation,
+                 source_root: Path = SOURCE_ROOT, keep_recent: int = 50):
+        """
+        Inicializar vigilante
+
+        Args:
+            threshold_ms: Tiempo sin latido a partir del cual se captura la pila
+            heartbeat_ms: Intervalo del latido del hilo principal
+            registry: Registro de instrumentación para el histograma de paradas
+            source_root: Directorio cuyo código se considera "de la aplicación"
+            keep_recent: Paradas recientes conservadas en memoria
+        """
+        self.threshold_ms = threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.registry = registry
+        self.source_root = str(Path(source_root).resolve())
+        self.recent = deque(maxlen=keep_recent)
+        self.main_thread_id = threading.main_thread().ident
+        self._last_beat = time.perf_counter()
+        self._pending: Optional[tuple] = None  # (slot, pila) de la parada en curso
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._timer = None
+
+    def attach_qt(self, parent):
+        """
+        Crear el QTimer que emite el latido en el hilo principal
+
+        Args:
+            parent: QObject propietario del temporizador (p. ej. QApplication)
+        """
+        from PyQt6.QtCore import QTimer
+        self._timer = QTimer(parent)
+        self._timer.setInterval(self.heartbeat_ms)
+        self._timer.timeout.connect(self.beat)
+        self._timer.start()
+
+    def start(self):
+        """Iniciar el hilo de vigilancia"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._last_beat = time.perf_counter()
+        self._thread = threading.Thread(target=self._monitor, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Stall watchdog started (threshold {self.threshold_ms} ms)")
+
+    def stop(self):
+        """Detener el vigilante y el latido"""
+        if self._timer is not None:
+            self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def beat(self):
+        """
+        Latido del hilo principal
+
+        Mide el retraso desde el latido anterior y, si superó el umbral,
+        registra la parada con la pila capturada durante el bloqueo.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            stalled_ms = self._stalled_ms(now)
+            self._last_beat = now
+            pending, self._pending = self._pending, None
+        if stalled_ms < self.threshold_ms:
+            return
+
+        slot, stack = pending if pending else ("<desconocido>", [])
+        stall = Stall(slot, stalled_ms, stack)
+        self.recent.append(stall)
+        self.registry.observe(EVENT_LOOP_STALL, stalled_ms)
+        logger.warning(f"Event loop stalled {stalled_ms:.0f} ms in {slot}")
+
+    def _stalled_ms(self, now: float) -> float:
+        """Retraso del latido: tiempo desde el anterior menos el intervalo esperado"""
+        return (now - self._last_beat) * 1000 - self.heartbeat_ms
+
+    def _monitor(self):
+        """Bucle del hilo de vigilancia"""
+        poll = max(0.005, self.threshold_ms / 4000)
+        while not self._stop.wait(poll):
+            with self._lock:
+                if self._stalled_ms(time.perf_counter()) < self.threshold_ms or self._pending is not None:
+                    continue
+                frame = sys._current_frames().get(self.main_thread_id)
+                if frame is None:
+                    continue
+                slot, stack = self.find_slot(frame), traceback.format_stack(frame)
+                self._pending = (slot, stack)
+            logger.warning(f"Event loop blocked > {self.threshold_ms:.0f} ms in {slot}; "
+                           f"main thread stack:\n{''.join(stack)}")
+
+    def find_slot(self, frame) -> str:
+        """
+        Slot que originó el bloqueo
+
+        Es el marco más externo dentro de source_root: por debajo de él solo
+        está el bucle de eventos (app.exec) que lo invocó.
+
+        Args:
+            frame: Marco actual del hilo principal
+
+        Returns:
+            str: archivo:línea Clase.método del slot
+        """
+        slot = frame
+        current = frame
+        while current is not None:
+            if current.f_code.co_filename.startswith(self.source_root):
+                slot = current
+            current = current.f_back
+        return (f"{Path(slot.f_code.co_filename).name}:{slot.f_lineno} "
+                f"{_frame_name(slot)}")
@@ -0,0 +1,75 @@
+"""
+Informe de tiempos del arranque (--profile-startup)
+
+main.py fija el instante inicial antes de sus imports pesados y cada fase
+del arranque se marca con mark(); finish() imprime el informe una vez que
+la biblioteca ha terminado de cargarse.
+
+    [Startup] fase                          desde inicio    duración
+    [Startup] imports                            310.2 ms    310.2 ms
+    [Startup] migraciones                        318.9 ms      8.7 ms
+    ...
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+
+class StartupProfiler:
+    """Marcas de tiempo de las fases del arranque"""
+
+    def __init__(self, enabled: bool = False):
+        """
+        Inicializar perfilador
+
+        Args:
+            enabled: Imprimir el informe al terminar el arranque
+        """
+        self.enabled = enabled
+        self.start_time = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.finished = False
+
+    def start(self, start_time: Optional[float] = None):
+        """
+        Activar el perfilador y fijar el instante inicial
+
+        Args:
+            start_time: Valor de time.perf_counter() al inicio del proceso
+        """
+        self.enabled = True
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.marks.clear()
+        self.finished = False
+
+    def mark(self, stage: str):
+        """Registrar el fin de una fase"""
+        if self.enabled and not self.finished:
+            self.marks.append((stage, time.perf_counter()))
+
+    def report(self) -> str:
+        """
+        Informe legible de las fases
+
+        Returns:
+            str: Una línea por fase con el tiempo acumulado y el de la fase
+        """
+        lines = [f"[Startup] {'fase':<32} {'desde inicio':>12} {'duración':>10}"]
+        previous = self.start_time
+        for stage, moment in self.marks:
+            lines.append(f"[Startup] {stage:<32} {(moment - self.start_time) * 1000:>9.1f} ms "
+                         f"{(moment - previous) * 1000:>7.1f} ms")
+            previous = moment
+        return "\n".join(lines)
+
+    def finish(self, stage: str = "arranque completo"):
+        """Marcar la última fase e imprimir el informe (solo la primera vez)"""
+        if not self.enabled or self.finished:
+            return
+        self.mark(stage)
+        self.finished = True
+        print(self.report())
+
+
+# Perfilador global del arranque
+startup_profiler = StartupProfiler()
@@ -0,0 +1,303 @@
+"""
+Generador de bibliotecas musicales sintéticas para pruebas de rendimiento
+
+Produce de forma reproducible (misma semilla, mismo resultado):
+
+- Canciones con una distribución realista: pocos artistas con muchos
+  álbumes y una cola larga de artistas con uno solo, álbumes de 8 a 16
+  pistas y un conjunto reducido de géneros.
+- Una base de datos poblada directamente con SongRepository.add_many.
+- Un árbol de directorios con archivos de audio diminutos pero válidos
+  (WAV, FLAC, MP3 y M4A) etiquetados con mutagen, sin depender de ffmpeg.
+"""
+
+import bisect
+import itertools
+import logging
+import random
+import struct
+import wave
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+from mutagen.easyid3 import EasyID3
+from mutagen.easymp4 import EasyMP4
+from mutagen.flac import FLAC
+from mutagen.id3 import TALB, TBPM, TCON, TIT2, TPE1
+from mutagen.mp3 import MP3
+from mutagen.wave import WAVE
+
+from ..models.song import Song, SongRepository
+
+logger = logging.getLogger(__name__)
+
+GENRES = (
+    "Rock", "Pop", "Electronic", "House", "Techno", "Hip Hop", "Jazz", "Blues",
+    "Classical", "Reggae", "Metal", "Folk", "Soul", "Funk", "Ambient", "Latin",
+    "Country", "Drum & Bass", "Trance", "Indie",
+)
+
+WORDS = (
+    "Midnight", "Electric", "Golden", "Silent", "Broken", "Neon", "Velvet", "Wild",
+    "Crystal", "Hollow", "Burning", "Distant", "Lost", "Blue", "Northern", "Paper",
+    "Echo", "River", "Dream", "Heart", "Shadow", "Light", "City", "Ocean", "Fire",
+    "Road", "Signal", "Garden", "Storm", "Mirror", "Summer", "Machine", "Ghost",
+    "Love", "Sky", "Night", "Wave", "Stone", "Rain", "Star",
+)
+
+AUDIO_FORMATS = (".mp3", ".flac", ".m4a", ".wav")
+
+SAMPLE_RATE = 44100
+
+
+def _atom(name: bytes, payload: bytes = b"") -> bytes:
+    """Átomo MP4: tamaño, tipo y contenido"""
+    return struct.pack(">I4s", 8 + len(payload), name) + payload
+
+
+def _full_atom(name: bytes, payload: bytes, flags: int = 0) -> bytes:
+    """Átomo MP4 con versión (0) y flags"""
+    return _atom(name, struct.pack(">I", flags) + payload)
+
+
+def _m4a_template() -> bytes:
+    """
+    Contenedor M4A mínimo: ftyp + moov con una pista AAC de un segundo sin muestras
+
+    Es lo justo para que mutagen reconozca la pista de audio y pueda
+    escribir las etiquetas en moov/udta/meta/ilst.
+    """
+    matrix = struct.pack(">9I", 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+    duration = SAMPLE_RATE
+    mvhd = _full_atom(b"mvhd", struct.pack(">IIII", 0, 0, SAMPLE_RATE, duration)
+                      + struct.pack(">IH", 0x10000, 0x100) + b"\0" * 10
+                      + matrix + b"\0" * 24 + struct.pack(">I", 2))
+    tkhd = _full_atom(b"tkhd", struct.pack(">IIIII", 0, 0, 1, 0, duration) + b"\0" * 8
+                      + struct.pack(">HHHH", 0, 0, 0x100, 0) + matrix
+                      + struct.pack(">II", 0, 0), flags=7)
+    mdhd = _full_atom(b"mdhd", struct.pack(">IIII", 0, 0, SAMPLE_RATE, duration)
+                      + struct.pack(">HH", 0x55C4, 0))
+    hdlr = _full_atom(b"hdlr", struct.pack(">I4s", 0, b"soun") + b"\0" * 13)
+    # Descriptor ES: AAC LC (0x40), 128 kbps, 44.1 kHz estéreo
+    esds = _full_atom(b"esds", bytes([
+        0x03, 0x19, 0x00, 0x01, 0x00,
+        0x04, 0x11, 0x40, 0x15, 0x00, 0x00, 0x00,
+        0x00, 0x01, 0xF4, 0x00, 0x00, 0x01, 0xF4, 0x00,
+        0x05, 0x02, 0x12, 0x10,
+        0x06, 0x01, 0x02,
+    ]))
+    mp4a = _atom(b"mp4a", b"\0" * 6 + struct.pack(">H", 1) + b"\0" * 8
+                 + struct.pack(">HHHHI", 2, 16, 0, 0, SAMPLE_RATE << 16) + esds)
+    stbl = _atom(b"stbl", _full_atom(b"stsd", struct.pack(">I", 1) + mp4a)
+                 + _full_atom(b"stts", struct.pack(">I", 0))
+                 + _full_atom(b"stsc", struct.pack(">I", 0))
+                 + _full_atom(b"stsz", struct.pack(">II", 0, 0))
+                 + _full_atom(b"stco", struct.pack(">I", 0)))
+    dinf = _atom(b"dinf", _full_atom(b"dref", struct.pack(">I", 1) + _full_atom(b"url ", b"", flags=1)))
+    minf = _atom(b"minf", _full_atom(b"smhd", b"\0" * 4) + dinf + stbl)
+    trak = _atom(b"trak", tkhd + _atom(b"mdia", mdhd + hdlr + minf))
+    ftyp = _atom(b"ftyp", b"M4A " + struct.pack(">I", 0) + b"M4A mp42isom")
+    return ftyp + _atom(b"moov", mvhd + trak) + _atom(b"mdat")
+
+
+def _flac_template() -> bytes:
+    """Cabecera FLAC mínima: marca fLaC y bloque STREAMINFO (último bloque)"""
+    channels, bits_per_sample, total_samples = 2, 16, 0
+    packed = (SAMPLE_RATE << 44) | ((channels - 1) << 41) | ((bits_per_sample - 1) << 36) | total_samples
+    streaminfo = struct.pack(">HH", 4096, 4096) + b"\0" * 6 + packed.to_bytes(8, "big") + b"\0" * 16
+    return b"fLaC" + bytes([0x80]) + len(streaminfo).to_bytes(3, "big") + streaminfo
+
+
+def _mp3_template(frames: int = 10) -> bytes:
+    """Tramas MPEG-1 Layer III en silencio (128 kbps, 44.1 kHz, 417 bytes cada una)"""
+    frame = bytes([0xFF, 0xFB, 0x90, 0x64]) + b"\0" * 413
+    return frame * frames
+
+
+_TEMPLATES = {
+    ".flac": _flac_template(),
+    ".mp3": _mp3_template(),
+    ".m4a": _m4a_template(),
+}
+
+
+def write_audio_file(path: Path, song: Song):
+    """
+    Escribir un archivo de audio diminuto y válido con las etiquetas de song
+
+    El formato se deduce de la extensión de path.
+
+    Args:
+        path: Ruta de destino (.mp3, .flac, .m4a o .wav)
+        song: Canción cuyos metadatos se escriben como etiquetas
+
+    Raises:
+        ValueError: Si la extensión no está soportada
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".wav":
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(b"\0" * 4 * (SAMPLE_RATE // 100))
+        audio = WAVE(path)
+        audio.add_tags()
+        audio.tags.add(TIT2(encoding=3, text=song.title))
+        audio.tags.add(TPE1(encoding=3, text=song.artist))
+        audio.tags.add(TALB(encoding=3, text=song.album))
+        audio.tags.add(TCON(encoding=3, text=song.genre))
+        if song.bpm is not None:
+            audio.tags.add(TBPM(encoding=3, text=str(song.bpm)))
+        audio.save()
+        return
+
+    if suffix not in _TEMPLATES:
+        raise ValueError(f"Formato de audio no soportado: {suffix}")
+    path.write_bytes(_TEMPLATES[suffix])
+
+    if suffix == ".mp3":
+        audio = MP3(path, ID3=EasyID3)
+        audio.add_tags()
+    elif suffix == ".flac":
+        audio = FLAC(path)
+        audio.add_tags()
+    else:
+        audio = EasyMP4(path)
+    audio["title"] = song.title
+    audio["artist"] = song.artist
+    audio["album"] = song.album
+    audio["genre"] = song.genre
+    if song.bpm is not None:
+        audio["bpm"] = str(song.bpm)
+    audio.save()
+
+
+class SyntheticLibrary:
+    """Generador reproducible de canciones, bases de datos y árboles de archivos"""
+
+    def __init__(self, seed: int = 0, songs_per_artist: int = 40):
+        """
+        Inicializar generador
+
+        Args:
+            seed: Semilla del generador aleatorio
+            songs_per_artist: Canciones por artista en promedio
+        """
+        self.seed = seed
+        self.songs_per_artist = songs_per_artist
+
+    def songs(self, count: int, root: str = "/music",
+              formats: Sequence[str] = AUDIO_FORMATS) -> Iterator[Song]:
+        """
+        Generar canciones sintéticas agrupadas por álbum
+
+        La popularidad de los artistas sigue una ley de Zipf, de modo que
+        unos pocos artistas concentran muchos álbumes. Las rutas son únicas:
+        root/Artista/Álbum/NN Título.ext
+
+        Args:
+            count: Número de canciones
+            root: Directorio raíz de las rutas generadas
+            formats: Extensiones que se reparten entre las canciones
+
+        Yields:
+            Song: Canciones sin id
+        """
+        rng = random.Random(self.seed)
+        artist_count = max(1, count // self.songs_per_artist)
+        cum_weights = list(itertools.accumulate(1.0 / rank for rank in range(1, artist_count + 1)))
+        artist_names = {}
+
+        produced = 0
+        for album_index in itertools.count():
+            if produced >= count:
+                return
+            artist_index = bisect.bisect(cum_weights, rng.random() * cum_weights[-1])
+            artist_index = min(artist_index, artist_count - 1)
+            artist = artist_names.get(artist_index)
+            if artist is None:
+                artist = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {artist_index:05d}"
+                artist_names[artist_index] = artist
+            album = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {album_index:06d}"
+            genre = rng.choice(GENRES)
+            album_bpm = rng.randrange(70, 180)
+            extension = rng.choice(formats)
+            for track in range(1, min(rng.randint(8, 16), count - produced) + 1):
+                title = f"{rng.choice(WORDS)} {rng.choice(WORDS)}"
+                bpm = album_bpm + rng.randint(-10, 10) if rng.random() < 0.7 else None
+                yield Song(
+                    id=None,
+                    title=title,
+                    artist=artist,
+                    album=album,
+                    genre=genre,
+                    bpm=bpm,
+                    file_path=f"{root}/{artist}/{album}/{track:02d} {title}{extension}",
+                )
+                produced += 1
+
+    def seed_repository(self, repository: SongRepository, count: int,
+                        batch_size: int = 10000) -> int:
+        """
+        Poblar la base de datos con canciones sintéticas
+
+        Las canciones se insertan por lotes con SongRepository.add_many, cada
+        uno en su propia transacción, así que la memoria no crece con count.
+
+        Args:
+            repository: Repositorio de canciones destino
+            count: Número de canciones
+            batch_size: Canciones por transacción
+
+        Returns:
+            int: Número de canciones insertadas
+        """
+        inserted = 0
+        songs = self.songs(count)
+        while True:
+            batch = list(itertools.islice(songs, batch_size))
+            if not batch:
+                break
+            inserted += repository.add_many(batch)
+            logger.debug(f"Seeded {inserted}/{count} synthetic songs")
+        return inserted
+
+    def write_tree(self, root: Path, count: int, depth: int = 2, fan_out: int = 4,
+                   formats: Sequence[str] = AUDIO_FORMATS) -> List[Path]:
+        """
+        Crear un árbol de directorios con archivos de audio etiquetados
+
+        Se crean fan_out subdirectorios por nivel hasta depth niveles y los
+        archivos se reparten entre los directorios hoja.
+
+        Args:
+            root: Directorio raíz (se crea si no existe)
+            count: Número de archivos
+            depth: Niveles de subdirectorios (0 para escribir en root)
+            fan_out: Subdirectorios por directorio
+            formats: Extensiones de los archivos
+
+        Returns:
+            List[Path]: Rutas de los archivos creados
+
+        Raises:
+            ValueError: Si depth > 0 y fan_out < 1 (no habría directorios hoja)
+        """
+        if depth > 0 and fan_out < 1:
+            raise ValueError(f"fan_out debe ser al menos 1 con depth={depth}: {fan_out}")
+        root = Path(root)
+        leaves = [
+            root.joinpath(*(f"dir_{level}_{index:03d}" for level, index in enumerate(indices)))
+            for indices in itertools.product(range(fan_out), repeat=depth)
+        ]
+        for leaf in leaves:
+            leaf.mkdir(parents=True, exist_ok=True)
+
+        paths = []
+        for number, song in enumerate(self.songs(count, formats=formats)):
+            file_path = song.file_path
+            path = leaves[number % len(leaves)] / f"{number:07d} {file_path.stem}{file_path.suffix}"
+            write_audio_file(path, song)
+            paths.append(path)
+        return paths
@@ -0,0 +1,72 @@
+"""
+Fixtures de la suite de rendimiento
+
+Las bibliotecas se generan con SyntheticLibrary (semilla fija) una sola vez
+por sesión y tamaño, de modo que todas las mediciones parten de los mismos
+datos y son comparables entre ejecuciones.
+"""
+
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import SongRepository
+from src.utils.synthetic_library import SyntheticLibrary
+
+# Archivos de audio de los benchmarks de escaneo e importación
+FILE_COUNTS = (100, 1000)
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrizar library_size con los tamaños de --library-sizes"""
+    if "library_size" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--library-sizes").split(",") if size]
+        metafunc.parametrize("library_size", sizes, ids=[f"{size}songs" for size in sizes])
+    if "file_count" in metafunc.fixturenames:
+        metafunc.parametrize("file_count", FILE_COUNTS, ids=[f"{count}files" for count in FILE_COUNTS])
+
+
+@pytest.fixture(scope="session")
+def library_databases(tmp_path_factory):
+    """Bases de datos sintéticas por tamaño, creadas bajo demanda"""
+    databases = {}
+
+    def get(size: int) -> DatabaseConnection:
+        if size not in databases:
+            db = DatabaseConnection(str(tmp_path_factory.mktemp("bench_db") / f"library_{size}.db"))
+            MigrationManager(db).run_migrations()
+            SyntheticLibrary(seed=0).seed_repository(SongRepository(db), size)
+            db.execute_insert_update_delete("ANALYZE")
+            databases[size] = db
+        return databases[size]
+
+    yield get
+    for db in databases.values():
+        db.close()
+
+
+@pytest.fixture
+def repository(library_databases, library_size):
+    """Repositorio sobre la biblioteca sintética del tamaño actual"""
+    return SongRepository(library_databases(library_size))
+
+
+@pytest.fixture(scope="session")
+def audio_trees(tmp_path_factory):
+    """Árboles de archivos de audio sintéticos por número de archivos"""
+    trees = {}
+
+    def get(count: int):
+        if count not in trees:
+            root = tmp_path_factory.mktemp("bench_music") / f"music_{count}"
+            SyntheticLibrary(seed=0).write_tree(root, count, depth=2, fan_out=4)
+            trees[count] = root
+        return trees[count]
+
+    return get
+
+
+@pytest.fixture
+def audio_tree(audio_trees, file_count):
+    """Directorio con file_count archivos de audio etiquetados"""
+    return audio_trees(file_count)
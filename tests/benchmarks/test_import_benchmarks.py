@@ -0,0 +1,49 @@
+"""
+Benchmarks del escaneo de carpetas, la extracción de metadatos y la importación
+"""
+
+from itertools import count
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.services.metadata_extractor import MetadataExtractor
+from src.services.music_service import MusicService
+from src.utils.file_scanner import FileScanner
+from src.utils.synthetic_library import AUDIO_FORMATS, SyntheticLibrary
+
+
+def test_file_scanner_scan(benchmark, audio_tree, file_count):
+    """Recorrido recursivo de un árbol de carpetas"""
+    benchmark.group = "scan"
+    files = benchmark(FileScanner().scan, str(audio_tree))
+    assert len(files) == file_count
+
+
+@pytest.mark.parametrize("extension", AUDIO_FORMATS)
+def test_metadata_extract(benchmark, tmp_path, extension):
+    """Lectura de etiquetas de un archivo por formato"""
+    benchmark.group = "extract"
+    path = SyntheticLibrary(seed=0).write_tree(tmp_path, 1, depth=0, formats=(extension,))[0]
+    song = benchmark(MetadataExtractor().extract, path)
+    assert song is not None
+
+
+def test_import_folder(benchmark, tmp_path, audio_tree, file_count):
+    """Importación completa de una carpeta sobre una base de datos vacía"""
+    benchmark.group = "import_folder"
+    rounds = count()
+
+    def setup():
+        db = DatabaseConnection(str(tmp_path / f"import_{next(rounds)}.db"))
+        MigrationManager(db).run_migrations()
+        return (MusicService(db), str(audio_tree)), {}
+
+    imported, failed = benchmark.pedantic(
+        lambda service, folder: service.import_folder(folder),
+        setup=setup, rounds=3, iterations=1
+    )
+    assert (imported, failed) == (file_count, 0)
@@ -0,0 +1,47 @@
+"""
+Benchmarks de las consultas de SongRepository
+"""
+
+from itertools import product
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+FILTER_VALUES = {"title": "night", "artist": "echo", "genre": "rock"}
+FILTER_COMBINATIONS = [
+    {field: FILTER_VALUES[field] for field, active in zip(FILTER_VALUES, actives) if active}
+    for actives in product((False, True), repeat=3)
+]
+
+
+@pytest.mark.parametrize(
+    "filters", FILTER_COMBINATIONS,
+    ids=["+".join(filters) or "none" for filters in FILTER_COMBINATIONS]
+)
+def test_search(benchmark, repository, filters):
+    """Búsqueda paginada (conteo + primera página) por combinación de filtros"""
+    benchmark.group = "search"
+    songs, total = benchmark(repository.search, **filters)
+    assert len(songs) <= 50 and total >= len(songs)
+
+
+@pytest.mark.parametrize("sort_by", ["title", "date_added"])
+def test_get_all_deep_offset(benchmark, repository, library_size, sort_by):
+    """Última página de la biblioteca, el peor caso de LIMIT/OFFSET"""
+    benchmark.group = "get_all_deep_offset"
+    last_page = repository.get_total_pages(per_page=50)
+    songs = benchmark(repository.get_all, page=last_page, per_page=50, sort_by=sort_by)
+    assert len(songs) == library_size - (last_page - 1) * 50
+
+
+def test_get_distinct_artists(benchmark, repository):
+    """Lista de artistas para los filtros"""
+    benchmark.group = "distinct"
+    assert benchmark(repository.get_distinct_artists)
+
+
+def test_get_distinct_genres(benchmark, repository):
+    """Lista de géneros para los filtros"""
+    benchmark.group = "distinct"
+    assert benchmark(repository.get_distinct_genres)
@@ -11,6 +11,34 @@ from pathlib import Path
 root_dir = Path(__file__).parent.parent
 sys.path.append(str(root_dir))
 
+BENCHMARKS_DIR = root_dir / "tests" / "benchmarks"
+
+
+def pytest_addoption(parser):
+    """Opciones de línea de comandos del proyecto"""
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Ejecutar la suite de rendimiento de tests/benchmarks"
+    )
+    parser.addoption(
+        "--library-sizes",
+        default="1000,10000,100000",
+        help="Tamaños de biblioteca para los benchmarks, separados por comas"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Omitir los benchmarks salvo que se pidan con --run-benchmarks"""
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="usar --run-benchmarks para ejecutar benchmarks")
+    for item in items:
+        if BENCHMARKS_DIR in item.path.parents:
+            item.add_marker(skip_benchmark)
+
+
 # Registrar marcadores personalizados
 def pytest_configure(config):
     """Registrar marcadores personalizados de pytest"""
@@ -0,0 +1,65 @@
+"""
+Pruebas para la extracción y caché de carátulas
+"""
+
+import pytest
+from mutagen.id3 import ID3, APIC
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QColor, QImage
+
+from src.services.album_art import AlbumArtCache, extract_embedded_art
+
+# Trama MPEG-1 Layer III de 128 kbps a 44.1 kHz (417 bytes)
+MPEG_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+def png_bytes(width: int, height: int, color: str) -> bytes:
+    """Imagen PNG de un color"""
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(color))
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def mp3_with_cover(path, cover: bytes):
+    """MP3 mínimo con una carátula APIC"""
+    path.write_bytes(MPEG_FRAME * 20)
+    tags = ID3()
+    tags.add(APIC(encoding=3, mime="image/png", type=0, desc="otra", data=b"no"))
+    tags.add(APIC(encoding=3, mime="image/png", type=3, desc="", data=cover))
+    tags.save(str(path))
+    return str(path)
+
+
+def test_extract_prefers_front_cover(tmp_path):
+    """Se devuelve la portada aunque haya otras imágenes"""
+    cover = png_bytes(8, 8, "red")
+    assert extract_embedded_art(mp3_with_cover(tmp_path / "a.mp3", cover)) == cover
+    with pytest.raises(OSError):
+        extract_embedded_art(tmp_path / "missing.mp3")
+
+
+def test_thumbnails_are_shared_per_album(tmp_path):
+    """Las pistas de un álbum comparten miniaturas del tamaño pedido"""
+    cache = AlbumArtCache(str(tmp_path / "cache"), sizes=(64,))
+    cover = png_bytes(400, 200, "blue")
+    first = {"file_path": mp3_with_cover(tmp_path / "1.mp3", cover), "artist": "A", "album": "Disco"}
+    second = {"file_path": str(tmp_path / "2.mp3"), "artist": "a", "album": "disco "}
+
+    path = cache.get_thumbnail(first, 160)
+    image = QImage(str(path))
+    assert (image.width(), image.height()) == (160, 80)
+    assert cache.thumbnail_path(path.stem.split("-")[0], 64).exists()
+
+    # La segunda pista no tiene carátula propia ni se lee: usa la del álbum
+    assert cache.get_thumbnail(second, 160) == path
+
+
+def test_unknown_album_is_keyed_by_file():
+    """Las pistas sin álbum no comparten carátula"""
+    first = {"file_path": "/m/1.mp3", "artist": "A", "album": "Sin álbum"}
+    second = {"file_path": "/m/2.mp3", "artist": "A", "album": "Sin álbum"}
+    assert AlbumArtCache.album_key(first) != AlbumArtCache.album_key(second)
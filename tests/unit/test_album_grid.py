@@ -0,0 +1,156 @@
+"""
+Pruebas para la cola de carátulas y la carga diferida de la cuadrícula de álbumes
+"""
+
+import pytest
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtGui import QColor, QPixmap
+
+import src.ui.managers.album_art_loader as album_art_loader
+from src.services.album_art import AlbumArtCache
+from src.ui.components.album_grid import AlbumGridModel
+from src.ui.managers.album_art_loader import AlbumArtLoader
+
+TILE = 160
+
+
+class Dispatched:
+    """Sustituto de run_in_background que registra las tareas sin ejecutarlas"""
+
+    def __init__(self):
+        self.tasks = []
+
+    def __call__(self, func, song_data, size, on_finished=None, on_failed=None, pool=None):
+        self.tasks.append((song_data, on_finished, on_failed))
+
+    def albums(self) -> list:
+        return [song_data["album"] for song_data, _, _ in self.tasks]
+
+    def finish(self, index: int, result=None):
+        self.tasks[index][1](result)
+
+    def fail(self, index: int):
+        self.tasks[index][2](OSError("unidad no disponible"))
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    recorder = Dispatched()
+    monkeypatch.setattr(album_art_loader, "run_in_background", recorder)
+    return recorder
+
+
+@pytest.fixture
+def loader(qapp, tmp_path, dispatched):
+    """Cargador con un solo hilo: las peticiones salen de la cola de una en una"""
+    pool = QThreadPool()
+    pool.setMaxThreadCount(1)
+    return AlbumArtLoader(AlbumArtCache(str(tmp_path)), pool=pool)
+
+
+@pytest.fixture
+def cover(tmp_path):
+    path = tmp_path / "cover.png"
+    pixmap = QPixmap(TILE, TILE)
+    pixmap.fill(QColor("red"))
+    pixmap.save(str(path))
+    return path
+
+
+def album(index: int) -> dict:
+    return {"album": f"Album {index:03d}", "artist": "Artist", "tracks": 10,
+            "file_path": f"/music/{index:03d}/01.mp3"}
+
+
+def test_visible_rows_before_prefetch(loader, dispatched):
+    """Las filas visibles salen antes que el margen, y este por cercanía"""
+    model = AlbumGridModel(loader, TILE)
+    model.set_albums([album(i) for i in range(100)])
+
+    model.set_visible_range(50, 53)
+    for _ in range(8):
+        dispatched.finish(len(dispatched.tasks) - 1)
+
+    assert dispatched.albums()[:4] == [f"Album {i:03d}" for i in range(50, 54)]
+    assert dispatched.albums()[4:8] == ["Album 049", "Album 054", "Album 048", "Album 055"]
+
+
+def test_scrolling_out_cancels_and_drops(loader, dispatched, cover):
+    """Lo que sale de la ventana se retira de la cola y suelta su pixmap"""
+    model = AlbumGridModel(loader, TILE)
+    model.set_albums([album(i) for i in range(200)])
+    model.set_visible_range(0, 3)
+    dispatched.finish(0, cover)
+    assert model._pixmaps.keys() == {0}
+    # Ventana de 4 + PREFETCH_ROWS filas: una terminada y otra en curso
+    assert len(loader._queue) == 4 + AlbumGridModel.PREFETCH_ROWS - 2
+
+    model.set_visible_range(150, 153)
+
+    assert model._pixmaps == {}
+    window = {album(i)["album"] for i in range(150 - AlbumGridModel.PREFETCH_ROWS,
+                                               154 + AlbumGridModel.PREFETCH_ROWS)}
+    assert {song_data["album"] for _, _, song_data in loader._queue.values()} <= window
+    assert not model._requested & set(range(0, 28))
+
+
+def test_one_request_per_album_key(loader, dispatched, cover):
+    """Varias pistas del mismo álbum comparten una sola petición y un pixmap"""
+    first = {"album": "Same", "artist": "Artist", "file_path": "/music/a.mp3"}
+    second = dict(first, file_path="/music/b.mp3")
+
+    assert loader.request(first, TILE) is None
+    assert loader.request(second, TILE) is None
+    assert len(dispatched.tasks) == 1
+
+    dispatched.finish(0, cover)
+
+    assert loader.request(second, TILE) is not None
+    assert len(dispatched.tasks) == 1
+
+
+def test_failure_is_retried_but_missing_art_is_remembered(loader, dispatched):
+    """Un error de lectura no marca el álbum como sin carátula; un resultado vacío sí"""
+    song = album(1)
+    loader.request(song, TILE)
+    dispatched.fail(0)
+    loader.request(song, TILE)
+    assert len(dispatched.tasks) == 2
+
+    dispatched.finish(1, None)
+    loader.request(song, TILE)
+    assert len(dispatched.tasks) == 2
+
+
+def test_other_tracks_tried_when_first_has_no_art(loader, dispatched, cover):
+    """Si una pista no tiene carátula se prueban las demás del álbum"""
+    first = album(1)
+    second = dict(first, file_path="/music/001/02.mp3")
+    loader.request(first, TILE)
+    dispatched.finish(0, None)
+    assert loader.request(first, TILE) is None
+    assert len(dispatched.tasks) == 1
+
+    loader.request(second, TILE)
+    assert len(dispatched.tasks) == 2
+    dispatched.finish(1, cover)
+
+    assert loader.request(first, TILE) is not None
+
+
+def test_grid_retries_album_when_art_found_elsewhere(loader, dispatched, cover):
+    """La cuadrícula vuelve a pedir la carátula cuando otra pista del álbum la tiene"""
+    model = AlbumGridModel(loader, TILE)
+    model.set_albums([album(i) for i in range(3)])
+    model.set_visible_range(0, 2)
+    for index in range(3):
+        dispatched.finish(index, None)
+    assert model._pixmaps == {}
+
+    # La pista que suena (otra del álbum 1) sí tiene carátula
+    loader.request(dict(album(1), file_path="/music/001/05.mp3"), 64)
+    dispatched.finish(3, cover)
+
+    assert dispatched.albums()[4:] == ["Album 001"]
+    dispatched.finish(4, cover)
+    assert model._pixmaps.keys() == {1}
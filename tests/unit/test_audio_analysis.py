@@ -0,0 +1,64 @@
+"""
+Pruebas para el análisis de audio en una sola decodificación
+"""
+
+import wave
+
+import numpy as np
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import Song, SongRepository
+from src.services.audio_analysis import AudioAnalysisJob, analyze_audio
+from src.services.loudness import measure_loudness
+from src.services.waveform import extract_waveform
+
+
+def write_tone(path, seconds: float = 3.0, sample_rate: int = 48000) -> str:
+    """WAV estéreo de 16 bits con un seno de 997 Hz a media escala"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    tone = 0.5 * np.sin(2 * np.pi * 997 * t)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((np.repeat(tone, 2) * 32767).astype("<i2").tobytes())
+    return str(path)
+
+
+def test_analyze_matches_separate_analyses(tmp_path):
+    """Una pasada da los mismos resultados que cada análisis por separado"""
+    path = write_tone(tmp_path / "tone.wav")
+
+    result = analyze_audio(path)
+
+    assert result.waveform == extract_waveform(path)
+    assert result.loudness == measure_loudness(path)
+    assert analyze_audio(path, waveform=False).waveform is None
+
+
+def test_job_computes_only_missing_results(tmp_path):
+    """La sonoridad de etiquetas se conserva; la forma de onda se calcula para todas"""
+    db = DatabaseConnection(str(tmp_path / "analysis.db"))
+    MigrationManager(db).run_migrations()
+    repository = SongRepository(db)
+    repository.add_many([
+        Song(id=None, title="new", artist="A", album="B", genre="G", bpm=None,
+             file_path=write_tone(tmp_path / "new.wav")),
+        Song(id=None, title="tagged", artist="A", album="B", genre="G", bpm=None,
+             file_path=write_tone(tmp_path / "tagged.wav"), loudness=-9.0, peak=1.0),
+    ])
+    job = AudioAnalysisJob(repository, max_workers=1)
+
+    result = job.run()
+    songs = {song.title: song for song in repository.get_all()}
+    waveforms = [repository.get_waveform(song.id) for song in songs.values()]
+    db.close()
+
+    assert (result.processed, result.updated) == (2, 2)
+    assert (job.waveforms_updated, job.loudness_updated) == (2, 1)
+    # Seno a media escala en dos canales: -3.01 - 6.02 + 3.01 LUFS
+    assert songs["new"].loudness == pytest.approx(-6.02, abs=0.05)
+    assert (songs["tagged"].loudness, songs["tagged"].peak) == (-9.0, 1.0)
+    assert all(len(peaks) == 2048 for peaks in waveforms)
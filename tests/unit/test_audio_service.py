@@ -0,0 +1,266 @@
+"""
+Pruebas para el motor de dos reproductores de AudioService (precarga,
+cambio sin pausa y fundido cruzado) con reproductores simulados
+"""
+
+import pytest
+from PyQt6.QtCore import QObject, QUrl, pyqtSignal
+from PyQt6.QtTest import QTest
+
+# Sin backend de audio (p. ej. falta libpulse) QtMultimedia no se puede importar
+QtMultimedia = pytest.importorskip("PyQt6.QtMultimedia", exc_type=ImportError)
+QMediaPlayer = QtMultimedia.QMediaPlayer
+
+from src.services.audio_service import AudioService, _Deck
+from src.services.crossfade import plan_transition
+
+DURATION_MS = 200_000
+
+
+class FakePlayer(QObject):
+    """QMediaPlayer simulado: guarda la fuente y el estado y emite las mismas señales"""
+
+    mediaStatusChanged = pyqtSignal(object)
+    errorOccurred = pyqtSignal(object, str)
+    positionChanged = pyqtSignal(int)
+    durationChanged = pyqtSignal(int)
+    playingChanged = pyqtSignal(bool)
+    metaDataChanged = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source = QUrl()
+        self._state = QMediaPlayer.PlaybackState.StoppedState
+        self._position = 0
+        self.loads = 0  # Llamadas a setSource con un archivo
+
+    def setAudioOutput(self, output):
+        self.output = output
+
+    def setSource(self, url: QUrl):
+        self._source = url
+        self._position = 0
+        if not url.isEmpty():
+            self.loads += 1
+
+    def source(self) -> QUrl:
+        return self._source
+
+    def play(self):
+        self._state = QMediaPlayer.PlaybackState.PlayingState
+        self.playingChanged.emit(True)
+
+    def pause(self):
+        self._state = QMediaPlayer.PlaybackState.PausedState
+        self.playingChanged.emit(False)
+
+    def stop(self):
+        if self._state != QMediaPlayer.PlaybackState.StoppedState:
+            self._state = QMediaPlayer.PlaybackState.StoppedState
+            self.playingChanged.emit(False)
+
+    def playbackState(self):
+        return self._state
+
+    def isPlaying(self) -> bool:
+        return self._state == QMediaPlayer.PlaybackState.PlayingState
+
+    def mediaStatus(self):
+        if self._source.isEmpty():
+            return QMediaPlayer.MediaStatus.NoMedia
+        return QMediaPlayer.MediaStatus.LoadedMedia
+
+    def error(self):
+        return QMediaPlayer.Error.NoError
+
+    def duration(self) -> int:
+        return 0 if self._source.isEmpty() else DURATION_MS
+
+    def position(self) -> int:
+        return self._position
+
+    def setPosition(self, position_ms: int):
+        self._position = position_ms
+
+
+class FakeOutput:
+    def __init__(self):
+        self.volume = 1.0
+
+    def setVolume(self, volume: float):
+        self.volume = volume
+
+
+def make_songs(count: int) -> list:
+    return [{'id': i, 'title': f"Song {i}", 'file_path': f"/music/{i}.mp3",
+             'duration': DURATION_MS / 1000} for i in range(count)]
+
+
+@pytest.fixture
+def service(qapp):
+    audio = AudioService(deck_factory=lambda parent: _Deck(FakePlayer(parent), FakeOutput()))
+    audio.set_normalization(False)
+    audio.set_crossfade(0)
+    yield audio
+    audio.cleanup()
+
+
+@pytest.fixture
+def emitted(service):
+    """Señales de AudioService hacia la UI, por nombre"""
+    received = {name: [] for name in ("playback_state_changed", "song_progress_updated",
+                                      "current_song_changed", "error_occurred")}
+    for name, values in received.items():
+        getattr(service, name).connect(lambda *args, values=values: values.append(args))
+    return received
+
+
+def start(service, songs, index: int = 0):
+    service.set_playlist(songs, index)
+    service.play_song(songs[index])
+    return service._deck
+
+
+def test_preload_at_preload_at_ms(service):
+    """La siguiente pista se carga en el reproductor libre al llegar a preload_at_ms"""
+    songs = make_songs(3)
+    active = start(service, songs)
+    idle = service._idle_deck
+    transition = plan_transition(DURATION_MS, DURATION_MS, 0)
+
+    active.player.positionChanged.emit(transition.preload_at_ms - 1)
+    assert idle.player.source().isEmpty()
+
+    active.player.positionChanged.emit(transition.preload_at_ms)
+    assert idle.player.source() == QUrl.fromLocalFile(songs[1]['file_path'])
+    assert not idle.player.isPlaying()
+    assert service._preloaded_index == 1
+
+
+def test_end_of_media_switches_to_preloaded_deck(service, emitted):
+    """Sin fundido, EndOfMedia pasa a la pista precargada sin volver a abrirla"""
+    songs = make_songs(3)
+    first = start(service, songs)
+    second = service._idle_deck
+    first.player.positionChanged.emit(plan_transition(DURATION_MS, DURATION_MS, 0).preload_at_ms)
+
+    first.player.mediaStatusChanged.emit(QMediaPlayer.MediaStatus.EndOfMedia)
+
+    assert service._deck is second
+    assert second.player.isPlaying()
+    assert second.player.loads == 1
+    assert first.player.source().isEmpty()
+    assert service._current_index == 1
+    assert emitted["current_song_changed"][-1][0]['id'] == 1
+
+
+def test_fade_starts_and_finishes(service):
+    """El fundido hace sonar los dos reproductores y libera el saliente al acabar"""
+    service.set_crossfade(0.2)
+    songs = make_songs(3)
+    first = start(service, songs)
+    second = service._idle_deck
+    transition = plan_transition(DURATION_MS, DURATION_MS, 200)
+
+    first.player.positionChanged.emit(transition.preload_at_ms)
+    first.player.positionChanged.emit(transition.fade_start_ms)
+
+    assert service._deck is second and service._fading_deck is first
+    assert first.player.isPlaying() and second.player.isPlaying()
+    assert second.output.volume == 0.0
+
+    QTest.qWait(transition.fade_ms + 200)
+
+    assert service._fading_deck is None
+    assert first.player.source().isEmpty()
+    assert second.output.volume == pytest.approx(0.5)
+
+
+def test_outgoing_end_of_media_finishes_fade(service):
+    """Si la pista saliente termina antes que el fundido, se libera en ese momento"""
+    service.set_crossfade(2)
+    songs = make_songs(2)
+    first = start(service, songs)
+    transition = plan_transition(DURATION_MS, DURATION_MS, 2000)
+    first.player.positionChanged.emit(transition.preload_at_ms)
+    first.player.positionChanged.emit(transition.fade_start_ms)
+
+    first.player.mediaStatusChanged.emit(QMediaPlayer.MediaStatus.EndOfMedia)
+
+    assert service._fading_deck is None
+    assert service._current_index == 1
+    assert service._deck.output.volume == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("action", [
+    lambda service: service.pause(),
+    lambda service: service.seek(100),
+], ids=["pause", "seek"])
+def test_pause_and_seek_end_fade(service, action):
+    """Pausar o buscar durante un fundido corta la pista saliente"""
+    service.set_crossfade(2)
+    songs = make_songs(3)
+    first = start(service, songs)
+    transition = plan_transition(DURATION_MS, DURATION_MS, 2000)
+    first.player.positionChanged.emit(transition.preload_at_ms)
+    first.player.positionChanged.emit(transition.fade_start_ms)
+    assert service._fading_deck is first
+
+    action(service)
+
+    assert service._fading_deck is None
+    assert first.player.source().isEmpty()
+    assert service._deck.output.volume == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("action", [
+    lambda service, songs: service.seek(100),
+    lambda service, songs: service.set_playlist(songs[:1] + songs[2:], 0),
+], ids=["seek", "set_playlist"])
+def test_seek_back_and_set_playlist_drop_preload(service, action):
+    """Buscar lejos del final o cambiar la lista libera la pista precargada"""
+    songs = make_songs(3)
+    first = start(service, songs)
+    idle = service._idle_deck
+    first.player.positionChanged.emit(plan_transition(DURATION_MS, DURATION_MS, 0).preload_at_ms)
+    assert service._preloaded_index == 1
+
+    action(service, songs)
+
+    assert service._preloaded_index is None
+    assert idle.player.source().isEmpty()
+
+
+def test_seek_near_end_keeps_preload(service):
+    """Buscar dentro del tramo de precarga no vuelve a abrir la siguiente pista"""
+    songs = make_songs(3)
+    first = start(service, songs)
+    idle = service._idle_deck
+    first.player.positionChanged.emit(plan_transition(DURATION_MS, DURATION_MS, 0).preload_at_ms)
+
+    service.seek(990)
+
+    assert service._preloaded_index == 1
+    assert idle.player.loads == 1
+
+
+def test_inactive_deck_signals_do_not_reach_ui(service, emitted):
+    """Las señales del reproductor de precarga no llegan a los manejadores de la UI"""
+    songs = make_songs(3)
+    first = start(service, songs)
+    idle = service._idle_deck
+    first.player.positionChanged.emit(plan_transition(DURATION_MS, DURATION_MS, 0).preload_at_ms)
+    before = {name: len(values) for name, values in emitted.items()}
+
+    idle.player.positionChanged.emit(1000)
+    idle.player.durationChanged.emit(DURATION_MS)
+    idle.player.playingChanged.emit(True)
+    idle.player.metaDataChanged.emit()
+    idle.player.mediaStatusChanged.emit(QMediaPlayer.MediaStatus.EndOfMedia)
+    assert {name: len(values) for name, values in emitted.items()} == before
+    assert service._deck is first and service._preloaded_index == 1
+
+    # Un error de precarga libera el reproductor sin avisar a la UI
+    idle.player.errorOccurred.emit(QMediaPlayer.Error.ResourceError, "no se pudo abrir")
+    assert {name: len(values) for name, values in emitted.items()} == before
+    assert service._preloaded_index is None
@@ -0,0 +1,101 @@
+"""
+Pruebas para la decodificación PCM y la detección de tempo
+"""
+
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import Song, SongRepository
+from src.services.audio_decoding import UnsupportedAudioError, decode_pcm
+from src.services.bpm_detection import BpmDetectionJob, estimate_bpm
+
+
+def click_track(bpm: float, sample_rate: int = 22050, seconds: float = 20.0) -> np.ndarray:
+    """Clics amortiguados en cada pulso sobre ruido de fondo"""
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 0.01, int(sample_rate * seconds)).astype(np.float32)
+    click = np.exp(-np.arange(1000) / 100) * np.sin(2 * np.pi * 1000 * np.arange(1000) / sample_rate)
+    for start in np.arange(0, seconds - 0.1, 60.0 / bpm):
+        index = int(start * sample_rate)
+        samples[index:index + len(click)] += click.astype(np.float32)
+    return samples
+
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int, width: int = 2, channels: int = 1):
+    """Guardar muestras en [-1, 1] como WAV PCM entero"""
+    scaled = np.clip(samples, -1, 1) * (2 ** (8 * width - 1) - 1)
+    interleaved = np.repeat(scaled, channels).astype("<i4")
+    if width == 2:
+        raw = interleaved.astype("<i2").tobytes()
+    else:  # 24 bits: los tres bytes bajos de cada int32
+        raw = interleaved.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(raw)
+    return str(path)
+
+
+@pytest.mark.parametrize("bpm", [90, 128, 174])
+def test_estimate_bpm_on_click_track(bpm):
+    """El tempo de una pista de clics se estima con menos de 1 BPM de error"""
+    assert estimate_bpm(click_track(bpm), 22050) == pytest.approx(bpm, abs=1.0)
+
+
+def test_estimate_bpm_rejects_silence():
+    """Sin pulso no se devuelve un tempo"""
+    assert estimate_bpm(np.zeros(22050 * 10, dtype=np.float32), 22050) is None
+
+
+@pytest.mark.parametrize("sample_rate", [44100, 22050])
+def test_estimate_bpm_rejects_steady_tone(sample_rate):
+    """Un tono sostenido no tiene pulso (antes el aliasing daba 75 o 140 BPM)"""
+    t = np.arange(sample_rate * 20) / sample_rate
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    assert estimate_bpm(tone, sample_rate) is None
+
+
+@pytest.mark.parametrize("width", [2, 3])
+def test_decode_wav_mixes_to_mono(tmp_path, width):
+    """WAV de 16 y 24 bits se decodifica a mono normalizado con desplazamiento"""
+    ramp = np.linspace(-0.5, 0.5, 8000, dtype=np.float32)
+    path = write_wav(tmp_path / "ramp.wav", ramp, 8000, width=width, channels=2)
+
+    samples, sample_rate = decode_pcm(path, offset=0.5, duration=0.25)
+
+    assert sample_rate == 8000
+    assert samples.dtype == np.float32
+    np.testing.assert_allclose(samples, ramp[4000:6000], atol=1e-3)
+
+
+def test_decode_unsupported_format(tmp_path):
+    """Los formatos sin decodificador se rechazan con UnsupportedAudioError"""
+    with pytest.raises(UnsupportedAudioError):
+        decode_pcm(tmp_path / "song.m4a")
+
+
+def test_job_writes_detected_bpm(tmp_path):
+    """El trabajo por lotes solo procesa canciones sin BPM y guarda el resultado"""
+    db = DatabaseConnection(str(tmp_path / "bpm.db"))
+    MigrationManager(db).run_migrations()
+    repository = SongRepository(db)
+    tagged = write_wav(tmp_path / "tagged.wav", click_track(100), 22050)
+    untagged = write_wav(tmp_path / "untagged.wav", click_track(120), 22050)
+    repository.add_many([
+        Song(id=None, title="a", artist="A", album="B", genre="G", bpm=99, file_path=tagged),
+        Song(id=None, title="b", artist="A", album="B", genre="G", bpm=None, file_path=untagged),
+        Song(id=None, title="c", artist="A", album="B", genre="G", bpm=None, file_path="/missing.m4a"),
+    ])
+
+    result = BpmDetectionJob(repository, max_workers=1).run()
+    bpms = {song.title: song.bpm for song in repository.get_all()}
+    db.close()
+
+    assert (result.processed, result.updated, result.failed) == (1, 1, 0)
+    assert bpms == {"a": 99, "b": 120, "c": None}
@@ -0,0 +1,100 @@
+"""
+Pruebas para DatabaseConnection
+"""
+
+import sqlite3
+
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import Song, SongRepository
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base de datos temporal con migraciones aplicadas"""
+    connection = DatabaseConnection(str(tmp_path / "test.db"))
+    MigrationManager(connection).run_migrations()
+    return connection
+
+
+@pytest.fixture
+def repository(db):
+    """Repositorio con 25 canciones"""
+    repo = SongRepository(db)
+    for i in range(25):
+        repo.add(Song(id=None, title=f"Song {i:02d}", artist="Artist", album="Album",
+                      genre="Genre", bpm=None, file_path=f"/music/{i:02d}.mp3"))
+    return repo
+
+
+def test_iter_query_chunks_uses_fetchmany(db, repository):
+    """Las filas llegan en bloques del tamaño pedido"""
+    chunks = list(db.iter_query_chunks("SELECT id FROM songs ORDER BY id", chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+
+def test_iter_query_holds_connection_until_exhausted(db, repository):
+    """La conexión se mantiene durante la iteración y se libera al cerrar"""
+    rows = db.iter_query("SELECT id FROM songs ORDER BY id", chunk_size=4)
+    assert next(rows)["id"] == 1
+    assert db._local.connection is not None
+
+    rows.close()
+    assert db._local.connection is None
+
+
+def test_repository_streaming(repository):
+    """iter_songs e iter_batches recorren toda la tabla en orden"""
+    titles = [song.title for song in repository.iter_songs(chunk_size=7)]
+    assert titles == [f"Song {i:02d}" for i in range(25)]
+
+    batches = list(repository.iter_batches(descending=True, chunk_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert batches[0][0].title == "Song 24"
+
+
+def test_open_stream_defers_commit_until_closed(db, repository, tmp_path):
+    """Con un recorrido a medias las escrituras del hilo esperan a que se cierre"""
+    songs = repository.iter_songs(chunk_size=4)
+    next(songs)
+    repository.add(Song(id=None, title="Late", artist="Artist", album="Album",
+                        genre="Genre", bpm=None, file_path="/music/late.mp3"))
+    other = sqlite3.connect(str(tmp_path / "test.db"))
+    assert other.execute("SELECT COUNT(*) FROM songs").fetchone()[0] == 25
+
+    songs.close()
+    assert db._local.depth == 0
+    assert other.execute("SELECT COUNT(*) FROM songs").fetchone()[0] == 26
+    other.close()
+
+
+def test_search_reuses_prepared_statements(db, repository):
+    """Búsquedas con la misma combinación de filtros reutilizan la sentencia"""
+    repository.search(title="Song 0")
+    db.statement_cache_stats.reset()
+
+    for text in ("Song 1", "Song 2", "Song 3"):
+        repository.search(title=text)
+
+    stats = db.get_statement_cache_stats()
+    assert stats["misses"] == 0
+    assert stats["hits"] == 6  # conteo + página por búsqueda
+    assert stats["hit_rate"] == 1.0
+
+
+def test_connection_is_reused_and_reopened_after_close(db, tmp_path):
+    """La conexión persiste entre llamadas y se reabre tras close()"""
+    with db.get_connection() as first:
+        pass
+    with db.get_connection() as second:
+        pass
+    assert first is second
+
+    db.close()
+    (tmp_path / "test.db").unlink()
+    with db.get_connection() as third:
+        tables = third.execute("SELECT name FROM sqlite_master WHERE name = 'songs'").fetchall()
+    assert third is not first
+    assert tables == []
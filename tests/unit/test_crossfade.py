@@ -0,0 +1,57 @@
+"""
+Pruebas para las curvas y la planificación de transiciones entre pistas
+"""
+
+import math
+
+import pytest
+
+from src.services.crossfade import (
+    CURVES, CURVE_EQUAL_POWER, CURVE_S_CURVE, PRELOAD_LEAD_MS, Transition, fade_gains, plan_transition,
+)
+
+
+@pytest.mark.parametrize("curve", CURVES)
+def test_curve_endpoints(curve):
+    """Toda curva empieza con la pista saliente entera y termina con la entrante"""
+    assert fade_gains(0.0, curve) == pytest.approx((1.0, 0.0))
+    assert fade_gains(1.0, curve) == pytest.approx((0.0, 1.0))
+    # Fuera de rango se recorta
+    assert fade_gains(1.5, curve) == pytest.approx((0.0, 1.0))
+
+
+def test_equal_power_keeps_power():
+    """La curva de potencia constante mantiene out² + in² = 1 (-3 dB a mitad)"""
+    for step in range(11):
+        out, incoming = fade_gains(step / 10, CURVE_EQUAL_POWER)
+        assert out ** 2 + incoming ** 2 == pytest.approx(1.0)
+    assert fade_gains(0.5, CURVE_EQUAL_POWER)[0] == pytest.approx(math.sqrt(0.5))
+
+
+def test_s_curve_is_symmetric():
+    """La curva S es simétrica y se mueve poco en los extremos"""
+    assert fade_gains(0.5, CURVE_S_CURVE) == pytest.approx((0.5, 0.5))
+    out, incoming = fade_gains(0.1, CURVE_S_CURVE)
+    assert incoming < 0.1 and out + incoming == pytest.approx(1.0)
+
+
+def test_unknown_curve():
+    with pytest.raises(ValueError):
+        fade_gains(0.5, "logarithmic")
+
+
+def test_plan_transition():
+    """El fundido termina con la pista y la precarga se adelanta PRELOAD_LEAD_MS"""
+    assert plan_transition(200000, 180000, 4000) == Transition(186000, 196000, 4000)
+    # Sin fundido: solo precarga para el cambio sin pausa
+    assert plan_transition(200000, None, 0) == Transition(200000 - PRELOAD_LEAD_MS, 200000, 0)
+
+
+def test_plan_transition_clamps_short_tracks():
+    """El fundido no pasa de un cuarto de la pista más corta"""
+    assert plan_transition(200000, 8000, 10000).fade_ms == 2000
+    assert plan_transition(6000, 200000, 10000) == Transition(0, 4500, 1500)
+
+
+def test_plan_transition_unknown_duration():
+    assert plan_transition(0, 180000, 4000) is None
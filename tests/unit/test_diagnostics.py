@@ -0,0 +1,42 @@
+"""
+Pruebas para el lector de métricas del panel de diagnóstico
+"""
+
+from src.database.connection import DatabaseConnection
+from src.utils.diagnostics import DiagnosticsCollector, memory_usage
+from src.utils.instrumentation import Instrumentation
+
+
+def test_collect_reports_latency_cache_and_import_rate(tmp_path):
+    """collect() agrupa latencias, caché de sentencias y rendimiento de importación"""
+    registry = Instrumentation(enabled=True)
+    registry.observe("db.query", 2.0)
+    registry.observe("import.folder", 500.0)
+    registry.incr("import.files_imported", 10)
+    db = DatabaseConnection(str(tmp_path / "test.db"))
+    db.execute_query("SELECT 1")
+    db.execute_query("SELECT 1")
+
+    data = DiagnosticsCollector(db, registry, count_songs=lambda: 42).collect()
+    db.close()
+
+    assert data['db_latency']['db.query']['p50'] == 2.0
+    assert data['statement_cache']['hits'] == 1
+    assert data['import']['files_per_second'] == 20.0
+    assert data['library_size'] == 42
+    assert data['slow_queries'] is None
+    assert memory_usage()['peak_rss_bytes'] > 0
+
+
+def test_library_size_is_recounted_only_after_imports():
+    """El recuento de canciones se repite solo cuando cambian las importaciones"""
+    registry = Instrumentation(enabled=True)
+    calls = []
+    collector = DiagnosticsCollector(registry=registry, count_songs=lambda: calls.append(1) or len(calls))
+
+    assert collector.library_size() == 1
+    assert collector.library_size() == 1
+    registry.incr("import.files_imported")
+    assert collector.library_size() == 2
+    collector.invalidate_library_size()
+    assert collector.library_size() == 3
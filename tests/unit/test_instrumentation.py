@@ -0,0 +1,77 @@
+"""
+Pruebas para la capa de instrumentación
+"""
+
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.utils.instrumentation import Histogram, Instrumentation, instrumentation
+
+
+def test_disabled_registry_records_nothing():
+    """Desactivada, span/incr/observe no registran datos"""
+    registry = Instrumentation(enabled=False)
+
+    @registry.timed("work")
+    def work(value):
+        return value * 2
+
+    with registry.span("block"):
+        pass
+    registry.incr("calls")
+
+    assert work(21) == 42
+    assert registry.snapshot() == {'counters': {}, 'histograms': {}}
+
+
+def test_spans_counters_and_errors():
+    """Los spans registran duraciones y los errores se cuentan aparte"""
+    registry = Instrumentation(enabled=True)
+
+    @registry.timed("work")
+    def work(fail=False):
+        if fail:
+            raise ValueError("fallo")
+
+    work()
+    with pytest.raises(ValueError):
+        work(fail=True)
+    with registry.span("block") as span:
+        pass
+    registry.incr("files", 3)
+
+    assert registry.histogram("work").count == 2
+    assert registry.counter("work.errors") == 1
+    assert registry.counter("files") == 3
+    assert span.duration_ms >= 0.0
+    assert "work" in registry.report()
+
+
+def test_histogram_percentiles():
+    """Percentiles calculados sobre las muestras recientes"""
+    histogram = Histogram(window=100)
+    for value in range(1, 201):
+        histogram.add(float(value))
+
+    summary = histogram.to_dict()
+    assert summary['count'] == 200
+    assert summary['min'] == 1.0 and summary['max'] == 200.0
+    assert summary['p50'] == pytest.approx(150, abs=1)
+
+
+def test_database_queries_are_instrumented(tmp_path):
+    """Las consultas de DatabaseConnection quedan registradas en el registro global"""
+    db = DatabaseConnection(str(tmp_path / "test.db"))
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        db.execute_query("SELECT 1")
+        db.execute_insert_update_delete("CREATE TABLE t (x INTEGER)")
+    finally:
+        instrumentation.disable()
+        db.close()
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot['histograms']['db.query']['count'] == 1
+    assert snapshot['histograms']['db.write']['count'] == 1
+    instrumentation.reset()
@@ -0,0 +1,116 @@
+"""
+Pruebas para la medida de sonoridad y la normalización de volumen
+"""
+
+import wave
+
+import numpy as np
+import pytest
+from mutagen.id3 import ID3, TXXX
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import Song, SongRepository
+from src.services.loudness import LoudnessJob, LoudnessMeter, integrated_loudness
+from src.services.metadata_extractor import MetadataExtractor
+from src.services.replaygain import normalization_gain, read_replaygain
+
+# Trama MPEG-1 Layer III de 128 kbps a 44.1 kHz (417 bytes)
+MPEG_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+def sine(amplitude: float, sample_rate: int = 48000, seconds: float = 5.0) -> np.ndarray:
+    """Seno de 997 Hz (la señal de calibración de BS.1770)"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * 997 * t)).astype(np.float32)
+
+
+@pytest.mark.parametrize("sample_rate", [44100, 48000])
+def test_full_scale_sine_reference(sample_rate):
+    """Un seno de 997 Hz a fondo de escala en un canal mide -3.01 LUFS"""
+    tone = sine(1.0, sample_rate)
+    assert integrated_loudness(tone, sample_rate) == pytest.approx(-3.01, abs=0.02)
+    # Dos canales iguales suman su energía: +3 dB
+    assert integrated_loudness(np.stack([tone, tone], axis=1), sample_rate) == pytest.approx(0.0, abs=0.02)
+
+
+def test_gating_ignores_silence():
+    """La puerta absoluta descarta el silencio; sin señal no hay medida"""
+    tone = sine(0.1)
+    with_silence = np.concatenate([np.zeros(48000 * 10, dtype=np.float32), tone])
+    assert integrated_loudness(with_silence, 48000) == pytest.approx(integrated_loudness(tone, 48000), abs=0.2)
+    assert integrated_loudness(np.zeros(48000 * 5, dtype=np.float32), 48000) is None
+
+
+def test_meter_matches_one_shot():
+    """Medir por bloques de tamaño irregular da lo mismo que sobre el array completo"""
+    rng = np.random.default_rng(1)
+    samples = rng.normal(0, 0.1, (48000 * 12, 2)).astype(np.float32)
+    samples[48000 * 4:48000 * 6] *= 0.01  # Tramo casi en silencio (puerta relativa)
+    meter = LoudnessMeter(48000, 2)
+    position = 0
+    while position < len(samples):
+        size = int(rng.integers(1, 150_000))
+        meter.add(samples[position:position + size])
+        position += size
+
+    assert meter.loudness() == pytest.approx(integrated_loudness(samples, 48000), abs=1e-6)
+    assert meter.peak == pytest.approx(float(np.abs(samples).max()))
+
+
+def test_normalization_gain():
+    """La ganancia lleva al objetivo sin recortar el pico ni pasar del límite"""
+    assert normalization_gain(None) == 1.0
+    assert normalization_gain(-12.0, peak=0.5) == pytest.approx(10 ** (-6 / 20))
+    assert normalization_gain(-24.0, peak=0.9) == pytest.approx(1 / 0.9)
+    assert normalization_gain(-60.0, target=-18.0) == pytest.approx(10 ** (12 / 20))
+
+
+def test_read_replaygain_tags():
+    """Etiquetas ReplayGain y R128 se convierten a LUFS"""
+    assert read_replaygain({"replaygain_track_gain": ["-6.50 dB"],
+                            "replaygain_track_peak": ["0.988"]}) == (-11.5, 0.988)
+    assert read_replaygain({"r128_track_gain": ["-1280"]}) == (-18.0, None)
+    assert read_replaygain({"replaygain_track_gain": ["n/a"]}) == (None, None)
+    assert read_replaygain(None) == (None, None)
+
+
+def test_extract_reads_id3_replaygain(tmp_path):
+    """Los marcos TXXX de ReplayGain se guardan al importar"""
+    path = tmp_path / "rg.mp3"
+    path.write_bytes(MPEG_FRAME * 20)
+    tags = ID3()
+    tags.add(TXXX(encoding=3, desc="REPLAYGAIN_TRACK_GAIN", text=["+2.00 dB"]))
+    tags.add(TXXX(encoding=3, desc="REPLAYGAIN_TRACK_PEAK", text=["0.5"]))
+    tags.save(str(path))
+
+    song = MetadataExtractor().extract(path)
+
+    assert (song.loudness, song.peak) == (-20.0, 0.5)
+
+
+def test_job_stores_loudness(tmp_path):
+    """El trabajo por lotes mide las canciones sin sonoridad y la guarda"""
+    db = DatabaseConnection(str(tmp_path / "loudness.db"))
+    MigrationManager(db).run_migrations()
+    repository = SongRepository(db)
+    path = tmp_path / "tone.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(48000)
+        wav.writeframes((sine(0.5) * 32767).astype("<i2").tobytes())
+    repository.add_many([
+        Song(id=None, title="t", artist="A", album="B", genre="G", bpm=None, file_path=str(path)),
+        Song(id=None, title="rg", artist="A", album="B", genre="G", bpm=None,
+             file_path=str(tmp_path / "tagged.wav"), loudness=-9.0, peak=1.0),
+    ])
+
+    result = LoudnessJob(repository, max_workers=1).run()
+    songs = {song.title: song for song in repository.get_all()}
+    db.close()
+
+    assert (result.processed, result.updated) == (1, 1)
+    assert songs["t"].loudness == pytest.approx(-3.01 + 20 * np.log10(0.5), abs=0.05)
+    assert songs["t"].peak == pytest.approx(0.5, abs=1e-3)
+    assert (songs["rg"].loudness, songs["rg"].peak) == (-9.0, 1.0)
@@ -43,3 +43,20 @@ def test_extract_id3_metadata(tmp_path):
     assert song.title == "Test Title"
     assert song.artist == "Test Artist"
     assert song.file_path == mp3_path
+
+
+def test_extract_audio_properties(tmp_path):
+    wav_path = tmp_path / "tone.wav"
+    sample_rate = 22050
+    data = numpy.zeros((sample_rate * 2, 2), dtype=numpy.int16)
+    wavfile.write(wav_path, sample_rate, data)
+
+    song = MetadataExtractor().extract(wav_path)
+
+    assert song is not None
+    assert song.duration == pytest.approx(2.0)
+    assert song.sample_rate == sample_rate
+    assert song.channels == 2
+    assert song.bitrate == sample_rate * 2 * 16
+    assert song.codec == "pcm"
+    assert song.file_size == wav_path.stat().st_size
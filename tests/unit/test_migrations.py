@@ -0,0 +1,66 @@
+"""
+Pruebas para el gestor de migraciones
+"""
+
+import pytest
+
+from src.database.connection import DatabaseConnection, DatabaseConnectionError
+from src.database.migrations import MigrationManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Conexión a una base de datos temporal"""
+    connection = DatabaseConnection(str(tmp_path / "test.db"))
+    yield connection
+    connection.close()
+
+
+def executed_statements(db: DatabaseConnection) -> int:
+    """Sentencias ejecutadas a través de la conexión hasta ahora"""
+    stats = db.get_statement_cache_stats()
+    return stats['hits'] + stats['misses']
+
+
+def test_up_to_date_schema_costs_one_query(db):
+    """Con el esquema al día, run_migrations solo lee PRAGMA user_version"""
+    manager = MigrationManager(db)
+    manager.run_migrations()
+    assert manager.get_schema_version() == manager.get_latest_version()
+
+    before = executed_statements(db)
+    MigrationManager(db).run_migrations()
+
+    assert executed_statements(db) - before == 1
+
+
+def test_failed_migration_leaves_no_partial_changes(db):
+    """Una migración que falla se revierte por completo"""
+    class BrokenMigrations(MigrationManager):
+        def _get_all_migrations(self):
+            return [{
+                'version': '001',
+                'description': 'Migración rota',
+                'sql_commands': ["CREATE TABLE t (id INTEGER)", "INSERT INTO missing VALUES (1)"],
+            }]
+
+    manager = BrokenMigrations(db)
+    with pytest.raises(DatabaseConnectionError):
+        manager.run_migrations()
+
+    tables = {row['name'] for row in db.execute_query("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "t" not in tables
+    assert manager.get_schema_version() == 0
+    assert manager.get_applied_migrations() == []
+
+
+def test_legacy_database_adopts_user_version(db):
+    """Una base de datos migrada antes de user_version no repite migraciones"""
+    MigrationManager(db).run_migrations()
+    db.execute_insert_update_delete("PRAGMA user_version = 0")
+
+    manager = MigrationManager(db)
+    manager.run_migrations()
+
+    assert manager.get_schema_version() == manager.get_latest_version()
+    assert len(manager.get_applied_migrations()) == len(manager._get_all_migrations())
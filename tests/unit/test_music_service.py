@@ -15,7 +15,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.services.music_service import MusicService
 from src.database.connection import DatabaseConnection
-from src.models.song import Song
+from src.models.song import Song, SongRepository
 from src.database.migrations import MigrationManager
 
 # Configuración de pruebas
@@ -34,6 +34,7 @@ def test_db():
     yield db
     
     # Limpiar después de las pruebas
+    db.close()
     if db_path.exists():
         db_path.unlink()
 
@@ -220,3 +221,42 @@ def test_import_files(music_service, test_music_dir):
     assert imported == 2
     assert failed == 1
     assert music_service.get_total_songs_count() == 2
+
+
+def test_sorted_pagination(music_service):
+    """Probar ordenación por distintas claves con desempate estable"""
+    for i, (artist, bpm) in enumerate([("beta", 128), ("Alpha", 90), ("gamma", 128)]):
+        music_service.songs.add(Song(
+            id=None,
+            title=f"Song {i}",
+            artist=artist,
+            album="Album",
+            genre="Test Genre",
+            bpm=bpm,
+            file_path=Path(f"tests/data/music/sorted_{i}.mp3")
+        ))
+
+    songs, _ = music_service.get_songs(page=1, per_page=10, sort_by="artist")
+    assert [s.artist for s in songs] == ["Alpha", "beta", "gamma"]
+
+    songs, _ = music_service.get_songs(page=1, per_page=10, sort_by="bpm", descending=True)
+    assert [s.title for s in songs] == ["Song 2", "Song 0", "Song 1"]
+
+    songs, total = music_service.search_songs(genre="Test", sort_by="artist", descending=True)
+    assert [s.artist for s in songs] == ["gamma", "beta", "Alpha"]
+    assert total == 3
+
+    with pytest.raises(ValueError):
+        music_service.get_songs(sort_by="file_path")
+
+
+def test_sorted_queries_use_index(test_db):
+    """Las consultas ordenadas deben recorrer un índice sin ordenación temporal"""
+    for sort_by in SongRepository.SORT_COLUMNS:
+        for descending in (False, True):
+            order_by = SongRepository.order_by_clause(sort_by, descending)
+            plan = test_db.execute_query(
+                f"EXPLAIN QUERY PLAN SELECT * FROM songs ORDER BY {order_by} LIMIT 50 OFFSET 100"
+            )
+            details = " | ".join(row["detail"] for row in plan)
+            assert "TEMP B-TREE" not in details, f"{sort_by} ({descending}): {details}"
@@ -0,0 +1,77 @@
+"""
+Pruebas para la carga progresiva de la tabla de canciones
+"""
+
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtTest import QTest
+
+from src.models.song import Song
+from src.ui.components.content_views.library_view import LibraryView
+from src.ui.components.song_table import SongTable
+
+
+def make_songs(count: int) -> list:
+    return [Song(id=i, title=f"Song {i}", artist="Artist", album="Album", genre="Genre",
+                 bpm=None, file_path=f"/music/{i}.mp3") for i in range(count)]
+
+
+def drain_events():
+    """Procesar los bloques pendientes (QTimer.singleShot(0))"""
+    for _ in range(100):
+        QCoreApplication.processEvents()
+
+
+def test_rows_arrive_in_several_event_loop_turns(qapp):
+    """Cada bloque respeta el presupuesto y el resto llega en vueltas posteriores"""
+    table = SongTable()
+    table.FRAME_BUDGET_MS = 0  # Un bloque de ROWS_PER_STEP filas por vuelta
+    finished = []
+
+    table.load_songs_progressive(make_songs(100), on_finished=lambda: finished.append(True))
+
+    assert table.table.rowCount() == SongTable.ROWS_PER_STEP
+    assert finished == []
+    drain_events()
+    assert table.table.rowCount() == 100
+    assert finished == [True]
+    assert table.table.item(99, 1).text() == "Song 99"
+
+
+def test_newer_load_cancels_older(qapp):
+    """Una carga nueva descarta los bloques pendientes de la anterior y su callback"""
+    table = SongTable()
+    table.FRAME_BUDGET_MS = 0
+    finished = []
+
+    table.load_songs_progressive(make_songs(200), on_finished=lambda: finished.append("old"))
+    table.load_songs_progressive(make_songs(10), on_finished=lambda: finished.append("new"))
+    drain_events()
+
+    assert finished == ["new"]
+    assert table.table.rowCount() == 10
+
+
+def test_loading_bar_hidden_for_short_loads(qapp):
+    """Una carga más corta que LOADING_BAR_DELAY_MS no muestra la barra"""
+    view = LibraryView()
+
+    view.load_songs(make_songs(20), total_items=20)
+    QTest.qWait(LibraryView.LOADING_BAR_DELAY_MS + 100)
+
+    assert not view.is_loading
+    assert view.loading_bar.isHidden()
+    assert view.table.table.rowCount() == 20
+
+
+def test_loading_bar_shown_for_slow_loads(qapp):
+    """Si la carga no termina a tiempo aparece la barra, y se oculta al terminar"""
+    view = LibraryView()
+    pending = []
+    view.table.load_songs_progressive = lambda songs, on_finished: pending.append(on_finished)
+
+    view.load_songs(make_songs(5), total_items=5)
+    QTest.qWait(LibraryView.LOADING_BAR_DELAY_MS + 100)
+    assert view.is_loading
+
+    pending[0]()
+    assert not view.is_loading
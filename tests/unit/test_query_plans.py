@@ -0,0 +1,53 @@
+"""
+Pruebas de regresión de planes de consulta
+"""
+
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.database.query_plan import (
+    QueryPlanChecker, collect_query_shapes, find_plan_regressions, seed_database
+)
+
+
+@pytest.fixture(scope="module")
+def seeded_db(tmp_path_factory):
+    """Base de datos con 5000 canciones y estadísticas de ANALYZE"""
+    db = DatabaseConnection(str(tmp_path_factory.mktemp("plans") / "plans.db"))
+    MigrationManager(db).run_migrations()
+    seed_database(db, 5000)
+    yield db
+    db.close()
+
+
+def test_find_plan_regressions():
+    """Se detectan recorridos completos y ordenaciones temporales"""
+    assert find_plan_regressions(["SCAN songs USING INDEX idx_songs_title_nocase"]) == []
+    assert find_plan_regressions(["SCAN songs"]) == ["SCAN songs"]
+    assert find_plan_regressions(["SCAN songs"], full_scan_ok=True) == []
+    assert find_plan_regressions(["SCAN songs USING COVERING INDEX idx_songs_artist_nocase",
+                                  "USE TEMP B-TREE FOR DISTINCT"]) == []
+    assert find_plan_regressions(["SCAN songs", "USE TEMP B-TREE FOR ORDER BY"],
+                                 full_scan_ok=True) == ["USE TEMP B-TREE FOR ORDER BY"]
+
+
+def test_repository_query_plans(seeded_db):
+    """Ninguna forma de consulta de los repositorios tiene regresiones"""
+    results = QueryPlanChecker(seeded_db).check()
+    assert len(results) == len(collect_query_shapes())
+    failures = {result.shape.name: result.plan for result in results if not result.ok}
+    assert failures == {}
+
+
+def test_missing_index_is_reported(tmp_path):
+    """Eliminar un índice de ordenación hace fallar la comprobación"""
+    db = DatabaseConnection(str(tmp_path / "plans.db"))
+    MigrationManager(db).run_migrations()
+    db.execute_insert_update_delete("DROP INDEX idx_songs_bpm")
+    seed_database(db, 500)
+
+    failures = {result.shape.name for result in QueryPlanChecker(db).regressions()}
+    assert "songs.get_all.bpm.asc" in failures
+    assert "songs.search.title.bpm.desc" in failures
+    assert "songs.get_all.title.asc" not in failures
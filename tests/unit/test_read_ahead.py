@@ -0,0 +1,39 @@
+"""
+Pruebas para el precalentamiento de la siguiente pista
+"""
+
+from src.services.read_ahead import (
+    HEADER_BYTES, MAX_HEAD_BYTES, TAIL_BYTES, ReadAheadWarmer, warm_file, warm_ranges,
+)
+
+
+def test_warm_ranges_small_file():
+    """Un archivo pequeño se lee entero en un solo tramo"""
+    assert warm_ranges(100_000, 10, 320_000) == [(0, 100_000)]
+
+
+def test_warm_ranges_head_and_tail():
+    """Inicio según el bitrate más la cola, con tope para alta resolución"""
+    size = 50 * 1024 * 1024
+    head = HEADER_BYTES + 10 * 128_000 // 8
+    assert warm_ranges(size, 10, 128_000) == [(0, head), (size - TAIL_BYTES, TAIL_BYTES)]
+    assert warm_ranges(size, 60, 9_216_000)[0] == (0, MAX_HEAD_BYTES)
+
+
+def test_warm_file_reads_ranges(tmp_path):
+    path = tmp_path / "song.mp3"
+    path.write_bytes(b"\x00" * (4 * 1024 * 1024))
+
+    assert warm_file(str(path), 1, 128_000) == HEADER_BYTES + 16_000 + TAIL_BYTES
+
+
+def test_warmer_ignores_missing_and_disabled(tmp_path):
+    """Los errores de lectura no se propagan y 0 segundos no lanza el hilo"""
+    warmer = ReadAheadWarmer(10)
+    warmer.warm({'file_path': str(tmp_path / "missing.mp3")})
+    warmer.warm(None)
+    warmer.shutdown(wait=True)
+
+    disabled = ReadAheadWarmer(0)
+    disabled.warm({'file_path': str(tmp_path / "missing.mp3")})
+    assert disabled._executor is None
@@ -0,0 +1,49 @@
+"""
+Pruebas para el registro de consultas lentas
+"""
+
+import json
+
+from src.database.connection import DatabaseConnection
+from src.database.slow_query_log import SlowQueryLog, redact_params
+
+
+def test_redact_params_hides_text_and_keeps_shape():
+    """Los textos se reducen a su longitud; números, NULL y comodines se conservan"""
+    assert redact_params(("%beat%", "Queen", 50, 0, None, b"\x00\x01")) == [
+        "%<str:4>%", "<str:5>", 50, 0, None, "<blob:2>"
+    ]
+
+
+def test_slow_statements_are_logged_with_plan(tmp_path):
+    """Las sentencias sobre el umbral se registran con filas, parámetros y plan"""
+    log = SlowQueryLog(str(tmp_path / "slow.log"), threshold_ms=0)
+    db = DatabaseConnection(str(tmp_path / "test.db"), slow_query_log=log)
+    db.execute_insert_update_delete("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    db.execute_many("INSERT INTO t (name) VALUES (?)", [("uno",), ("dos",)])
+    rows = db.execute_query("SELECT * FROM t WHERE name LIKE ?", ("%un%",))
+    list(db.iter_query("SELECT * FROM t"))
+    db.close()
+    log.close()
+
+    entries = [json.loads(line) for line in (tmp_path / "slow.log").read_text().splitlines()]
+    select = next(e for e in entries if e['sql'].startswith("SELECT * FROM t WHERE"))
+
+    assert len(rows) == 1
+    assert log.count == len(entries) == 4
+    assert select['rows'] == 1
+    assert select['params'] == ["%<str:2>%"]
+    assert any("SCAN t" in step for step in select['plan'])
+    assert entries[1]['rows'] == 2
+
+
+def test_fast_statements_are_not_logged(tmp_path):
+    """Por debajo del umbral no se escribe nada"""
+    log = SlowQueryLog(str(tmp_path / "slow.log"), threshold_ms=60_000)
+    db = DatabaseConnection(str(tmp_path / "test.db"), slow_query_log=log)
+    db.execute_query("SELECT 1")
+    db.close()
+    log.close()
+
+    assert log.count == 0
+    assert (tmp_path / "slow.log").read_text() == ""
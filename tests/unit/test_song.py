@@ -0,0 +1,98 @@
+"""
+Pruebas para el modelo Song, el contenedor columnar SongBatch y SongRepository
+"""
+
+import pickle
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import Song, SongBatch, SongRepository
+
+
+def make_song(**overrides):
+    values = dict(id=1, title="Title", artist="Artist", album="Album",
+                  genre="Genre", bpm=None, file_path=Path("/music/song.mp3"))
+    values.update(overrides)
+    return Song(**values)
+
+
+def test_song_is_frozen_and_slotted():
+    """Song no admite asignación ni atributos nuevos"""
+    song = make_song()
+    assert not hasattr(song, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        song.title = "Otro"
+
+
+def test_song_path_is_lazy():
+    """La ruta se guarda como str y el Path se construye al acceder"""
+    song = make_song(file_path="/music/song.mp3")
+    assert song.file_path_str == "/music/song.mp3"
+    assert song.file_path == Path("/music/song.mp3")
+
+
+def test_song_equality_replace_and_pickle():
+    """Igualdad por valor, copia con cambios y serialización"""
+    song = make_song()
+    assert song == make_song(file_path="/music/song.mp3")
+    changed = song.replace(bpm=128)
+    assert changed.bpm == 128 and song.bpm is None
+    assert pickle.loads(pickle.dumps(song)) == song
+    assert song.to_dict()["file_path"] == "/music/song.mp3"
+
+
+def test_song_batch_round_trip():
+    """SongBatch conserva los valores e interna los textos repetidos"""
+    rows = [
+        make_song(id=i, title=f"T{i}", artist="".join(["Art", "ist"]), bpm=i or None).to_dict()
+        for i in range(3)
+    ]
+    batch = SongBatch.from_rows(rows)
+
+    assert len(batch) == 3
+    assert [song.bpm for song in batch] == [None, 1, 2]
+    assert batch[2] == make_song(id=2, title="T2", bpm=2)
+    assert batch.artists[0] is batch.artists[1]
+
+
+def test_get_albums_groups_tracks(tmp_path):
+    """Un registro por álbum y artista, sin distinguir mayúsculas"""
+    db = DatabaseConnection(str(tmp_path / "albums.db"))
+    MigrationManager(db).run_migrations()
+    repository = SongRepository(db)
+    repository.add_many([
+        make_song(album="Disco", file_path=Path("/music/b.mp3")),
+        make_song(album="disco", file_path=Path("/music/a.mp3")),
+        make_song(album="Otro", artist="Otra", file_path=Path("/music/c.mp3")),
+    ])
+
+    albums = repository.get_albums()
+    db.close()
+
+    assert [(album["album"].lower(), album["tracks"]) for album in albums] == [("disco", 2), ("otro", 1)]
+    assert albums[0]["file_path"] == "/music/a.mp3"
+
+
+def test_library_stats_are_sql_aggregates(tmp_path):
+    """Duración y tamaño totales y por género sin recorrer los archivos"""
+    db = DatabaseConnection(str(tmp_path / "stats.db"))
+    MigrationManager(db).run_migrations()
+    repository = SongRepository(db)
+    repository.add_many([
+        make_song(genre="Rock", duration=200.5, file_size=4000, file_path=Path("/music/a.mp3")),
+        make_song(genre="rock", duration=100.0, file_size=1000, file_path=Path("/music/b.mp3")),
+        make_song(genre="Jazz", file_path=Path("/music/c.mp3")),
+    ])
+
+    stats = repository.get_library_stats()
+    genres = repository.get_genre_stats()
+    stored = repository.get_all()[0]
+    db.close()
+
+    assert stats == {'total_songs': 3, 'total_duration': 300.5, 'total_size': 5000}
+    assert [(row['genre'].lower(), row['songs'], row['size']) for row in genres] == [("jazz", 1, 0), ("rock", 2, 5000)]
+    assert stored.duration == 200.5 and stored.file_size == 4000
@@ -0,0 +1,61 @@
+"""
+Pruebas para el detector de bloqueos del hilo principal
+"""
+
+import time
+from pathlib import Path
+
+from src.utils.instrumentation import Instrumentation
+from src.utils.stall_watchdog import StallWatchdog
+
+
+def blocking_slot():
+    """Slot de prueba que bloquea el hilo principal"""
+    time.sleep(0.3)
+
+
+def test_stall_captures_slot_and_stack():
+    """Un bloqueo sobre el umbral registra el slot, la pila y la duración"""
+    registry = Instrumentation(enabled=True)
+    watchdog = StallWatchdog(threshold_ms=50, heartbeat_ms=10, registry=registry,
+                             source_root=Path(__file__).parent)
+    watchdog.start()
+    try:
+        watchdog.beat()
+        blocking_slot()
+        watchdog.beat()
+    finally:
+        watchdog.stop()
+
+    stall = watchdog.recent[-1]
+    assert "test_stall_captures_slot_and_stack" in stall.slot
+    assert any("blocking_slot" in line for line in stall.stack)
+    assert stall.duration_ms >= 250
+    assert registry.histogram("ui.event_loop_stall").count == 1
+
+
+def test_short_gaps_are_not_stalls():
+    """Latidos puntuales no generan paradas"""
+    watchdog = StallWatchdog(threshold_ms=200, heartbeat_ms=10, registry=Instrumentation(enabled=True))
+    watchdog.beat()
+    watchdog.beat()
+
+    assert len(watchdog.recent) == 0
+
+
+def test_block_within_heartbeat_is_not_logged():
+    """Un bloqueo más corto que umbral + latido no captura pila ni deja parada pendiente"""
+    registry = Instrumentation(enabled=True)
+    watchdog = StallWatchdog(threshold_ms=50, heartbeat_ms=200, registry=registry,
+                             source_root=Path(__file__).parent)
+    watchdog.start()
+    try:
+        watchdog.beat()
+        time.sleep(0.15)
+        assert watchdog._pending is None
+        watchdog.beat()
+    finally:
+        watchdog.stop()
+
+    assert len(watchdog.recent) == 0
+    assert registry.histogram("ui.event_loop_stall") is None
@@ -0,0 +1,31 @@
+"""
+Pruebas para el informe de tiempos del arranque
+"""
+
+import time
+
+from src.utils.startup_profiler import StartupProfiler
+
+
+def test_disabled_profiler_records_nothing(capsys):
+    """Sin --profile-startup no se registran fases ni se imprime nada"""
+    profiler = StartupProfiler()
+    profiler.mark("imports")
+    profiler.finish()
+
+    assert profiler.marks == []
+    assert capsys.readouterr().out == ""
+
+
+def test_report_lists_stages_once(capsys):
+    """El informe incluye cada fase y se imprime una sola vez"""
+    profiler = StartupProfiler()
+    profiler.start(time.perf_counter())
+    profiler.mark("imports")
+    profiler.mark("ventana mostrada")
+    profiler.finish()
+    profiler.finish()
+
+    output = capsys.readouterr().out
+    assert [stage for stage, _ in profiler.marks] == ["imports", "ventana mostrada", "arranque completo"]
+    assert output.count("arranque completo") == 1
@@ -0,0 +1,49 @@
+"""
+Pruebas para la caché de hojas de estilo
+"""
+
+from src.ui.styles.color_scheme import get_theme_colors
+from src.ui.styles.stylesheet_cache import StylesheetCache
+from src.ui.styles.theme import MD3Theme
+
+
+def test_variants_are_rendered_once_and_persisted(tmp_path):
+    """Cada variante se renderiza una vez y se reutiliza desde disco"""
+    cache = StylesheetCache(str(tmp_path))
+    cache.prerender()
+
+    assert len(list(tmp_path.glob("md3-*.qss"))) == 2
+    assert cache.get(True) == MD3Theme.get_stylesheet(colors=get_theme_colors(True), is_dark=True)
+
+    # Una nueva instancia lee del disco aunque la plantilla no se invoque
+    (tmp_path / f"md3-{cache.key(False)}.qss").write_text("/* desde disco */", encoding="utf-8")
+    assert StylesheetCache(str(tmp_path)).get(False) == "/* desde disco */"
+
+
+def test_key_depends_on_theme_and_palette():
+    """La clave cambia con el tema y con la paleta"""
+    cache = StylesheetCache()
+    colors = dict(get_theme_colors(False), primary="#000000")
+
+    assert cache.key(False) != cache.key(True)
+    assert cache.key(False) != cache.key(False, colors)
+    assert "#000000" in cache.get(False, colors)
+
+
+def test_repolish_applies_dynamic_property(qapp):
+    """Cambiar una propiedad usada en un selector solo surte efecto al repulir"""
+    from PyQt6.QtWidgets import QPushButton
+    from src.ui.styles.stylesheet_cache import repolish
+
+    button = QPushButton("x")
+    button.setObjectName("playbackButton")
+    button.setStyleSheet('QPushButton[active="true"] { background-color: #ff0000; border: none; }'
+                         'QPushButton { background-color: #0000ff; border: none; }')
+    button.resize(40, 20)
+    center = lambda: button.grab().toImage().pixelColor(3, 3).name()
+    assert center() == "#0000ff"
+
+    button.setProperty("active", True)
+    repolish(button)
+
+    assert center() == "#ff0000"
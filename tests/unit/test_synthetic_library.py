@@ -0,0 +1,63 @@
+"""
+Pruebas para el generador de bibliotecas sintéticas
+"""
+
+import pytest
+from mutagen import File as MutagenFile
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import SongRepository
+from src.services.metadata_extractor import MetadataExtractor
+from src.services.music_service import MusicService
+from src.utils.file_scanner import FileScanner
+from src.utils.synthetic_library import SyntheticLibrary
+
+
+def test_songs_are_reproducible_and_unique():
+    """La misma semilla produce las mismas canciones, con rutas únicas"""
+    first = list(SyntheticLibrary(seed=7).songs(500))
+    second = list(SyntheticLibrary(seed=7).songs(500))
+
+    assert first == second
+    assert len({song.file_path_str for song in first}) == 500
+    assert len({song.artist for song in first}) < len({song.album for song in first})
+
+
+def test_seed_repository(tmp_path):
+    """Las canciones se insertan por lotes a través del repositorio"""
+    db = DatabaseConnection(str(tmp_path / "synthetic.db"))
+    MigrationManager(db).run_migrations()
+    repository = SongRepository(db)
+
+    assert SyntheticLibrary().seed_repository(repository, 2500, batch_size=1000) == 2500
+    assert repository.get_total_songs_count() == 2500
+    db.close()
+
+
+def test_write_tree_creates_tagged_audio(tmp_path):
+    """Los archivos generados son válidos, están etiquetados y se importan"""
+    paths = SyntheticLibrary(seed=3).write_tree(tmp_path / "music", 16, depth=2, fan_out=2)
+
+    assert sorted(FileScanner().scan(str(tmp_path / "music"))) == sorted(paths)
+    assert {path.parent.parent.parent for path in paths} == {tmp_path / "music"}
+
+    extractor = MetadataExtractor()
+    for path in paths:
+        assert MutagenFile(path) is not None
+        song = extractor.extract(path)
+        assert song is not None
+        if path.suffix != ".wav":
+            assert song.artist != "Desconocido"
+
+    db = DatabaseConnection(str(tmp_path / "import.db"))
+    MigrationManager(db).run_migrations()
+    assert MusicService(db).import_folder(str(tmp_path / "music")) == (16, 0)
+    db.close()
+
+
+def test_write_tree_rejects_empty_fan_out(tmp_path):
+    """Sin subdirectorios por nivel no hay hojas donde escribir"""
+    with pytest.raises(ValueError):
+        SyntheticLibrary(seed=3).write_tree(tmp_path / "music", 4, depth=2, fan_out=0)
+    assert len(SyntheticLibrary(seed=3).write_tree(tmp_path / "flat", 4, depth=0, fan_out=0)) == 4
@@ -0,0 +1,27 @@
+"""
+Pruebas para el escalado de UIConfig
+"""
+
+from src.ui import config as ui_config
+from src.ui.config import UIConfig
+
+
+def test_scale_table_matches_scale_factor():
+    """scale_table y scale_size coinciden con el factor de escala"""
+    scale = UIConfig.get_scale_factor(1280, 720)
+
+    assert UIConfig.scale_table((280, 100, 12), 1280, 720) == tuple(
+        int(size * scale) for size in (280, 100, 12)
+    )
+    assert UIConfig.scale_size(280, 1280, 720) == int(280 * scale)
+
+
+def test_scale_table_is_cached_per_window_size(monkeypatch):
+    """Los tamaños se calculan una vez por tamaño de ventana y resolución base"""
+    ui_config._scale_table.cache_clear()
+    UIConfig.scale_table((280, 100, 12), 1000, 700)
+    UIConfig.scale_table((280, 100, 12), 1000, 700)
+    assert ui_config._scale_table.cache_info().hits == 1
+
+    monkeypatch.setattr(UIConfig, "BASE_RESOLUTION", "1000x700")
+    assert UIConfig.scale_table((280,), 1000, 700) == (280,)
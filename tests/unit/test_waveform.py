@@ -0,0 +1,85 @@
+"""
+Pruebas para el cálculo y almacenamiento de formas de onda
+"""
+
+import wave
+
+import numpy as np
+import pytest
+
+from src.database.connection import DatabaseConnection
+from src.database.migrations import MigrationManager
+from src.models.song import Song, SongRepository
+from src.services.waveform import PeakAccumulator, WaveformJob, compute_peaks
+
+
+@pytest.fixture
+def repository(tmp_path):
+    db = DatabaseConnection(str(tmp_path / "waveform.db"))
+    MigrationManager(db).run_migrations()
+    yield SongRepository(db)
+    db.close()
+
+
+def test_compute_peaks_min_max_per_bin():
+    """Cada intervalo conserva su mínimo y su máximo escalados a int8"""
+    samples = np.array([0.0, 1.0, -0.5, 0.25, 0.0, 0.0, -1.0, 0.5], dtype=np.float32)
+
+    peaks = np.frombuffer(compute_peaks(samples, bins=4), dtype=np.int8)
+
+    assert peaks.tolist() == [0, 127, -64, 32, 0, 0, -127, 64]
+
+
+def test_compute_peaks_short_track():
+    """Una pista con menos muestras que intervalos se completa con silencio"""
+    assert len(compute_peaks(np.ones(3, dtype=np.float32), bins=16)) == 32
+
+
+def test_accumulator_matches_compute_peaks():
+    """Acumular por bloques irregulares da los mismos picos que el array completo"""
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(-1, 1, 100_003).astype(np.float32)
+    accumulator = PeakAccumulator(len(samples))
+    position = 0
+    while position < len(samples):
+        size = int(rng.integers(1, 5000))
+        accumulator.add(samples[position:position + size])
+        position += size
+
+    assert accumulator.result() == compute_peaks(samples)
+
+
+def test_repository_waveforms(repository):
+    """Guardar, leer y listar las canciones sin forma de onda"""
+    repository.add_many([
+        Song(id=None, title="a", artist="A", album="B", genre="G", bpm=None, file_path="/a.wav"),
+        Song(id=None, title="b", artist="A", album="B", genre="G", bpm=None, file_path="/b.wav"),
+    ])
+    first, second = sorted(song_id for song_id, _ in repository.get_songs_without_waveform())
+
+    repository.save_waveforms([(first, b"\x00\x7f")])
+
+    assert repository.get_waveform(first) == b"\x00\x7f"
+    assert repository.get_waveform(second) is None
+    assert repository.get_songs_without_waveform() == [(second, "/b.wav")]
+
+
+def test_job_stores_waveform(repository, tmp_path):
+    """El trabajo por lotes decodifica los WAV pendientes y guarda sus picos"""
+    path = tmp_path / "tone.wav"
+    tone = (np.sin(np.linspace(0, 200 * np.pi, 8000)) * 16000).astype("<i2")
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(tone.tobytes())
+    repository.add(Song(id=None, title="t", artist="A", album="B", genre="G", bpm=None,
+                        file_path=str(path)))
+
+    result = WaveformJob(repository, max_workers=1).run()
+    song_id = repository.get_all()[0].id
+    peaks = np.frombuffer(repository.get_waveform(song_id), dtype=np.int8)
+
+    assert (result.processed, result.updated) == (1, 1)
+    assert peaks.min() == pytest.approx(-62, abs=2) and peaks.max() == pytest.approx(62, abs=2)
+    assert repository.get_songs_without_waveform() == []